@@ -0,0 +1,74 @@
+"""
+Custo por resposta dos embeds de erro e status.
+Compara create_embed + to_dict() (reconstrução a cada chamada) com
+templates pré-construídos, com e sem campos carimbados por resposta.
+
+Uso:
+    python benchmarks/embed_templates.py [respostas]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+
+from src.base.helpers import create_embed
+from src.base.embed_templates import ERROR, VOICE_REQUIRED
+
+def rebuild_static():
+    return create_embed(
+        title="❌ Erro",
+        description="Você precisa estar em um canal de voz para usar este comando!",
+        color=discord.Color.red()
+    ).to_dict()
+
+def template_static():
+    return VOICE_REQUIRED.embed.to_dict()
+
+def rebuild_dynamic(n):
+    return create_embed(
+        title="❌ Erro",
+        description=f"Ocorreu um erro: falha {n}",
+        color=discord.Color.red()
+    ).to_dict()
+
+def template_dynamic(n):
+    return ERROR.stamp(description=f"Ocorreu um erro: falha {n}").to_dict()
+
+def measure(label, func, count, with_arg=False):
+    """Mede tempo de CPU e bytes alocados por resposta"""
+    args = range(count)
+    started = time.process_time()
+    if with_arg:
+        for n in args:
+            func(n)
+    else:
+        for _ in args:
+            func()
+    cpu = (time.process_time() - started) / count
+
+    # Alocação medida à parte para não distorcer o tempo
+    sample = min(count, 2000)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [func(n) if with_arg else func() for n in range(sample)]
+    allocated = (tracemalloc.get_traced_memory()[0] - before) / sample
+    tracemalloc.stop()
+    del kept
+
+    print(f"{label:<34}{cpu * 1e6:>10.2f} µs{allocated:>12.0f} B")
+
+def main(count):
+    print(f"{count} respostas")
+    print(f"{'':<34}{'CPU/resp':>13}{'retido/resp':>14}")
+    measure("erro fixo (create_embed)", rebuild_static, count)
+    measure("erro fixo (template)", template_static, count)
+    measure("erro dinâmico (create_embed)", rebuild_dynamic, count, with_arg=True)
+    measure("erro dinâmico (template.stamp)", template_dynamic, count, with_arg=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,137 @@
+"""
+Atraso do loop de eventos com logging intenso.
+Compara handlers de arquivo chamados direto no loop com o pipeline de
+fila (BoundedQueueHandler + thread de escrita), medindo o atraso de uma
+tarefa sonda que dorme 1 ms enquanto outra tarefa emite logs.
+
+Uso:
+    python benchmarks/logging_lag.py [registros]
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.logger import LogPipeline, JsonFormatter, SamplingFilter
+
+FORMAT = '%(asctime)s | %(levelname)-8s | %(name)s | %(filename)s:%(lineno)d | %(message)s'
+
+def file_handler(directory, name, handler_class=RotatingFileHandler):
+    handler = handler_class(
+        os.path.join(directory, f"{name}.log"), maxBytes=5_000_000, backupCount=5, encoding='utf-8'
+    )
+    handler.setFormatter(logging.Formatter(FORMAT))
+    return handler
+
+class SlowDiskHandler(RotatingFileHandler):
+    """Simula paradas de disco (flush, rotação, volume em rede): 20 ms a cada 1000 registros"""
+
+    def emit(self, record):
+        super().emit(record)
+        self.written = getattr(self, "written", 0) + 1
+        if self.written % 1000 == 0:
+            time.sleep(0.02)
+
+def make_logger(name):
+    log = logging.getLogger(f"benchmark.{name}")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    return log
+
+async def probe(lags, stop):
+    """Mede quanto cada sleep de 1 ms atrasa além do pedido"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+async def producer(log, count, level):
+    for n in range(count):
+        log.log(level, "evento %d do servidor %d processado com payload %s", n, n % 97, "x" * 80)
+        # Rajadas de 20 registros com pausas curtas, como handlers de eventos reais
+        if n % 20 == 19:
+            await asyncio.sleep(0.0005)
+
+async def run(log, count, level):
+    lags = []
+    stop = asyncio.Event()
+    sonda = asyncio.create_task(probe(lags, stop))
+    started = time.perf_counter()
+    await producer(log, count, level)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sonda
+    lags.sort()
+    pick = lambda q: lags[min(len(lags) - 1, int(len(lags) * q))] * 1000 if lags else 0.0
+    return elapsed, pick(0.5), pick(0.99), (lags[-1] * 1000 if lags else 0.0)
+
+def report(label, count, result, extra=""):
+    elapsed, p50, p99, worst = result
+    print(f"{label:<28}{elapsed:>9.2f} s{p50:>9.2f}{p99:>9.2f}{worst:>9.2f}  {extra}")
+
+def main(count):
+    directory = tempfile.mkdtemp(prefix="logging-bench-")
+    try:
+        print(f"{count} registros por cenário")
+        print(f"{'':<28}{'total':>11}{'p50 ms':>9}{'p99 ms':>9}{'máx ms':>9}")
+
+        direct = make_logger("direct")
+        direct.addHandler(file_handler(directory, "direct"))
+        report("INFO direto no loop", count, asyncio.run(run(direct, count, logging.INFO)))
+
+        pipeline = LogPipeline(name="benchmark.queued")
+        queued = make_logger("queued")
+        pipeline.attach(queued, [file_handler(directory, "queued")])
+        pipeline.start()
+        result = asyncio.run(run(queued, count, logging.INFO))
+        pipeline.stop()
+        report("INFO via fila", count, result, f"descartados: {pipeline.dropped.value}")
+
+        slow_direct = make_logger("slow_direct")
+        slow_direct.addHandler(file_handler(directory, "slow_direct", SlowDiskHandler))
+        report("INFO direto, disco lento", count, asyncio.run(run(slow_direct, count, logging.INFO)))
+
+        pipeline = LogPipeline(name="benchmark.slow_queued")
+        slow_queued = make_logger("slow_queued")
+        pipeline.attach(slow_queued, [file_handler(directory, "slow_queued", SlowDiskHandler)])
+        pipeline.start()
+        result = asyncio.run(run(slow_queued, count, logging.INFO))
+        pipeline.stop()
+        report("INFO via fila, disco lento", count, result, f"descartados: {pipeline.dropped.value}")
+
+        # Fila pequena para forçar pressão: DEBUG é descartado, INFO+ não
+        pipeline = LogPipeline(max_queue=1000, name="benchmark.flooded")
+        flooded = make_logger("flooded")
+        pipeline.attach(flooded, [file_handler(directory, "flooded", SlowDiskHandler)])
+        pipeline.start()
+        result = asyncio.run(run(flooded, count, logging.DEBUG))
+        pipeline.stop()
+        report("DEBUG, fila 1000, lento", count, result,
+               f"descartados: {pipeline.dropped_debug.value} DEBUG")
+
+        # Caminho quente com logs.formato=json e amostragem 1/100
+        for label, rate in (("DEBUG JSON via fila", 1), ("DEBUG JSON amostrado 1/100", 100)):
+            pipeline = LogPipeline(name=f"benchmark.json{rate}")
+            sampled = make_logger(f"json{rate}")
+            handler = file_handler(directory, f"json{rate}")
+            handler.setFormatter(JsonFormatter())
+            if rate > 1:
+                sampled.addFilter(SamplingFilter(sampled.name, rate))
+            pipeline.attach(sampled, [handler])
+            pipeline.start()
+            result = asyncio.run(run(sampled, count, logging.DEBUG))
+            pipeline.stop()
+            size = os.path.getsize(os.path.join(directory, f"json{rate}.log")) // 1024
+            report(label, count, result, f"arquivo: {size} KiB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
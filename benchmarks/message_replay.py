@@ -0,0 +1,105 @@
+"""
+Replay de mensagens sintéticas pelo MessageEventHandler.
+Mostra o custo médio de CPU e I/O por estágio do pipeline de mensagens.
+O db_manager é substituído por um banco em memória com latência simulada:
+o replay nunca conecta nem escreve no MongoDB configurado.
+
+Uso:
+    python benchmarks/message_replay.py [quantidade]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importar src.utils conecta ao MongoDB; o cliente é trocado antes da importação
+os.environ.setdefault("MONGO_URL", "mongodb://replay.invalid")
+with mock.patch("pymongo.MongoClient", mock.MagicMock()):
+    from src.utils.database import db_manager
+    from src.events.message import MessageEventHandler
+
+class ReplayDatabase:
+    """Operações do db_manager usadas pelo handler, em memória"""
+
+    def __init__(self, latency=0.0005):
+        """
+        Args:
+            latency: Segundos de espera por operação (simula a rede)
+        """
+        self.latency = latency
+        self.xp = {}
+
+    def get_guild(self, guild_id):
+        time.sleep(self.latency)
+        return None
+
+    def add_xp(self, guild_id, user_id, xp_amount=1):
+        time.sleep(self.latency)
+        key = (guild_id, user_id)
+        old_level = self.xp.get(key, 0) // 100
+        self.xp[key] = self.xp.get(key, 0) + xp_amount
+        new_level = self.xp[key] // 100
+        return new_level, new_level > old_level
+
+    def load_custom_commands(self, guild_id):
+        time.sleep(self.latency)
+        return None, [{"name": "regras", "response": "Leia as regras, {user}!", "aliases": ["rules"]}]
+
+class _Channel:
+    async def send(self, *args, **kwargs):
+        pass
+
+def _fake_message(guild_id, user_id, content, bot=False, dm=False):
+    return SimpleNamespace(
+        author=SimpleNamespace(id=user_id, bot=bot, mention=f"<@{user_id}>"),
+        guild=None if dm else SimpleNamespace(id=guild_id),
+        channel=_Channel(),
+        content=content
+    )
+
+def build_messages(count, guilds=20, users=500, seed=42):
+    """Mistura realista: maioria texto comum, alguns bots, DMs e comandos"""
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        roll = rng.random()
+        guild_id = 900_000 + rng.randrange(guilds)
+        user_id = 100_000 + rng.randrange(users)
+        if roll < 0.05:
+            messages.append(_fake_message(guild_id, user_id, "bip bop", bot=True))
+        elif roll < 0.08:
+            messages.append(_fake_message(guild_id, user_id, "oi", dm=True))
+        elif roll < 0.15:
+            messages.append(_fake_message(guild_id, user_id, "!regras por favor " + "x" * 200))
+        else:
+            messages.append(_fake_message(guild_id, user_id, "mensagem comum " * rng.randint(1, 20)))
+    return messages
+
+async def main(count):
+    replay_db = ReplayDatabase()
+    for name in ("get_guild", "add_xp", "load_custom_commands"):
+        setattr(db_manager, name, getattr(replay_db, name))
+    handler = MessageEventHandler(SimpleNamespace())
+    messages = build_messages(count)
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for message in messages:
+        await handler.on_message(message)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    print(f"{count} mensagens em {elapsed:.2f}s ({elapsed / count * 1e6:.1f} µs/msg, CPU {cpu / count * 1e6:.1f} µs/msg)")
+    print(f"{'estágio':<16}{'execuções':>10}{'pulos':>8}{'paradas':>9}{'parede µs':>11}{'CPU µs':>9}{'I/O µs':>9}")
+    for row in handler.pipeline.report():
+        print(f"{row['stage']:<16}{row['runs']:>10}{row['skips']:>8}{row['stops']:>9}"
+              f"{row['wall_us']:>11}{row['cpu_us']:>9}{row['io_us']:>9}")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,131 @@
+"""
+Latência das trocas de faixa do Player.
+Toca uma fila de arquivos PCM locais num cliente de voz substituto que lê
+quadros de 20 ms numa thread (como o AudioPlayer do discord) e mede o
+intervalo entre o fim de uma faixa (ou o /skip) e o primeiro quadro da
+seguinte, com e sem pré-carregamento. O nó simula o tempo de abertura de
+um stream remoto (resolução + início do FFmpeg).
+
+Uso:
+    python benchmarks/music_transitions.py [faixas] [atraso_abertura_ms]
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.player import Player, LocalNode, FRAME_BYTES
+
+class SlowNode(LocalNode):
+    """Arquivos locais com atraso fixo na abertura"""
+
+    def __init__(self, root, delay):
+        super().__init__(root)
+        self.delay = delay
+
+    async def open(self, track):
+        await asyncio.sleep(self.delay)
+        return await super().open(track)
+
+class StandInVoice:
+    """Cliente de voz substituto: consome a fonte em tempo real numa thread"""
+
+    def __init__(self):
+        self.channel = None
+        self._stop = None
+
+    def is_connected(self):
+        return True
+
+    def play(self, source, after=None):
+        stop = self._stop = threading.Event()
+
+        def run():
+            next_frame = time.perf_counter()
+            while not stop.is_set():
+                if not source.read():
+                    break
+                next_frame += 0.02
+                time.sleep(max(0.0, next_frame - time.perf_counter()))
+            source.cleanup()
+            if after is not None:
+                after(None)
+        threading.Thread(target=run, daemon=True).start()
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    async def disconnect(self, force=False):
+        self.stop()
+
+class Samples:
+    """Coleta as latências em vez do histograma por buckets"""
+
+    def __init__(self):
+        self.values = []
+
+    def observe(self, value):
+        self.values.append(value)
+
+async def run(directory, count, delay, prefetch, skip):
+    node = SlowNode(directory, delay)
+    player = Player(1, node, idle_timeout=None, prefetch=prefetch)
+    player.transitions = Samples()
+    player.attach(StandInVoice())
+
+    for n in range(count):
+        await player.enqueue((await node.resolve(f"track{n}.pcm"))[0])
+    while player.current is not None:
+        if skip:
+            # Pula cada faixa na metade
+            await asyncio.sleep(0.25)
+            if player.current is not None:
+                await player.skip()
+        else:
+            await asyncio.sleep(0.05)
+    await player.disconnect()
+    return sorted(player.transitions.values)
+
+def report(label, values):
+    if not values:
+        print(f"{label:<30}sem trocas")
+        return
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))] * 1000
+    print(f"{label:<30}{len(values):>7}{pick(0.5):>10.1f}{pick(0.95):>10.1f}{values[-1] * 1000:>10.1f}")
+
+def main(count, delay_ms):
+    directory = tempfile.mkdtemp(prefix="music-bench-")
+    try:
+        # Faixas de 0,5 s de silêncio no formato do discord
+        for n in range(count):
+            with open(os.path.join(directory, f"track{n}.pcm"), "wb") as f:
+                f.write(b"\x00" * FRAME_BYTES * 25)
+
+        delay = delay_ms / 1000
+        print(f"{count} faixas, abertura de {delay_ms} ms")
+        print(f"{'':<30}{'trocas':>7}{'p50 ms':>10}{'p95 ms':>10}{'máx ms':>10}")
+        report("fim natural, sem pré-carga", asyncio.run(run(directory, count, delay, 0, False)))
+        report("fim natural, pré-carga 2", asyncio.run(run(directory, count, delay, 2, False)))
+        report("/skip, sem pré-carga", asyncio.run(run(directory, count, delay, 0, True)))
+        report("/skip, pré-carga 2", asyncio.run(run(directory, count, delay, 2, True)))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    )
@@ -0,0 +1,72 @@
+"""
+Custo de renderização de boas-vindas durante uma rajada de entradas.
+Compara str.replace encadeado (implementação antiga, estendida ao mesmo
+conjunto de placeholders) com templates compilados.
+
+Uso:
+    python benchmarks/welcome_render.py [entradas]
+"""
+
+import importlib.util
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Carrega só o módulo de templates: importar src.utils conectaria ao MongoDB
+_spec = importlib.util.spec_from_file_location(
+    "templates",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "utils", "templates.py")
+)
+_templates = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_templates)
+TemplateCache = _templates.TemplateCache
+
+TEMPLATE = "Olá {user}! Bem-vindo(a) ao {server}! Agora somos {count} membros!"
+
+def _members(count, guilds=50):
+    guild_objs = [SimpleNamespace(id=i, name=f"Servidor {i}", member_count=1000 + i) for i in range(guilds)]
+    return [
+        SimpleNamespace(
+            id=n, name=f"user{n}", display_name=f"User {n}", mention=f"<@{n}>",
+            display_avatar=SimpleNamespace(url=f"https://cdn.discordapp.com/avatars/{n}.png"),
+            guild=guild_objs[n % guilds]
+        )
+        for n in range(count)
+    ]
+
+def render_replace(member):
+    text = TEMPLATE.replace('{user}', member.mention)
+    text = text.replace('{user_name}', member.name)
+    text = text.replace('{user_display}', member.display_name)
+    text = text.replace('{user_id}', str(member.id))
+    text = text.replace('{user_avatar}', member.display_avatar.url)
+    text = text.replace('{server}', member.guild.name)
+    text = text.replace('{server_id}', str(member.guild.id))
+    return text.replace('{count}', str(member.guild.member_count))
+
+def _best(render, members, passes=5):
+    """Menor tempo entre várias passadas (a primeira aquece os objetos)"""
+    best = float("inf")
+    for _ in range(passes):
+        started = time.perf_counter()
+        for member in members:
+            render(member)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main(count):
+    members = _members(count)
+    cache = TemplateCache()
+
+    replace_time = _best(render_replace, members)
+    compiled_time = _best(lambda member: cache.get(member.guild.id, TEMPLATE).render(member), members)
+    render_time = _best(cache.get(None, TEMPLATE).render, members)
+
+    print(f"{count} entradas em {len({m.guild.id for m in members})} servidores")
+    print(f"str.replace encadeado: {replace_time / count * 1e6:.2f} µs/render")
+    print(f"template compilado:    {compiled_time / count * 1e6:.2f} µs/render ({len(cache) - 1} compilados)")
+    print(f"  só a renderização:   {render_time / count * 1e6:.2f} µs/render (sem busca no cache)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -3,6 +3,13 @@ from .components import ComponentBuilder
 from .embeds import EmbedBuilder
 from .modal import create_modal, ModalBuilder
 from .helpers import create_embed, create_components
+from .middleware import CommandContext, command_stats
+from .options import compile_options, CompiledOptions
+from .autocomplete import index_autocomplete
+from .embed_templates import embed_templates, EmbedTemplate, FrozenEmbed
+from .router import component_router, ComponentRouter, StaticView
+from .views import view_registry, ViewRegistry, RegisteredView
+from .paginator import Paginator, Page, sequence_source, mongo_source
 
 # Exportar tudo para fácil acesso
 __all__ = [
@@ -14,5 +21,23 @@ __all__ = [
     "create_modal",
     "ModalBuilder",
     "create_embed",
-    "create_components"
+    "create_components",
+    "CommandContext",
+    "command_stats",
+    "compile_options",
+    "CompiledOptions",
+    "index_autocomplete",
+    "embed_templates",
+    "EmbedTemplate",
+    "FrozenEmbed",
+    "component_router",
+    "ComponentRouter",
+    "StaticView",
+    "view_registry",
+    "ViewRegistry",
+    "RegisteredView",
+    "Paginator",
+    "Page",
+    "sequence_source",
+    "mongo_source"
 ]
\ No newline at end of file
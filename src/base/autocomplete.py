@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+import discord
+from discord import app_commands
+
+from src.utils.database import db_manager
+from src.utils.prefix_index import PrefixIndex, custom_command_index, playlist_index, member_index
+
+# Limite de sugestões do Discord por requisição de autocomplete
+MAX_AUTOCOMPLETE = 25
+
+Fetcher = Callable[[discord.Interaction], Awaitable[Iterable[Tuple[str, Any]]]]
+
+async def _fetch_custom_commands(interaction: discord.Interaction):
+    return await asyncio.to_thread(db_manager.get_custom_command_names, interaction.guild_id)
+
+async def _fetch_playlists(interaction: discord.Interaction):
+    return await asyncio.to_thread(db_manager.get_playlist_names, interaction.guild_id)
+
+async def _fetch_members(interaction: discord.Interaction):
+    # Vem do cache do gateway; não há consulta ao banco
+    guild = interaction.guild
+    return [(member.display_name, str(member.id)) for member in (guild.members if guild else ())]
+
+def index_autocomplete(index: PrefixIndex, fetch: Fetcher) -> Callable:
+    """
+    Cria um callback de autocomplete servido por um índice de prefixos
+
+    Na primeira busca de um servidor o índice é carregado com fetch();
+    as demais são respondidas apenas da memória.
+
+    Args:
+        index: Índice consultado
+        fetch: Corrotina que retorna os pares (rótulo, valor) do servidor
+
+    Returns:
+        Corrotina (interaction, current) -> lista de Choices
+    """
+    async def autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice]:
+        guild_id = interaction.guild_id
+        if guild_id is None:
+            return []
+        if not index.is_loaded(guild_id):
+            await index.ensure(guild_id, lambda: fetch(interaction))
+        return [
+            app_commands.Choice(name=label[:100], value=value)
+            for label, value in index.search(guild_id, current, MAX_AUTOCOMPLETE)
+        ]
+    return autocomplete
+
+# Fontes que podem ser usadas pelo nome em "autocomplete" nas opções dos comandos
+AUTOCOMPLETE_SOURCES: Dict[str, Callable] = {
+    "custom_commands": index_autocomplete(custom_command_index, _fetch_custom_commands),
+    "playlists": index_autocomplete(playlist_index, _fetch_playlists),
+    "members": index_autocomplete(member_index, _fetch_members),
+}
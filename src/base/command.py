@@ -2,6 +2,12 @@ import discord
 from discord.ext import commands
 import inspect
 from typing import Callable, Dict, Any, Optional, Union, List
+from .middleware import CommandContext, Middleware, run_middlewares, instrument, deferral
+from .ratelimit import CommandLimits, rate_limit
+from .options import compile_options
+
+# Orçamento padrão quando auto_defer=True (segundos; o prazo do Discord é 3s)
+DEFAULT_DEFER_BUDGET = 2.5
 
 class CommandBuilder:
     """
@@ -9,13 +15,33 @@ class CommandBuilder:
     """
     def __init__(self, bot):
         self.bot = bot
+        self.groups: Dict[str, discord.app_commands.Group] = {}
+        
+        # Cadeia executada em volta de todo callback (o primeiro envolve os demais)
+        self.middlewares: List[Middleware] = [instrument, rate_limit, deferral]
+    
+    def use(self, middleware: Middleware):
+        """
+        Adiciona um middleware à cadeia dos comandos
+        
+        Args:
+            middleware: Corrotina (ctx, call_next) que deve aguardar call_next()
+        """
+        self.middlewares.append(middleware)
+        return self
         
     def create_command(self, 
                       name: str, 
                       description: str = None,
                       callback: Callable = None,
-                      options: Optional[Dict[str, Dict[str, Any]]] = None,
-                      guild_ids: Optional[List[int]] = None):
+                      options: Optional[Union[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]] = None,
+                      guild_ids: Optional[List[int]] = None,
+                      group: Optional[str] = None,
+                      auto_defer: Union[bool, float] = False,
+                      defer_ephemeral: bool = False,
+                      cooldown: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+                      max_concurrency: Optional[Dict[str, Any]] = None,
+                      permissions: Optional[discord.Permissions] = None):
         """
         Cria um comando slash de forma simplificada
         
@@ -23,51 +49,105 @@ class CommandBuilder:
             name: Nome do comando
             description: Descrição do comando
             callback: Função que será executada quando o comando for chamado
-            options: Opções do comando (parâmetros)
+            options: Opções do comando (parâmetros), como {"nome": {...}} ou
+                [{"name": "nome", ...}]. Cada opção aceita description, type,
+                required, default, choices, min_value/max_value,
+                min_length/max_length, autocomplete (corrotina ou "custom_commands",
+                "playlists", "members"), display_name e converter.
+                Se omitido, os parâmetros são lidos da assinatura do callback.
             guild_ids: IDs dos servidores para registrar o comando (None = global)
+            group: Nome do grupo do comando (ex: "debug" para /debug events)
+            auto_defer: Adia a resposta se o handler não responder dentro do
+                orçamento (True = 2.5s, ou um número de segundos)
+            defer_ephemeral: Se o adiamento automático deve ser efêmero
+            cooldown: {"rate": usos, "per": segundos, "scope": "user"|"member"|"guild"|"channel"|"global"}
+                ou uma lista desses dicionários
+            max_concurrency: {"limit": execuções simultâneas, "scope": ...}
+            permissions: Permissões padrão exigidas para usar o comando
             
         Returns:
-            O comando criado
+            O comando criado, ou um decorador se callback não for fornecido
         """
+        if callback is None:
+            # Uso como decorador: @cmd.create_command(name=..., ...)
+            def decorator(func):
+                self.create_command(
+                    name=name,
+                    description=description,
+                    callback=func,
+                    options=options,
+                    guild_ids=guild_ids,
+                    group=group,
+                    auto_defer=auto_defer,
+                    defer_ephemeral=defer_ephemeral,
+                    cooldown=cooldown,
+                    max_concurrency=max_concurrency,
+                    permissions=permissions
+                )
+                return func
+            return decorator
+        
         description = description or f"Comando {name}"
+        qualified_name = f"{group}.{name}" if group else name
+        defer_budget = DEFAULT_DEFER_BUDGET if auto_defer is True else (auto_defer or None)
+        limits = CommandLimits.build(cooldown, max_concurrency)
+        
+        # O esquema das opções é montado uma vez; a invocação só aplica conversores
+        compiled = compile_options(options, callback)
+        converters = compiled.converters
         
         async def wrapper(interaction: discord.Interaction, **kwargs):
-            if callback:
-                await callback(interaction, **kwargs)
-                
+            ctx = CommandContext(qualified_name, interaction, kwargs, defer_budget, defer_ephemeral, limits)
+
+            # Conversão dentro da cadeia: erros de conversor passam pelas métricas e logs
+            async def handler():
+                if converters:
+                    compiled.convert(ctx.kwargs)
+                await callback(ctx.interaction, **ctx.kwargs)
+
+            await run_middlewares(self.middlewares, ctx, handler)
+        
         command = discord.app_commands.Command(
             name=name,
             description=description,
-            callback=wrapper
+            callback=compiled.apply(wrapper)
         )
+        if permissions is not None:
+            command.default_permissions = permissions
         
-        # Configura opções se fornecidas
-        if options:
-            for option_name, option_data in options.items():
-                option_type = option_data.get("type", str)
-                option_default = option_data.get("default", None)
-                
-                # Adiciona descrição para o parâmetro
-                if "description" in option_data:
-                    command.describe(**{option_name: option_data["description"]})
-                    
-                # Adiciona choices se fornecidos
-                if "choices" in option_data:
-                    choices = [
-                        discord.app_commands.Choice(name=choice["name"], value=choice["value"])
-                        for choice in option_data["choices"]
-                    ]
-                    option_choices = discord.app_commands.choices(name=option_name, choices=choices)
-                    command.parameters[option_name].choices = option_choices
-        
-        # Adiciona o comando ao bot
-        if guild_ids:
+        # Adiciona o comando ao bot (ou ao grupo, que já está registrado)
+        if group:
+            self.get_group(group, guild_ids=guild_ids).add_command(command)
+        elif guild_ids:
             for guild_id in guild_ids:
                 self.bot.tree.add_command(command, guild=discord.Object(id=guild_id))
         else:
             self.bot.tree.add_command(command)
             
         return command
+    
+    def get_group(self, name: str, description: str = None, guild_ids: Optional[List[int]] = None):
+        """
+        Retorna (criando e registrando se necessário) um grupo de comandos
+        
+        Args:
+            name: Nome do grupo
+            description: Descrição do grupo
+            guild_ids: IDs dos servidores para registrar o grupo (None = global)
+            
+        Returns:
+            O app_commands.Group
+        """
+        group = self.groups.get(name)
+        if group is None:
+            group = discord.app_commands.Group(name=name, description=description or f"Comandos {name}")
+            if guild_ids:
+                for guild_id in guild_ids:
+                    self.bot.tree.add_command(group, guild=discord.Object(id=guild_id))
+            else:
+                self.bot.tree.add_command(group)
+            self.groups[name] = group
+        return group
 
 # Factory function para criar comandos
 def create_command(bot=None):
@@ -1,12 +1,17 @@
 import discord
-from typing import List, Optional, Union, Dict, Any, Callable
+from typing import List, Optional, Union, Dict, Any, Callable, Sequence
+from .router import StaticView, component_router
+from .views import RegisteredView, view_registry
 
 class ComponentBuilder:
     """
     Classe para facilitar a criação de componentes de interface (botões, selects).
     """
     def __init__(self, timeout: Optional[float] = 180.0):
+        # Views com callbacks ficam registradas no view_registry (ver build)
         self.view = discord.ui.View(timeout=timeout)
+        # Sem callbacks locais, a view não precisa ficar em memória (ver build)
+        self.has_callbacks = False
         
     def add_button(self, 
                    label: str, 
@@ -16,7 +21,9 @@ class ComponentBuilder:
                    disabled: bool = False,
                    emoji: Optional[Union[str, discord.Emoji]] = None,
                    url: Optional[str] = None,
-                   row: Optional[int] = None):
+                   row: Optional[int] = None,
+                   route: Optional[str] = None,
+                   state: Sequence[Any] = ()):
         """
         Adiciona um botão à view
         
@@ -29,7 +36,12 @@ class ComponentBuilder:
             emoji: Emoji para mostrar no botão
             url: URL para botões de link (style=ButtonStyle.link)
             row: Linha onde o botão será exibido (0-4)
+            route: Rota do component_router que atende o botão
+            state: Estado codificado no custom_id da rota
         """
+        if route:
+            custom_id = component_router.custom_id(route, *state)
+        
         if url:
             button = discord.ui.Button(
                 style=discord.ButtonStyle.link,
@@ -54,6 +66,7 @@ class ComponentBuilder:
                 await callback(interaction)
                 
             button.callback = wrapper
+            self.has_callbacks = True
             
         self.view.add_item(button)
         return self
@@ -66,7 +79,9 @@ class ComponentBuilder:
                   min_values: int = 1,
                   max_values: int = 1,
                   disabled: bool = False,
-                  row: Optional[int] = None):
+                  row: Optional[int] = None,
+                  route: Optional[str] = None,
+                  state: Sequence[Any] = ()):
         """
         Adiciona um menu de seleção à view
         
@@ -79,7 +94,12 @@ class ComponentBuilder:
             max_values: Número máximo de valores selecionáveis
             disabled: Se o select está desabilitado
             row: Linha onde o select será exibido (0-4)
+            route: Rota do component_router que atende o select
+            state: Estado codificado no custom_id da rota
         """
+        if route:
+            custom_id = component_router.custom_id(route, *state)
+        
         select = discord.ui.Select(
             placeholder=placeholder,
             custom_id=custom_id or f"select_{placeholder.lower().replace(' ', '_')}",
@@ -104,10 +124,32 @@ class ComponentBuilder:
                 await callback(interaction, select.values)
                 
             select.callback = wrapper
+            self.has_callbacks = True
             
         self.view.add_item(select)
         return self
     
+    def add_item(self, item: discord.ui.Item):
+        """Adiciona um item já construído (ex: discord.ui.Button)"""
+        if getattr(item.callback, "__func__", None) is not discord.ui.Item.callback:
+            self.has_callbacks = True
+        self.view.add_item(item)
+        return self
+    
     def build(self) -> discord.ui.View:
-        """Retorna a view construída"""
-        return self.view
\ No newline at end of file
+        """
+        Retorna a view construída
+        
+        Se nenhum item tem callback local, retorna uma StaticView: os
+        cliques são atendidos pelo component_router e a mensagem não mantém
+        uma view em memória. Caso contrário retorna uma RegisteredView,
+        acompanhada pelo view_registry (limite global e expulsão das mais
+        antigas).
+        """
+        view = RegisteredView(timeout=self.view.timeout) if self.has_callbacks else StaticView()
+        for item in self.view.children:
+            view.add_item(item)
+        if self.has_callbacks:
+            # Estimativa de tamanho com os callbacks já atribuídos
+            view_registry.track(view)
+        return view
\ No newline at end of file
@@ -0,0 +1,207 @@
+import discord
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .helpers import create_embed
+
+class FrozenEmbed(discord.Embed):
+    """
+    Embed imutável gerado a partir de um EmbedTemplate
+
+    O payload de to_dict() é calculado uma única vez e reutilizado em todo
+    envio. Qualquer tentativa de alteração gera TypeError; use copy() para
+    obter um discord.Embed editável.
+    """
+    __slots__ = ("_payload",)
+
+    @classmethod
+    def _make(cls, slots: Dict[str, Any], payload: Dict[str, Any]) -> "FrozenEmbed":
+        embed = object.__new__(cls)
+        for name, value in slots.items():
+            object.__setattr__(embed, name, value)
+        object.__setattr__(embed, "_payload", payload)
+        return embed
+
+    def __setattr__(self, name, value):
+        raise TypeError("Embeds de template são imutáveis; use copy() para obter um embed editável")
+
+    def __delattr__(self, name):
+        raise TypeError("Embeds de template são imutáveis; use copy() para obter um embed editável")
+
+    def _frozen(self, *args, **kwargs):
+        raise TypeError("Embeds de template são imutáveis; use copy() para obter um embed editável")
+
+    add_field = insert_field_at = set_field_at = remove_field = clear_fields = _frozen
+    set_author = remove_author = set_footer = remove_footer = set_image = set_thumbnail = _frozen
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Payload pré-calculado (compartilhado; não deve ser alterado)"""
+        return self._payload
+
+    def copy(self) -> discord.Embed:
+        """Cópia editável do embed"""
+        return discord.Embed.from_dict(deepcopy(self._payload))
+
+def _slots_of(embed: discord.Embed) -> Dict[str, Any]:
+    """Atributos internos presentes no embed (compartilhados entre cópias)"""
+    return {slot: getattr(embed, slot) for slot in discord.Embed.__slots__ if hasattr(embed, slot)}
+
+def _set_text(slot: str):
+    def stamp(slots, payload, value):
+        slots[slot] = value
+        if value:
+            payload[slot] = value
+        else:
+            payload.pop(slot, None)
+    return stamp
+
+def _set_color(slots, payload, value):
+    colour = value if isinstance(value, discord.Colour) else discord.Colour(value)
+    slots["_colour"] = colour
+    payload["color"] = colour.value
+
+def _set_media(key: str):
+    def stamp(slots, payload, value):
+        media = {"url": str(value)}
+        slots[f"_{key}"] = media
+        payload[key] = media
+    return stamp
+
+def _set_footer(slots, payload, value):
+    footer = {"text": str(value)} if not isinstance(value, dict) else {
+        key: str(value[key]) for key in ("text", "icon_url") if value.get(key)
+    }
+    slots["_footer"] = footer
+    payload["footer"] = footer
+
+def _add_fields(slots, payload, value):
+    fields = list(slots.get("_fields", ()))
+    fields.extend(
+        {"name": str(field["name"]), "value": str(field["value"]), "inline": field.get("inline", True)}
+        for field in value
+    )
+    slots["_fields"] = fields
+    payload["fields"] = fields
+
+# Campos que podem ser carimbados em cada resposta
+_STAMPERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any], Any], None]] = {
+    "title": _set_text("title"),
+    "description": _set_text("description"),
+    "url": _set_text("url"),
+    "color": _set_color,
+    "thumbnail": _set_media("thumbnail"),
+    "image": _set_media("image"),
+    "footer": _set_footer,
+    "fields": _add_fields,
+}
+
+class EmbedTemplate:
+    """
+    Protótipo imutável de embed, construído uma única vez
+
+    stamp() cria um FrozenEmbed que compartilha tudo com o protótipo,
+    exceto os campos informados (cópia na escrita).
+    """
+    __slots__ = ("name", "embed", "_slots", "_payload")
+
+    def __init__(self, name: Optional[str] = None, **kwargs):
+        """
+        Args:
+            name: Nome do template no registro
+            **kwargs: Os mesmos argumentos de create_embed
+        """
+        self.name = name
+        base = create_embed(**kwargs)
+        self._slots = _slots_of(base)
+        self._payload = base.to_dict()
+        self.embed = FrozenEmbed._make(self._slots, self._payload)
+
+    def stamp(self, **overrides) -> FrozenEmbed:
+        """
+        Gera um embed com campos próprios da resposta
+
+        Args:
+            **overrides: title, description, url, color, thumbnail, image,
+                footer (texto ou {"text", "icon_url"}) e fields (adicionados
+                após os campos do protótipo)
+
+        Returns:
+            O protótipo, se nada for alterado, ou um novo FrozenEmbed
+        """
+        if not overrides:
+            return self.embed
+        slots = dict(self._slots)
+        payload = dict(self._payload)
+        for key, value in overrides.items():
+            try:
+                stamper = _STAMPERS[key]
+            except KeyError:
+                raise TypeError(f"Campo de embed não suportado: {key}") from None
+            stamper(slots, payload, value)
+        return FrozenEmbed._make(slots, payload)
+
+    def derive(self, name: Optional[str] = None, **overrides) -> "EmbedTemplate":
+        """Cria um novo template a partir deste, com alguns campos alterados"""
+        template = object.__new__(EmbedTemplate)
+        template.name = name
+        template.embed = self.stamp(**overrides)
+        template._slots = _slots_of(template.embed)
+        template._payload = template.embed.to_dict()
+        return template
+
+class EmbedTemplateRegistry:
+    """Registro de templates de embed por nome"""
+
+    def __init__(self):
+        self._templates: Dict[str, EmbedTemplate] = {}
+
+    def register(self, name: str, base: Optional[Union[str, EmbedTemplate]] = None, **kwargs) -> EmbedTemplate:
+        """
+        Registra um template
+
+        Args:
+            name: Nome do template
+            base: Template (ou nome de template) usado como ponto de partida
+            **kwargs: Argumentos de create_embed, ou campos de stamp() quando há base
+
+        Returns:
+            O template registrado
+        """
+        if base is not None:
+            if isinstance(base, str):
+                base = self._templates[base]
+            template = base.derive(name, **kwargs)
+        else:
+            template = EmbedTemplate(name, **kwargs)
+        self._templates[name] = template
+        return template
+
+    def stamp(self, name: str, **overrides) -> FrozenEmbed:
+        """Atalho para embed_templates[name].stamp(...)"""
+        return self._templates[name].stamp(**overrides)
+
+    def __getitem__(self, name: str) -> EmbedTemplate:
+        return self._templates[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def names(self) -> List[str]:
+        return list(self._templates)
+
+# Instância global com os embeds de erro e status mais usados
+embed_templates = EmbedTemplateRegistry()
+
+ERROR = embed_templates.register("error", title="❌ Erro", color=discord.Color.red())
+VOICE_REQUIRED = embed_templates.register(
+    "voice_required", base=ERROR,
+    description="Você precisa estar em um canal de voz para usar este comando!"
+)
+SAME_VOICE_CHANNEL = embed_templates.register(
+    "same_voice_channel", base=ERROR,
+    description="O bot precisa estar no mesmo canal que você!"
+)
+OWNER_ONLY = embed_templates.register(
+    "owner_only", base=ERROR,
+    description="Apenas o dono do bot pode usar este comando."
+)
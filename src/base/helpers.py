@@ -68,7 +68,8 @@ def create_components(buttons: Optional[List[Dict[str, Any]]] = None,
     Função helper para criar componentes rapidamente
     
     Args:
-        buttons: Lista de botões (dicionários de configuração)
+        buttons: Lista de botões (dicionários de configuração, com "route" e
+            "state" opcionais para o component_router, ou discord.ui.Button)
         selects: Lista de selects (dicionários de configuração)
         timeout: Tempo limite da view
         
@@ -79,6 +80,9 @@ def create_components(buttons: Optional[List[Dict[str, Any]]] = None,
     
     if buttons:
         for button in buttons:
+            if isinstance(button, discord.ui.Item):
+                builder.add_item(button)
+                continue
             builder.add_button(
                 label=button["label"],
                 custom_id=button.get("custom_id"),
@@ -87,7 +91,9 @@ def create_components(buttons: Optional[List[Dict[str, Any]]] = None,
                 disabled=button.get("disabled", False),
                 emoji=button.get("emoji"),
                 url=button.get("url"),
-                row=button.get("row")
+                row=button.get("row"),
+                route=button.get("route"),
+                state=button.get("state", ())
             )
     
     if selects:
@@ -100,7 +106,9 @@ def create_components(buttons: Optional[List[Dict[str, Any]]] = None,
                 min_values=select.get("min_values", 1),
                 max_values=select.get("max_values", 1),
                 disabled=select.get("disabled", False),
-                row=select.get("row")
+                row=select.get("row"),
+                route=select.get("route"),
+                state=select.get("state", ())
             )
             
     return builder.build()
@@ -0,0 +1,234 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+from src.utils.metrics import metrics, Histogram, CallCounter, current_db_calls
+from src.utils.logger import bind_log_context, reset_log_context
+from .views import RegisteredView, view_registry
+
+# Limite do Discord para a primeira resposta de uma interação
+INTERACTION_DEADLINE = 3.0
+
+# Buckets para contagem de consultas ao banco por invocação
+DB_CALL_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+class ResponseProxy:
+    """
+    Envolve interaction.response registrando o instante da primeira resposta
+
+    Se o middleware de adiamento já respondeu com defer(), as respostas
+    seguintes do handler são redirecionadas de forma transparente:
+    send_message vira followup.send e edit_message vira edit_original_response.
+    """
+    def __init__(self, interaction: discord.Interaction, ctx: "CommandContext"):
+        self._interaction = interaction
+        self._response = interaction.response
+        self._ctx = ctx
+
+    def _mark(self):
+        if self._ctx.first_response_at is None:
+            self._ctx.first_response_at = time.perf_counter()
+
+    def _bind_view(self, view, editor=None):
+        """Associa views com callbacks ao servidor/usuário no view_registry"""
+        if isinstance(view, RegisteredView):
+            view_registry.bind(view, self._interaction, editor)
+    
+    async def send_message(self, *args, **kwargs):
+        async with self._ctx.response_lock:
+            if self._ctx.auto_deferred:
+                kwargs.pop("delete_after", None)
+                message = await self._interaction.followup.send(*args, **kwargs)
+                self._bind_view(kwargs.get("view"), getattr(message, "edit", None))
+                return message
+            self._mark()
+            result = await self._response.send_message(*args, **kwargs)
+            self._bind_view(kwargs.get("view"))
+            return result
+
+    async def defer(self, *args, **kwargs):
+        async with self._ctx.response_lock:
+            if self._ctx.auto_deferred:
+                return None
+            self._mark()
+            return await self._response.defer(*args, **kwargs)
+
+    async def send_modal(self, *args, **kwargs):
+        async with self._ctx.response_lock:
+            self._mark()
+            return await self._response.send_modal(*args, **kwargs)
+
+    async def edit_message(self, *args, **kwargs):
+        async with self._ctx.response_lock:
+            if self._ctx.auto_deferred:
+                return await self._interaction.edit_original_response(*args, **kwargs)
+            self._mark()
+            return await self._response.edit_message(*args, **kwargs)
+
+    async def auto_defer(self, ephemeral: bool = False) -> bool:
+        """
+        Adia a resposta em nome do handler, se ele ainda não respondeu
+
+        Returns:
+            True se o adiamento foi feito
+        """
+        async with self._ctx.response_lock:
+            if self._ctx.first_response_at is not None or self._response.is_done():
+                return False
+            self._mark()
+            await self._response.defer(ephemeral=ephemeral, thinking=True)
+            self._ctx.auto_deferred = True
+            return True
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+class InteractionProxy:
+    """
+    Interação entregue aos callbacks dos comandos
+
+    Delega tudo para a interação original, exceto response, que passa
+    pelo ResponseProxy para que o middleware saiba quando houve resposta.
+    """
+    def __init__(self, interaction: discord.Interaction, ctx: "CommandContext"):
+        self._interaction = interaction
+        self.response = ResponseProxy(interaction, ctx)
+
+    def __getattr__(self, name):
+        return getattr(self._interaction, name)
+
+class CommandContext:
+    """Estado de uma invocação de comando compartilhado pelos middlewares"""
+
+    def __init__(self, name: str, interaction: discord.Interaction, kwargs: Dict[str, Any],
+                 auto_defer: Optional[float] = None, defer_ephemeral: bool = False,
+                 limits=None):
+        self.name = name
+        self.raw_interaction = interaction
+        self.kwargs = kwargs
+        self.auto_defer = auto_defer
+        self.defer_ephemeral = defer_ephemeral
+        self.limits = limits
+        self.auto_deferred = False
+        self.response_lock = asyncio.Lock()
+        self.started_at = time.perf_counter()
+        self.first_response_at: Optional[float] = None
+        self.db_calls = CallCounter()
+        self.error: Optional[BaseException] = None
+        self.interaction = InteractionProxy(interaction, self)
+
+    @property
+    def time_to_first_response(self) -> Optional[float]:
+        if self.first_response_at is None:
+            return None
+        return self.first_response_at - self.started_at
+
+Middleware = Callable[[CommandContext, Callable[[], Awaitable[None]]], Awaitable[None]]
+
+async def run_middlewares(middlewares: List[Middleware], ctx: CommandContext, handler: Callable[[], Awaitable[None]]):
+    """
+    Executa a cadeia de middlewares terminando no handler
+
+    Args:
+        middlewares: Middlewares na ordem de execução (o primeiro envolve todos)
+        ctx: Contexto da invocação
+        handler: Corrotina final (o callback do comando)
+    """
+    async def call(index: int):
+        if index == len(middlewares):
+            await handler()
+        else:
+            await middlewares[index](ctx, lambda: call(index + 1))
+    await call(0)
+
+async def instrument(ctx: CommandContext, call_next):
+    """
+    Middleware de métricas: tempo até a primeira resposta, tempo total,
+    erros, prazos de 3s perdidos e chamadas ao banco por invocação.
+    Também define o contexto de log (servidor, usuário e comando).
+    """
+    prefix = f"commands.{ctx.name}"
+    metrics.counter(f"{prefix}.calls").inc()
+    token = current_db_calls.set(ctx.db_calls)
+    interaction = ctx.raw_interaction
+    log_token = bind_log_context(
+        guild_id=interaction.guild_id,
+        user_id=interaction.user.id if interaction.user else None,
+        command=ctx.name
+    )
+    try:
+        await call_next()
+    except Exception as e:
+        ctx.error = e
+        metrics.counter(f"{prefix}.errors").inc()
+        raise
+    finally:
+        current_db_calls.reset(token)
+        reset_log_context(log_token)
+        metrics.histogram(f"{prefix}.total").observe(time.perf_counter() - ctx.started_at)
+        metrics.histogram(f"{prefix}.db_calls", DB_CALL_BUCKETS).observe(ctx.db_calls.value)
+
+        ttfr = ctx.time_to_first_response
+        if ttfr is not None:
+            metrics.histogram(f"{prefix}.ttfr").observe(ttfr)
+        if ttfr is None or ttfr > INTERACTION_DEADLINE:
+            metrics.counter(f"{prefix}.deadline_missed").inc()
+
+async def deferral(ctx: CommandContext, call_next):
+    """
+    Middleware de adiamento automático
+
+    Quando o comando define auto_defer, o handler corre contra esse orçamento
+    (segundos desde o recebimento da interação). Se ainda não tiver
+    respondido ao fim do orçamento, a interação é adiada para não perder o
+    prazo de 3s do Discord, e o handler continua normalmente.
+    """
+    if ctx.auto_defer is None:
+        await call_next()
+        return
+
+    handler = asyncio.ensure_future(call_next())
+    remaining = ctx.auto_defer - (time.perf_counter() - ctx.started_at)
+    done, _ = await asyncio.wait({handler}, timeout=max(0.0, remaining))
+    if not done:
+        try:
+            if await ctx.interaction.response.auto_defer(ephemeral=ctx.defer_ephemeral):
+                metrics.counter(f"commands.{ctx.name}.auto_deferred").inc()
+        except Exception as e:
+            # Falha no adiamento não deve cancelar o handler
+            metrics.counter(f"commands.{ctx.name}.auto_defer_errors").inc()
+            ctx.error = e
+    await handler
+
+def command_stats(limit: int = 10, sort_by: str = "p95") -> List[Dict[str, Any]]:
+    """
+    Resumo das métricas por comando, ordenado pelo tempo até a primeira resposta
+
+    Args:
+        limit: Quantidade de comandos retornados
+        sort_by: Campo do histograma de TTFR usado na ordenação
+    """
+    rows = []
+    for name, histogram in list(metrics.histograms.items()):
+        if not (name.startswith("commands.") and name.endswith(".total")):
+            continue
+        command = name[len("commands."):-len(".total")]
+        prefix = f"commands.{command}"
+        calls = metrics.counter(f"{prefix}.calls").value
+        ttfr: Histogram = metrics.histogram(f"{prefix}.ttfr")
+        rows.append({
+            "command": command,
+            "calls": calls,
+            "errors": metrics.counter(f"{prefix}.errors").value,
+            "error_rate": metrics.counter(f"{prefix}.errors").value / calls if calls else 0.0,
+            "deadline_missed": metrics.counter(f"{prefix}.deadline_missed").value,
+            "auto_deferred": metrics.counter(f"{prefix}.auto_deferred").value,
+            "rate_limited": metrics.counter(f"{prefix}.rate_limited").value,
+            "ttfr": ttfr.snapshot(),
+            "total": histogram.snapshot(),
+            "db_calls": metrics.histogram(f"{prefix}.db_calls", DB_CALL_BUCKETS).mean
+        })
+    rows.sort(key=lambda r: r["ttfr"][sort_by], reverse=True)
+    return rows[:limit]
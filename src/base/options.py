@@ -0,0 +1,180 @@
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import discord
+from discord import app_commands
+
+from .autocomplete import AUTOCOMPLETE_SOURCES, MAX_AUTOCOMPLETE
+
+# Nomes aceitos em "type" além dos próprios tipos
+OPTION_TYPES = {
+    "str": str, "string": str,
+    "int": int, "integer": int,
+    "float": float, "number": float,
+    "bool": bool, "boolean": bool,
+    "member": discord.Member,
+    "user": discord.User,
+    "role": discord.Role,
+    "channel": discord.abc.GuildChannel,
+    "text_channel": discord.TextChannel,
+    "voice_channel": discord.VoiceChannel,
+    "attachment": discord.Attachment,
+}
+
+def _to_choice(item) -> app_commands.Choice:
+    if isinstance(item, app_commands.Choice):
+        return item
+    if isinstance(item, dict):
+        return app_commands.Choice(name=str(item["name"]), value=item.get("value", item["name"]))
+    return app_commands.Choice(name=str(item), value=item)
+
+def _wrap_autocomplete(callback: Callable) -> Callable:
+    """
+    Adapta um callback de autocomplete que pode retornar strings, dicionários
+    ou Choices, limitando a 25 sugestões
+    """
+    async def autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice]:
+        results = await callback(interaction, current)
+        return [_to_choice(item) for item in results[:MAX_AUTOCOMPLETE]]
+    return autocomplete
+
+def normalize_options(options: Union[Dict[str, Dict[str, Any]], List[Dict[str, Any]], None]) -> List[Dict[str, Any]]:
+    """
+    Converte as opções para a forma de lista
+
+    Aceita {"nome": {...}} ou [{"name": "nome", ...}].
+    """
+    if not options:
+        return []
+    if isinstance(options, dict):
+        return [{"name": name, **data} for name, data in options.items()]
+    return [dict(option) for option in options]
+
+class CompiledOptions:
+    """
+    Esquema de parâmetros de um comando, construído uma única vez no registro
+
+    Guarda a assinatura usada pelo discord.py para gerar os parâmetros do
+    comando e os conversores aplicados em cada invocação (sem reflexão).
+    """
+    __slots__ = ("signature", "descriptions", "choices", "autocomplete", "renames", "converters")
+
+    def __init__(self):
+        self.signature: Optional[inspect.Signature] = None
+        self.descriptions: Dict[str, str] = {}
+        self.choices: Dict[str, List[app_commands.Choice]] = {}
+        self.autocomplete: Dict[str, Callable] = {}
+        self.renames: Dict[str, str] = {}
+        self.converters: Tuple[Tuple[str, Callable], ...] = ()
+
+    def apply(self, wrapper: Callable) -> Callable:
+        """Aplica o esquema à função que será registrada como callback"""
+        wrapper.__signature__ = self.signature
+        if self.descriptions:
+            app_commands.describe(**self.descriptions)(wrapper)
+        if self.choices:
+            app_commands.choices(**self.choices)(wrapper)
+        if self.autocomplete:
+            app_commands.autocomplete(**self.autocomplete)(wrapper)
+        if self.renames:
+            app_commands.rename(**self.renames)(wrapper)
+        return wrapper
+
+    def convert(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Aplica os conversores pré-compilados aos argumentos recebidos"""
+        for name, converter in self.converters:
+            value = kwargs.get(name)
+            if value is not None:
+                kwargs[name] = converter(value)
+        return kwargs
+
+def _annotation(option: Dict[str, Any]):
+    """Tipo do parâmetro, com Range quando houver limites"""
+    option_type = option.get("type", str)
+    if isinstance(option_type, str):
+        option_type = OPTION_TYPES[option_type.lower()]
+
+    if option_type is str:
+        low, high = option.get("min_length"), option.get("max_length")
+    else:
+        low, high = option.get("min_value"), option.get("max_value")
+    if option_type in (int, float, str) and (low is not None or high is not None):
+        return app_commands.Range[option_type, low, high]
+    return option_type
+
+def compile_options(options, callback: Callable) -> CompiledOptions:
+    """
+    Compila as opções de um comando
+
+    Args:
+        options: Opções em forma de dicionário ou lista. Cada opção aceita
+            name, description, type, required, default, choices,
+            min_value/max_value, min_length/max_length, autocomplete
+            (corrotina ou nome de uma fonte indexada), display_name e converter.
+        callback: Callback do comando (usado só aqui, para herdar os valores
+            padrão ou derivar as opções quando options é None)
+
+    Returns:
+        O CompiledOptions do comando
+    """
+    compiled = CompiledOptions()
+    callback_params = inspect.signature(callback).parameters
+
+    # Sem opções declaradas, usa os parâmetros do próprio callback
+    if options is None:
+        options = [
+            {
+                "name": param.name,
+                "type": param.annotation if param.annotation is not inspect.Parameter.empty else str,
+                **({"default": param.default} if param.default is not inspect.Parameter.empty else {})
+            }
+            for param in list(callback_params.values())[1:]
+            if param.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        ]
+
+    required, optional = [], []
+    converters = []
+    for option in normalize_options(options):
+        name = option["name"]
+        callback_param = callback_params.get(name)
+        callback_default = (
+            callback_param.default
+            if callback_param is not None and callback_param.default is not inspect.Parameter.empty
+            else None
+        )
+        if "required" in option:
+            is_required = option["required"]
+        else:
+            is_required = "default" not in option and (
+                callback_param is None or callback_param.default is inspect.Parameter.empty
+            )
+
+        parameter = inspect.Parameter(
+            name,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            annotation=_annotation(option),
+            default=inspect.Parameter.empty if is_required else option.get("default", callback_default)
+        )
+        (required if is_required else optional).append(parameter)
+
+        compiled.descriptions[name] = option.get("description", "…")
+        if option.get("choices"):
+            compiled.choices[name] = [_to_choice(choice) for choice in option["choices"]]
+        autocomplete = option.get("autocomplete")
+        if isinstance(autocomplete, str):
+            # Fonte indexada pelo nome ("custom_commands", "playlists", "members")
+            compiled.autocomplete[name] = AUTOCOMPLETE_SOURCES[autocomplete]
+        elif autocomplete:
+            compiled.autocomplete[name] = _wrap_autocomplete(autocomplete)
+        if option.get("display_name"):
+            compiled.renames[name] = option["display_name"]
+        if option.get("converter"):
+            converters.append((name, option["converter"]))
+
+    # O Discord exige parâmetros obrigatórios antes dos opcionais
+    interaction_param = inspect.Parameter(
+        "interaction", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=discord.Interaction
+    )
+    compiled.signature = inspect.Signature([interaction_param, *required, *optional])
+    compiled.converters = tuple(converters)
+    return compiled
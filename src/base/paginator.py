@@ -0,0 +1,260 @@
+import asyncio
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import discord
+
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from .helpers import create_components
+from .router import component_router
+
+class Page:
+    """Uma página de resultados e os cursores das páginas vizinhas"""
+    __slots__ = ("items", "prev_cursor", "next_cursor", "total", "offset")
+
+    def __init__(self, items: Sequence[Any], prev_cursor: Optional[str] = None,
+                 next_cursor: Optional[str] = None, total: Optional[int] = None,
+                 offset: Optional[int] = None):
+        """
+        Args:
+            offset: Posição do primeiro item, quando a fonte a conhece; define
+                o número da página exibido
+        """
+        self.items = items
+        self.prev_cursor = prev_cursor
+        self.next_cursor = next_cursor
+        self.total = total
+        self.offset = offset
+
+# Fonte de páginas: (chave da listagem, cursor ou None para a primeira, tamanho) -> Page
+PageSource = Callable[[str, Optional[str], int], Awaitable[Page]]
+
+def sequence_source(get_items: Callable[[str], Sequence[Any]]) -> PageSource:
+    """
+    Fonte de páginas para sequências em memória (listas, deques)
+
+    O cursor é o deslocamento do primeiro item; apenas os itens da página
+    são copiados.
+
+    Args:
+        get_items: Função que retorna a sequência da chave
+    """
+    async def source(key: str, cursor: Optional[str], page_size: int) -> Page:
+        items = get_items(key)
+        total = len(items)
+        # Limitado ao início da última página, para o número da página bater com as posições
+        offset = min(int(cursor or 0), max(0, (total - 1) // page_size * page_size))
+        end = offset + page_size
+        return Page(
+            list(islice(items, offset, end)),
+            # "" aponta para a primeira página (mesma entrada de cache que None)
+            prev_cursor=(str(offset - page_size) if offset > page_size else "") if offset > 0 else None,
+            next_cursor=str(end) if end < total else None,
+            total=total,
+            offset=offset
+        )
+    return source
+
+def mongo_source(collection, query: Callable[[str], Dict[str, Any]], field: str = "_id",
+                 parse: Callable[[str], Any] = str, projection: Optional[Dict[str, Any]] = None,
+                 count: bool = False) -> PageSource:
+    """
+    Fonte de páginas por faixa de valores (keyset) em uma coleção do MongoDB
+
+    Cada página é uma consulta {field: {$gt/$lt: limite}} ordenada pelo
+    campo e limitada ao tamanho da página, sem skip: o custo não cresce com
+    a posição na listagem. O campo deve ser único e indexado.
+
+    Args:
+        collection: Coleção do pymongo
+        query: Função que monta o filtro base a partir da chave da listagem
+        field: Campo único usado como cursor
+        parse: Converte o cursor de volta ao tipo do campo (ex: ObjectId)
+        projection: Projeção aplicada aos documentos
+        count: Se deve contar o total de documentos (custo extra por página)
+    """
+    def fetch(key: str, cursor: Optional[str], page_size: int) -> Page:
+        base = query(key)
+        direction, _, value = (cursor or "").partition(":")
+        backwards = direction == "b"
+
+        condition = dict(base)
+        if value:
+            condition[field] = {"$lt" if backwards else "$gt": parse(value)}
+        documents = list(
+            collection.find(condition, projection)
+            .sort(field, -1 if backwards else 1)
+            .limit(page_size + 1)
+        )
+        more = len(documents) > page_size
+        documents = documents[:page_size]
+        if backwards:
+            documents.reverse()
+
+        first = documents[0][field] if documents else None
+        last = documents[-1][field] if documents else None
+        has_prev = more if backwards else bool(value)
+        has_next = bool(value) if backwards else more
+        return Page(
+            documents,
+            prev_cursor=f"b:{first}" if has_prev and documents else None,
+            next_cursor=f"a:{last}" if has_next and documents else None,
+            total=collection.count_documents(base) if count else None
+        )
+
+    async def source(key: str, cursor: Optional[str], page_size: int) -> Page:
+        # pymongo é síncrono; roda fora do loop de eventos
+        return await asyncio.to_thread(fetch, key, cursor, page_size)
+    return source
+
+class Paginator:
+    """
+    Listagem paginada sob demanda
+
+    Só a página visível é buscada e renderizada; a seguinte é pré-carregada
+    em segundo plano e um cache pequeno guarda as páginas recentes. Os
+    botões são atendidos pelo component_router com a chave, o número e o
+    cursor da página codificados no custom_id, então nenhuma view fica em
+    memória e a navegação continua funcionando após reinícios.
+    """
+
+    def __init__(self,
+                 name: str,
+                 source: PageSource,
+                 render: Callable[[Page, int, int], discord.Embed],
+                 page_size: int = 10,
+                 cache_size: int = 64,
+                 cache_ttl: float = 30.0,
+                 extra_buttons: Optional[Callable[[str], List[Dict[str, Any]]]] = None):
+        """
+        Args:
+            name: Nome da listagem (rotas {name}_prev e {name}_next)
+            source: Fonte de páginas
+            render: Função (página, índice, tamanho da página) -> embed
+            page_size: Itens por página
+            cache_size: Máximo de páginas em cache (somando todas as chaves)
+            cache_ttl: Segundos que uma página em cache continua válida
+            extra_buttons: Função (chave) -> botões exibidos entre Anterior e Próxima
+        """
+        self.name = name
+        self.source = source
+        self.render = render
+        self.page_size = page_size
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.extra_buttons = extra_buttons or (lambda key: [])
+        self._cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, Page]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
+        # Referências às pré-cargas em andamento (evita coleta antes do fim)
+        self._prefetches: Set[asyncio.Task] = set()
+        self.hits = metrics.counter(f"paginator.{name}.hits")
+        self.misses = metrics.counter(f"paginator.{name}.misses")
+        self.log = get_logger(f'paginator.{name}')
+
+        component_router.register(f"{name}_prev", self._navigate, str, int, str)
+        component_router.register(f"{name}_next", self._navigate, str, int, str)
+
+    async def get_page(self, key: str, cursor: Optional[str] = None) -> Page:
+        """
+        Retorna a página do cursor, usando o cache e coalescendo buscas simultâneas
+
+        Args:
+            key: Chave da listagem (ex: ID do servidor)
+            cursor: Cursor da página (None = primeira)
+        """
+        cursor = cursor or None
+        cache_key = (key, cursor)
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            self._cache.move_to_end(cache_key)
+            self.hits.inc()
+            return cached[1]
+
+        future = self._inflight.get(cache_key)
+        if future is None:
+            self.misses.inc()
+            future = self._inflight[cache_key] = asyncio.ensure_future(
+                self.source(key, cursor, self.page_size)
+            )
+            try:
+                page = await future
+            finally:
+                self._inflight.pop(cache_key, None)
+            self._store(cache_key, page)
+            return page
+        return await asyncio.shield(future)
+
+    def _store(self, cache_key, page: Page):
+        self._cache[cache_key] = (time.monotonic(), page)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _prefetch(self, key: str, cursor: Optional[str]):
+        """Carrega a próxima página em segundo plano"""
+        if cursor is None or (key, cursor) in self._cache or (key, cursor) in self._inflight:
+            return
+
+        async def run():
+            try:
+                await self.get_page(key, cursor)
+            except Exception as e:
+                self.log.debug(f"Falha ao pré-carregar página de {key}: {e}")
+        task = asyncio.ensure_future(run())
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+    def invalidate(self, key: str):
+        """Descarta as páginas em cache de uma chave (ex: a fila mudou)"""
+        for cache_key in [k for k in self._cache if k[0] == key]:
+            del self._cache[cache_key]
+
+    async def message(self, key: str, cursor: Optional[str] = None, index: int = 0) -> Dict[str, Any]:
+        """
+        Monta o embed e os botões de uma página
+
+        Args:
+            key: Chave da listagem
+            cursor: Cursor da página (None = primeira)
+            index: Número da página (começando em 0), apenas para exibição
+
+        Returns:
+            Dicionário com embed e view, pronto para send_message/edit_message
+        """
+        key = str(key)
+        page = await self.get_page(key, cursor)
+        self._prefetch(key, page.next_cursor)
+        if page.offset is not None:
+            # A listagem pode ter encolhido desde que o botão foi gerado
+            index = page.offset // self.page_size
+
+        buttons = [
+            {
+                "style": discord.ButtonStyle.secondary,
+                "label": "Anterior",
+                "emoji": "◀️",
+                "route": f"{self.name}_prev",
+                "state": (key, index - 1, page.prev_cursor or ""),
+                "disabled": page.prev_cursor is None
+            },
+            *self.extra_buttons(key),
+            {
+                "style": discord.ButtonStyle.secondary,
+                "label": "Próxima",
+                "emoji": "▶️",
+                "route": f"{self.name}_next",
+                "state": (key, index + 1, page.next_cursor or ""),
+                "disabled": page.next_cursor is None
+            }
+        ]
+        return {
+            "embed": self.render(page, max(0, index), self.page_size),
+            "view": create_components(buttons)
+        }
+
+    async def _navigate(self, interaction: discord.Interaction, key: str, index: int = 0, cursor: str = ""):
+        """Handler dos botões de navegação"""
+        await interaction.response.edit_message(**await self.message(key, cursor or None, index))
@@ -0,0 +1,201 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+from src.utils.metrics import metrics
+
+# Escopos suportados para cooldowns e limites de concorrência
+SCOPES = ("user", "member", "guild", "channel", "global")
+
+def scope_key(scope: str, interaction: discord.Interaction):
+    """
+    Chave do bucket para o escopo
+
+    Args:
+        scope: user, member (usuário por servidor), guild, channel ou global
+        interaction: Interação do comando
+    """
+    if scope == "user":
+        return interaction.user.id
+    if scope == "member":
+        return (interaction.guild_id, interaction.user.id)
+    if scope == "guild":
+        # Em DMs o servidor não existe; limita por usuário
+        return interaction.guild_id or ("dm", interaction.user.id)
+    if scope == "channel":
+        return interaction.channel_id
+    return None
+
+class Cooldown:
+    """
+    Token bucket por chave: `rate` usos a cada `per` segundos
+
+    O estado de cada chave é uma tupla (tokens, atualizado_em). Chaves cujo
+    bucket já estaria cheio são removidas periodicamente.
+    """
+    __slots__ = ("rate", "per", "scope", "_buckets", "_last_sweep")
+
+    def __init__(self, rate: int, per: float, scope: str = "user"):
+        if scope not in SCOPES:
+            raise ValueError(f"Escopo de cooldown inválido: {scope}")
+        self.rate = rate
+        self.per = per
+        self.scope = scope
+        self._buckets: Dict[Any, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def _tokens(self, key, now: float) -> float:
+        """Tokens disponíveis na chave no instante now"""
+        if now - self._last_sweep >= self.per:
+            self._sweep(now)
+        state = self._buckets.get(key)
+        if state is None:
+            return float(self.rate)
+        return min(float(self.rate), state[0] + (now - state[1]) * self.rate / self.per)
+
+    def retry_after(self, key, now: Optional[float] = None) -> float:
+        """
+        Verifica a chave sem consumir um token
+
+        Returns:
+            0.0 se há token disponível, ou os segundos até o próximo token
+        """
+        now = time.monotonic() if now is None else now
+        tokens = self._tokens(key, now)
+        return 0.0 if tokens >= 1.0 else (1.0 - tokens) * self.per / self.rate
+
+    def acquire(self, key, now: Optional[float] = None) -> float:
+        """
+        Consome um token da chave
+
+        Returns:
+            0.0 se permitido, ou os segundos até o próximo token
+        """
+        now = time.monotonic() if now is None else now
+        tokens = self._tokens(key, now)
+        if tokens < 1.0:
+            return (1.0 - tokens) * self.per / self.rate
+
+        self._buckets[key] = (tokens - 1.0, now)
+        return 0.0
+
+    def _sweep(self, now: float):
+        """Remove buckets que já teriam se recarregado por completo"""
+        refill = self.rate / self.per
+        full = [key for key, (tokens, updated) in self._buckets.items()
+                if tokens + (now - updated) * refill >= self.rate]
+        for key in full:
+            del self._buckets[key]
+        self._last_sweep = now
+
+    def __len__(self):
+        return len(self._buckets)
+
+class ConcurrencyLimit:
+    """Máximo de execuções simultâneas por chave"""
+    __slots__ = ("limit", "scope", "_active")
+
+    def __init__(self, limit: int, scope: str = "global"):
+        if scope not in SCOPES:
+            raise ValueError(f"Escopo de concorrência inválido: {scope}")
+        self.limit = limit
+        self.scope = scope
+        self._active: Dict[Any, int] = {}
+
+    def acquire(self, key) -> bool:
+        count = self._active.get(key, 0)
+        if count >= self.limit:
+            return False
+        self._active[key] = count + 1
+        return True
+
+    def release(self, key):
+        count = self._active.get(key, 0) - 1
+        if count > 0:
+            self._active[key] = count
+        else:
+            self._active.pop(key, None)
+
+class CommandLimits:
+    """Cooldowns e limite de concorrência de um comando"""
+    __slots__ = ("cooldowns", "concurrency")
+
+    def __init__(self, cooldowns: List[Cooldown], concurrency: Optional[ConcurrencyLimit]):
+        self.cooldowns = cooldowns
+        self.concurrency = concurrency
+
+    @classmethod
+    def build(cls, cooldown=None, max_concurrency=None) -> Optional["CommandLimits"]:
+        """
+        Cria os limites a partir das opções de create_command
+
+        Args:
+            cooldown: Dicionário {"rate", "per", "scope"} ou lista deles
+            max_concurrency: Dicionário {"limit", "scope"}
+        """
+        if not cooldown and not max_concurrency:
+            return None
+        if isinstance(cooldown, dict):
+            cooldown = [cooldown]
+        cooldowns = [
+            Cooldown(rate=c.get("rate", 1), per=c["per"], scope=c.get("scope", "user"))
+            for c in (cooldown or [])
+        ]
+        concurrency = None
+        if max_concurrency:
+            concurrency = ConcurrencyLimit(
+                limit=max_concurrency.get("limit", 1),
+                scope=max_concurrency.get("scope", "global")
+            )
+        return cls(cooldowns, concurrency)
+
+async def _reject(ctx, description: str):
+    """Responde imediatamente sem executar o handler"""
+    metrics.counter(f"commands.{ctx.name}.rate_limited").inc()
+    await ctx.interaction.response.send_message(
+        embed=discord.Embed(title="⏳ Aguarde", description=description, color=discord.Color.orange()),
+        ephemeral=True
+    )
+
+async def rate_limit(ctx, call_next):
+    """
+    Middleware de cooldowns e concorrência
+
+    Verifica os limites antes do handler; se algum for excedido, responde
+    com uma mensagem efêmera e não executa o comando.
+    """
+    limits: Optional[CommandLimits] = ctx.limits
+    if limits is None:
+        await call_next()
+        return
+
+    interaction = ctx.raw_interaction
+    now = time.monotonic()
+    # Todos os limites são verificados antes de consumir qualquer token: uma
+    # rejeição não gasta os buckets que teriam passado
+    buckets = [(cooldown, scope_key(cooldown.scope, interaction)) for cooldown in limits.cooldowns]
+    for cooldown, bucket in buckets:
+        retry_after = cooldown.retry_after(bucket, now)
+        if retry_after:
+            await _reject(ctx, f"Este comando está em cooldown. Tente novamente em {retry_after:.1f}s.")
+            return
+
+    concurrency = limits.concurrency
+    key = None
+    if concurrency is not None:
+        key = scope_key(concurrency.scope, interaction)
+        if not concurrency.acquire(key):
+            await _reject(ctx, "Este comando já está em execução. Aguarde a execução atual terminar.")
+            return
+
+    for cooldown, bucket in buckets:
+        cooldown.acquire(bucket, now)
+
+    if concurrency is None:
+        await call_next()
+        return
+    try:
+        await call_next()
+    finally:
+        concurrency.release(key)
@@ -0,0 +1,136 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+import discord
+
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics, Histogram
+
+# Separador entre o nome da rota e o estado no custom_id ("queue_next:2")
+SEPARATOR = ":"
+
+# Limite do Discord para custom_id
+MAX_CUSTOM_ID = 100
+
+class StaticView(discord.ui.View):
+    """
+    View apenas de apresentação, para componentes atendidos pelo roteador
+
+    Como is_finished() é sempre verdadeiro, o discord.py não a guarda no
+    ViewStore: a mensagem não custa memória por view e os cliques chegam ao
+    ComponentRouter pelo evento on_interaction, inclusive após reinícios.
+    """
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    def is_finished(self) -> bool:
+        return True
+
+class Route:
+    """Handler de componentes registrado para um nome de custom_id"""
+    __slots__ = ("name", "handler", "converters", "latency", "calls", "errors")
+
+    def __init__(self, name: str, handler: Callable[..., Awaitable], converters: Sequence[Callable[[str], Any]]):
+        self.name = name
+        self.handler = handler
+        self.converters = tuple(converters)
+        self.latency: Histogram = metrics.histogram(f"components.{name}")
+        self.calls = metrics.counter(f"components.{name}.calls")
+        self.errors = metrics.counter(f"components.{name}.errors")
+
+class ComponentRouter:
+    """
+    Roteador global de componentes por custom_id
+
+    O custom_id tem a forma "nome" ou "nome:estado1:estado2"; o nome indexa
+    um dicionário de rotas (despacho O(1)) e o estado é convertido pelos
+    conversores da rota e passado ao handler como argumentos posicionais.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Route] = {}
+        self.log = get_logger('components.router')
+
+    def register(self, name: str, handler: Callable[..., Awaitable], *converters: Callable[[str], Any]) -> Route:
+        """
+        Registra o handler de uma rota
+
+        Args:
+            name: Nome da rota (prefixo do custom_id, sem ':')
+            handler: Corrotina (interaction, *estado)
+            *converters: Conversores aplicados a cada parte do estado (ex: int)
+
+        Returns:
+            A rota registrada
+        """
+        if SEPARATOR in name:
+            raise ValueError(f"Nome de rota não pode conter '{SEPARATOR}': {name}")
+        route = self._routes[name] = Route(name, handler, converters)
+        return route
+
+    def route(self, name: str, *converters: Callable[[str], Any]):
+        """Versão decorador de register()"""
+        def decorator(func):
+            self.register(name, func, *converters)
+            return func
+        return decorator
+
+    def custom_id(self, name: str, *state) -> str:
+        """
+        Monta o custom_id de uma rota com o estado codificado
+
+        Args:
+            name: Nome da rota
+            *state: Valores do estado (convertidos com str)
+
+        Returns:
+            O custom_id (no máximo 100 caracteres)
+        """
+        custom_id = SEPARATOR.join((name, *map(str, state)))
+        if len(custom_id) > MAX_CUSTOM_ID:
+            raise ValueError(f"custom_id excede {MAX_CUSTOM_ID} caracteres: {custom_id[:40]}...")
+        return custom_id
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._routes
+
+    async def dispatch(self, interaction: discord.Interaction) -> bool:
+        """
+        Encaminha a interação de componente para a rota correspondente
+
+        Inscrito no evento on_interaction do barramento. Interações sem rota
+        (views com callbacks próprios, comandos, modais) são ignoradas.
+
+        Returns:
+            True se alguma rota tratou a interação
+        """
+        if interaction.type is not discord.InteractionType.component:
+            return False
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        name, _, state = custom_id.partition(SEPARATOR)
+        route = self._routes.get(name)
+        if route is None:
+            return False
+
+        route.calls.inc()
+        start = time.perf_counter()
+        try:
+            parts = state.split(SEPARATOR, len(route.converters) - 1) if state and route.converters else ()
+            args = [convert(part) for convert, part in zip(route.converters, parts)]
+            await route.handler(interaction, *args)
+        except Exception as e:
+            route.errors.inc()
+            self.log.error(f"Erro na rota de componente '{name}' ({custom_id}): {e}")
+        finally:
+            route.latency.observe(time.perf_counter() - start)
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Chamadas, erros e latência por rota"""
+        return {
+            name: {"calls": route.calls.value, "errors": route.errors.value, **route.latency.snapshot()}
+            for name, route in self._routes.items()
+        }
+
+# Instância global, inscrita em on_interaction pelo BotClient
+component_router = ComponentRouter()
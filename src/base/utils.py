@@ -53,6 +53,7 @@ async def confirm_action(interaction: discord.Interaction,
     """
     from .embeds import EmbedBuilder
     from .components import ComponentBuilder
+    from .views import view_registry
     
     # Criar embed de confirmação
     embed = EmbedBuilder(
@@ -61,60 +62,54 @@ async def confirm_action(interaction: discord.Interaction,
         color=discord.Color.yellow()
     ).build()
     
-    # Criar botões
-    view = ComponentBuilder().add_button(
-        label="Confirmar",
-        custom_id="confirm",
-        style=discord.ButtonStyle.success,
-        emoji="✅"
-    ).add_button(
-        label="Cancelar",
-        custom_id="cancel",
-        style=discord.ButtonStyle.danger,
-        emoji="❌"
-    ).build()
-    
     # Variável para armazenar o resultado
     result = {"confirmed": False}
     
-    # Callbacks dos botões
-    async def confirm_callback(button_interaction):
+    async def finish(button_interaction, confirmed):
         if button_interaction.user.id != interaction.user.id:
             await button_interaction.response.send_message("Você não pode usar este botão.", ephemeral=True)
             return
         
-        result["confirmed"] = True
+        result["confirmed"] = confirmed
         for child in view.children:
             child.disabled = True
         
         await button_interaction.response.edit_message(view=view)
         view.stop()
     
+    async def confirm_callback(button_interaction):
+        await finish(button_interaction, True)
+    
     async def cancel_callback(button_interaction):
-        if button_interaction.user.id != interaction.user.id:
-            await button_interaction.response.send_message("Você não pode usar este botão.", ephemeral=True)
-            return
-        
-        for child in view.children:
-            child.disabled = True
-        
-        await button_interaction.response.edit_message(view=view)
-        view.stop()
+        await finish(button_interaction, False)
     
-    # Atribuir callbacks
-    view.children[0].callback = confirm_callback
-    view.children[1].callback = cancel_callback
+    # Criar botões (a view fica acompanhada pelo view_registry)
+    view = ComponentBuilder(timeout=timeout).add_button(
+        label="Confirmar",
+        custom_id="confirm",
+        style=discord.ButtonStyle.success,
+        emoji="✅",
+        callback=confirm_callback
+    ).add_button(
+        label="Cancelar",
+        custom_id="cancel",
+        style=discord.ButtonStyle.danger,
+        emoji="❌",
+        callback=cancel_callback
+    ).build()
     
     # Enviar mensagem com embed e botões
     await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+    view_registry.bind(view, interaction)
     
-    # Esperar pela interação ou timeout
-    try:
-        await view.wait()
-    except asyncio.TimeoutError:
+    # Esperar pela interação ou timeout (wait() retorna True quando expira)
+    if await view.wait():
         for child in view.children:
             child.disabled = True
-        await interaction.edit_original_response(view=view)
+        try:
+            await interaction.edit_original_response(view=view)
+        except discord.HTTPException:
+            pass
     
     return result["confirmed"]
 
@@ -0,0 +1,210 @@
+import asyncio
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+class _Entry:
+    """Registro de uma view viva"""
+    __slots__ = ("ref", "guild_id", "user_id", "created_at", "size", "editor")
+
+    def __init__(self, ref, size: int):
+        self.ref = ref
+        self.guild_id: Optional[int] = None
+        self.user_id: Optional[int] = None
+        self.created_at = time.monotonic()
+        self.size = size
+        self.editor: Optional[Callable[..., Awaitable]] = None
+
+def estimate_view_size(view: discord.ui.View) -> int:
+    """
+    Estimativa rasa do tamanho de uma view em bytes
+
+    Soma a view, seus itens, seus atributos e as closures dos callbacks
+    (onde costumam ficar a interação e o estado capturados).
+    """
+    seen = set()
+
+    def size(obj) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    total = size(view) + size(getattr(view, "__dict__", {}))
+    for item in view.children:
+        total += size(item) + size(getattr(item, "__dict__", {}))
+        callback = item.__dict__.get("callback") if hasattr(item, "__dict__") else None
+        for cell in getattr(callback, "__closure__", None) or ():
+            total += size(cell)
+            try:
+                total += size(cell.cell_contents)
+            except ValueError:
+                pass
+    return total
+
+class RegisteredView(discord.ui.View):
+    """
+    View acompanhada pelo ViewRegistry global
+
+    É registrada por ComponentBuilder.build() (ou view_registry.track()) e
+    sai do registro quando termina (stop ou timeout); se for coletada antes
+    de ser enviada, a referência fraca a remove automaticamente.
+    """
+    def stop(self):
+        view_registry.discard(self)
+        super().stop()
+
+    async def on_timeout(self):
+        view_registry.discard(self)
+
+class ViewRegistry:
+    """
+    Views vivas por servidor e usuário, com limite global
+
+    Quando a quantidade ou o tamanho estimado excede o limite, as views
+    mais antigas são encerradas: seus botões são desabilitados (editando a
+    mensagem quando a interação de origem é conhecida) e o discord.py deixa
+    de mantê-las em memória.
+    """
+
+    def __init__(self, max_views: int = 5000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_views = max_views
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.by_guild: Dict[Optional[int], int] = {}
+        self.by_user: Dict[Optional[int], int] = {}
+        self.evicted = metrics.counter("views.evicted")
+        self.log = get_logger('views.registry')
+
+    def configure(self, max_views: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Ajusta os limites globais
+
+        Args:
+            max_views: Máximo de views vivas
+            max_bytes: Máximo de bytes estimados somando todas as views
+        """
+        if max_views is not None:
+            self.max_views = max_views
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+    def track(self, view: discord.ui.View):
+        """Passa a acompanhar uma view recém-criada"""
+        key = id(view)
+        if key in self._entries:
+            return
+        entry = _Entry(weakref.ref(view, lambda ref, key=key: self._remove(key, ref)), estimate_view_size(view))
+        self._entries[key] = entry
+        self._account(entry, 1)
+        self._enforce()
+
+    def bind(self, view: discord.ui.View, interaction: discord.Interaction, editor: Optional[Callable[..., Awaitable]] = None):
+        """
+        Associa a view ao servidor e usuário da interação que a enviou
+
+        Args:
+            view: View enviada
+            interaction: Interação cuja resposta contém a view
+            editor: Corrotina usada para editar a mensagem na expulsão
+                (padrão: interaction.edit_original_response)
+        """
+        entry = self._entries.get(id(view))
+        if entry is None or entry.ref() is not view:
+            return
+        self._account(entry, -1)
+        entry.guild_id = interaction.guild_id
+        entry.user_id = interaction.user.id
+        # O tamanho é recalculado: callbacks costumam ser atribuídos após build()
+        entry.size = estimate_view_size(view)
+        entry.editor = editor or interaction.edit_original_response
+        self._account(entry, 1)
+        self._enforce()
+
+    def discard(self, view: discord.ui.View):
+        """Para de acompanhar uma view (encerrada ou expirada)"""
+        entry = self._entries.get(id(view))
+        if entry is not None and entry.ref() is view:
+            self._remove(id(view), entry.ref)
+
+    def _remove(self, key: int, ref):
+        entry = self._entries.get(key)
+        if entry is None or entry.ref is not ref:
+            return
+        del self._entries[key]
+        self._account(entry, -1)
+
+    def _account(self, entry: _Entry, sign: int):
+        self.bytes += sign * entry.size
+        for counts, key in ((self.by_guild, entry.guild_id), (self.by_user, entry.user_id)):
+            value = counts.get(key, 0) + sign
+            if value > 0:
+                counts[key] = value
+            else:
+                counts.pop(key, None)
+        metrics.gauge("views.live").set(len(self._entries))
+        metrics.gauge("views.bytes").set(self.bytes)
+
+    def _enforce(self):
+        """Encerra as views mais antigas enquanto algum limite for excedido"""
+        while self._entries and (len(self._entries) > self.max_views or self.bytes > self.max_bytes):
+            key, entry = self._entries.popitem(last=False)
+            self._account(entry, -1)
+            view = entry.ref()
+            if view is not None:
+                self.evicted.inc()
+                self._evict(view, entry.editor)
+
+    def _evict(self, view: discord.ui.View, editor: Optional[Callable[..., Awaitable]]):
+        for item in view.children:
+            if hasattr(item, "disabled"):
+                item.disabled = True
+        # Encerrada, a view sai do ViewStore do discord.py
+        view.stop()
+        if editor is not None:
+            try:
+                asyncio.get_running_loop().create_task(self._edit(editor, view))
+            except RuntimeError:
+                pass
+
+    async def _edit(self, editor, view):
+        try:
+            await editor(view=view)
+        except Exception as e:
+            # A mensagem pode ter sido apagada ou o token da interação expirado
+            self.log.debug(f"Não foi possível desabilitar a view expulsa: {e}")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self, limit: int = 5) -> Dict[str, Any]:
+        """
+        Resumo das views vivas
+
+        Args:
+            limit: Quantidade de servidores/usuários com mais views
+        """
+        top = lambda counts: sorted(
+            ((key, count) for key, count in counts.items() if key is not None),
+            key=lambda pair: pair[1], reverse=True
+        )[:limit]
+        return {
+            "live": len(self._entries),
+            "bytes": self.bytes,
+            "max_views": self.max_views,
+            "max_bytes": self.max_bytes,
+            "evicted": self.evicted.value,
+            "top_guilds": top(self.by_guild),
+            "top_users": top(self.by_user)
+        }
+
+# Instância global usada pelo ComponentBuilder e por confirm_action
+view_registry = ViewRegistry()
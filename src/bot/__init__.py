@@ -5,10 +5,13 @@ Este pacote contém os componentes essenciais para o funcionamento do bot.
 
 from .client import BotClient
 from .config import Config
+from .shutdown import ShutdownCoordinator, DrainResult
 from .constants import *
 
 # Exportar classes e funções principais
 __all__ = [
     "BotClient",
-    "Config"
+    "Config",
+    "ShutdownCoordinator",
+    "DrainResult"
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import Intents
 import os
@@ -6,12 +7,27 @@ import importlib
 
 # Importa a base API
 from src.base import create_command, create_embed, create_components
+from src.base.router import component_router
+from src.base.views import view_registry
+from src.bot.shutdown import (
+    ShutdownCoordinator,
+    PRIORITY_INTAKE, PRIORITY_OUTBOUND, PRIORITY_STORAGE, PRIORITY_CONNECTION, PRIORITY_LOGS
+)
+from src.events import setup_all_events, GuildEventPipeline
+from src.utils import log_digest, scheduler, guild_configs
+from src.utils.logger import log_pipeline, shutdown_logging, configure_logging
+from src.utils.player import players, FFmpegNode
+from src.utils.track_cache import track_cache
 
 class BotClient:
     def __init__(self, config):
         # Configuração
         self.config = config
         
+        # Formato, retenção e amostragem dos logs (reaplicados no hot reload)
+        configure_logging(config)
+        config.on_change(configure_logging)
+        
         # Intents
         intents = Intents.default()
         intents.message_content = True
@@ -23,8 +39,97 @@ class BotClient:
         # Command builder da sua base API
         self.cmd = create_command(self.bot)
         
+        # Desligamento gracioso (subsistemas registram seus hooks de drenagem aqui)
+        self.shutdown = ShutdownCoordinator()
+        self.shutdown.register("gateway", self._close_gateway, priority=PRIORITY_CONNECTION, timeout=5.0)
+        self.shutdown.register(
+            "logs", shutdown_logging, priority=PRIORITY_LOGS, timeout=2.0,
+            pending=lambda: log_pipeline.queue.qsize()
+        )
+        self.shutdown.register("config", config.flush, priority=PRIORITY_STORAGE, timeout=2.0)
+        
+        # Configuração por servidor: padrões → settings.yml (com hot reload) → documento
+        guild_configs.configure(config)
+        
+        # Pipeline de eventos com filas por servidor
+        self.events = GuildEventPipeline(
+            workers=config.get("eventos.workers", 8),
+            max_queue_size=config.get("eventos.tamanho_fila", 256),
+            policies=config.get("eventos.politicas", {})
+        )
+        self.shutdown.register(
+            "event_queues", self.events.drain,
+            priority=PRIORITY_INTAKE, timeout=10.0,
+            pending=lambda: self.events.depth
+        )
+        
+        # Logs de moderação e saídas em modo digest
+        log_digest.configure(
+            interval=config.get("recursos.moderacao.digest.intervalo", 30),
+            max_entries=config.get("recursos.moderacao.digest.max_eventos", 50),
+            enabled=config.get("recursos.moderacao.logs_habilitado", True)
+        )
+        self.shutdown.register(
+            "log_digest", log_digest.flush_all,
+            priority=PRIORITY_OUTBOUND, timeout=5.0,
+            pending=lambda: log_digest.pending
+        )
+        
+        # Ações temporizadas (tempban, lembretes); o timer inicia em on_ready
+        scheduler.configure(
+            window=config.get("agendador.janela", 600),
+            max_loaded=config.get("agendador.max_carregados", 1000),
+            batch_size=config.get("agendador.lote", 50),
+            max_attempts=config.get("agendador.tentativas", 3)
+        )
+        self.shutdown.register("scheduler", scheduler.stop, priority=PRIORITY_INTAKE, timeout=5.0)
+        
+        # Metadados de faixas resolvidas (memória + SQLite entre reinícios)
+        track_cache.configure(
+            path=os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                config.get("recursos.musica.cache.arquivo", "data/track_cache.db")
+            ),
+            max_entries=config.get("recursos.musica.cache.max_memoria", 2000),
+            ttl=config.get("recursos.musica.cache.ttl_memoria", 3600),
+            disk_ttl=config.get("recursos.musica.cache.ttl_arquivo", 7 * 86400)
+        )
+        self.shutdown.register("track_cache", track_cache.close, priority=PRIORITY_STORAGE, timeout=2.0)
+        
+        # Reprodução de música (players por servidor, criados no primeiro /play)
+        players.configure(
+            node=FFmpegNode(local_root=config.get("recursos.musica.pasta_local")),
+            volume=config.get("recursos.musica.volume_padrao", 70) / 100,
+            idle_timeout=config.get("recursos.musica.auto_desconectar", 300),
+            max_queue=config.get("recursos.musica.max_fila", 500),
+            max_playlist=config.get("recursos.musica.max_playlist", 50),
+            prefetch=config.get("recursos.musica.pre_carregar", 2),
+            buffer_seconds=config.get("recursos.musica.buffer_segundos", 2)
+        )
+        self.shutdown.register(
+            "music", players.shutdown, priority=PRIORITY_OUTBOUND, timeout=5.0,
+            pending=lambda: len(players)
+        )
+        
+        # Limite global das views com callbacks vivas
+        view_registry.configure(
+            max_views=config.get("componentes.views.max_views", 5000),
+            max_bytes=config.get("componentes.views.max_mb", 64) * 1024 * 1024
+        )
+        
         # Registra eventos
         self.bot.event(self.on_ready)
+        self.handlers = setup_all_events(self.bot, self.events, config)
+        self.bus = self.bot.event_bus = self.handlers["bus"]
+        
+        # Botões e selects persistentes, atendidos pelo custom_id
+        self.bus.subscribe('on_interaction', component_router.dispatch, name='components.router')
+        coalescer = self.handlers["member"].coalescer
+        self.shutdown.register(
+            "welcome_batches", coalescer.flush_all,
+            priority=PRIORITY_OUTBOUND, timeout=5.0,
+            pending=lambda: coalescer.pending
+        )
         
         # Carrega módulos
         self._load_modules()
@@ -34,6 +139,9 @@ class BotClient:
         print(f'Bot conectado como {self.bot.user.name} ({self.bot.user.id})')
         print('------')
         
+        # Os handlers dos agendamentos precisam do cache de servidores
+        scheduler.start()
+        
         # Define status do bot
         await self.bot.change_presence(
             activity=discord.Activity(
@@ -46,26 +154,33 @@ class BotClient:
         """Carrega todos os módulos de comandos dinamicamente"""
         try:
             # Exemplo de comando básico usando a base API
-            @self.cmd.create_command(
-                name="ping",
-                description="Verifica a latência do bot"
-            )
-            async def ping_command(interaction):
-                await interaction.response.send_message(
-                    embed=create_embed(
+            def ping_message():
+                return {
+                    "embed": create_embed(
                         title="🏓 Pong!",
                         description=f"Latência: {round(self.bot.latency * 1000)}ms",
                         color=discord.Color.green()
                     ),
-                    view=create_components([
-                        discord.ui.Button(
-                            label="Atualizar",
-                            custom_id="refresh_ping",
-                            emoji="🔄",
-                            style=discord.ButtonStyle.primary
-                        )
+                    "view": create_components([
+                        {
+                            "label": "Atualizar",
+                            "route": "refresh_ping",
+                            "emoji": "🔄",
+                            "style": discord.ButtonStyle.primary
+                        }
                     ])
-                )
+                }
+            
+            @self.cmd.create_command(
+                name="ping",
+                description="Verifica a latência do bot"
+            )
+            async def ping_command(interaction):
+                await interaction.response.send_message(**ping_message())
+            
+            @component_router.route("refresh_ping")
+            async def refresh_ping(interaction):
+                await interaction.response.edit_message(**ping_message())
             
             # Procura por módulos de comando na pasta commands
             commands_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "commands")
@@ -83,6 +198,11 @@ class BotClient:
         except Exception as e:
             print(f"Erro ao carregar módulos: {e}")
     
+    async def _close_gateway(self):
+        """Fecha a conexão com o Discord"""
+        if not self.bot.is_closed():
+            await self.bot.close()
+    
     def run(self):
         """Inicia o bot"""
         token = self.config.get("token")
@@ -91,4 +211,30 @@ class BotClient:
             if not token:
                 raise ValueError("Token não encontrado nas configurações ou variáveis de ambiente")
         
-        self.bot.run(token)
\ No newline at end of file
+        report = asyncio.run(self._run(token))
+        print(report.summary())
+        return report
+    
+    async def _run(self, token):
+        """Executa o bot até o gateway cair ou um sinal de desligamento chegar"""
+        self.shutdown.install_signal_handlers(asyncio.get_running_loop())
+        self.events.start()
+        
+        # Hot reload do settings.yml
+        watcher = asyncio.create_task(self.config.watch(self.config.get("bot.recarregar_config", 5)))
+        
+        runner = asyncio.create_task(self.bot.start(token))
+        stopper = asyncio.create_task(self.shutdown.wait())
+        done, _ = await asyncio.wait({runner, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        
+        # Sem motivo explícito, o relatório usa o nome do sinal recebido
+        reason = None if stopper in done else "gateway encerrado"
+        report = await self.shutdown.shutdown(reason)
+        
+        stopper.cancel()
+        watcher.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+        return report
@@ -1,44 +1,90 @@
+import asyncio
+import copy
 import os
+import tempfile
+import threading
 import yaml
 from dotenv import load_dotenv
 
 # Carrega variáveis de ambiente
 load_dotenv()
 
+# Chaves que vêm do ambiente e nunca são gravadas no arquivo
+SENSITIVE_KEYS = ["token", "owner_id", "guild_id", "mongo_url"]
+
+class ConfigSnapshot:
+    """
+    Visão compilada e imutável da configuração
+
+    Todas as chaves com notação de ponto (inclusive as intermediárias, como
+    "recursos.musica") são achatadas em um único dicionário, então get() é
+    uma consulta só, sem dividir a chave nem percorrer os níveis.
+    """
+    __slots__ = ("tree", "flat")
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.flat = {}
+        self._flatten(tree, "")
+
+    def _flatten(self, node, prefix):
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            self.flat[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, path + ".")
+
 class Config:
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, save_delay=2.0):
         """
         Inicializa a configuração do bot
-        
+
         Args:
             config_path (str, opcional): Caminho para o arquivo de configuração
+            save_delay (float): Segundos agrupando alterações antes de gravar o arquivo
         """
         if config_path is None:
             # Caminho padrão para o arquivo de configuração
             base_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
             config_path = os.path.join(base_path, "config", "settings.yml")
-        
+
         self.config_path = config_path
-        self._load_config()
-        
-        # Adiciona variáveis de ambiente à configuração
-        self._add_env_vars()
-    
+        self.save_delay = save_delay
+        self._listeners = []
+        self._save_handle = None
+        self._write_lock = threading.Lock()
+        self._file_stamp = None
+
+        # Variáveis de ambiente ficam em uma camada separada do arquivo
+        self._env = self._env_vars()
+        self._file = self._load_config()
+        self._snapshot = self._compile()
+
+    @property
+    def config(self):
+        """
+        Cópia da configuração atual como dicionário aninhado
+
+        Alterações na cópia não afetam o snapshot compartilhado; use set()
+        para mudar a configuração.
+        """
+        return copy.deepcopy(self._snapshot.tree)
+
     def _load_config(self):
         """Carrega as configurações do arquivo YAML"""
         try:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.config = yaml.safe_load(f)
-            else:
-                self.config = {}
-                print(f"Aviso: Arquivo de configuração não encontrado em {self.config_path}")
+                    data = yaml.safe_load(f) or {}
+                self._file_stamp = self._stamp()
+                return data
+            print(f"Aviso: Arquivo de configuração não encontrado em {self.config_path}")
         except Exception as e:
-            self.config = {}
             print(f"Erro ao carregar configurações: {e}")
-    
-    def _add_env_vars(self):
-        """Adiciona variáveis de ambiente importantes à configuração"""
+        return {}
+
+    def _env_vars(self):
+        """Lê as variáveis de ambiente importantes para a configuração"""
         env_vars = {
             "token": os.getenv("DISCORD_TOKEN"),
             "owner_id": os.getenv("OWNER_ID"),
@@ -48,55 +94,182 @@ class Config:
             "mongo_url": os.getenv("MONGO_URL"),
             "db_name": os.getenv("DB_NAME")
         }
-        
+
         # Adiciona apenas as variáveis que existem
-        for key, value in env_vars.items():
-            if value is not None:
-                self.config[key] = value
-    
+        return {key: value for key, value in env_vars.items() if value is not None}
+
+    def _compile(self):
+        """Monta um novo snapshot (arquivo + ambiente)"""
+        return ConfigSnapshot({**self._file, **self._env})
+
+    def _swap(self):
+        """Publica um novo snapshot; leitores em andamento continuam com o anterior"""
+        self._snapshot = self._compile()
+        for listener in self._listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Erro ao notificar alteração de configuração: {e}")
+
+    def on_change(self, listener):
+        """
+        Registra uma função chamada após cada alteração ou recarga
+
+        Args:
+            listener: Função que recebe a instância de Config
+        """
+        self._listeners.append(listener)
+        return listener
+
     def get(self, key, default=None):
         """
         Obtém um valor da configuração
-        
+
         Args:
             key (str): Chave da configuração (suporta notação de ponto para acessar estruturas aninhadas)
             default: Valor padrão caso a chave não exista
-            
+
         Returns:
             O valor da configuração ou o valor padrão
         """
-        # Suporte para notação de ponto (ex: recursos.musica.habilitado)
-        if "." in key:
-            parts = key.split(".")
-            value = self.config
-            for part in parts:
-                if isinstance(value, dict) and part in value:
-                    value = value[part]
-                else:
-                    return default
-            return value
-        
-        return self.config.get(key, default)
-    
+        # Sem trava: o snapshot é trocado por inteiro, nunca modificado
+        return self._snapshot.flat.get(key, default)
+
     def set(self, key, value):
         """
         Define um valor na configuração
-        
+
+        A gravação no arquivo é agrupada: várias alterações seguidas geram
+        uma única escrita, feita fora do loop de eventos.
+
         Args:
-            key (str): Chave da configuração
+            key (str): Chave da configuração (suporta notação de ponto)
             value: Valor a ser definido
         """
-        self.config[key] = value
-        self.save_config()
+        parts = key.split(".")
+        # Copia apenas o caminho alterado; o restante é compartilhado com o snapshot anterior
+        tree = dict(self._file)
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part)
+            node[part] = dict(child) if isinstance(child, dict) else {}
+            node = node[part]
+        node[parts[-1]] = value
+
+        self._file = tree
+        self._swap()
+        self._schedule_save()
+
+    def _schedule_save(self):
+        """Agenda a gravação do arquivo (debounce)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Fora do loop (scripts, inicialização): grava imediatamente
+            self.save_config()
+            return
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = loop.call_later(
+            self.save_delay, lambda: loop.create_task(self._save_async())
+        )
+
+    async def _save_async(self):
+        self._save_handle = None
+        try:
+            await asyncio.to_thread(self.save_config)
+        except Exception as e:
+            print(f"Erro ao salvar configurações: {e}")
+
+    async def flush(self):
+        """
+        Grava imediatamente alterações pendentes (usado no desligamento)
+
+        Returns:
+            1 se havia uma gravação pendente, senão 0
+        """
+        if self._save_handle is None:
+            return 0
+        self._save_handle.cancel()
+        await self._save_async()
+        return 1
 
     def save_config(self):
-        """Salva as configurações no arquivo YAML"""
+        """Salva as configurações no arquivo YAML (escrita atômica)"""
         # Não salva informações sensíveis no arquivo
-        sensitive_keys = ["token", "owner_id", "guild_id", "mongo_url"]
-        save_config = {k: v for k, v in self.config.items() if k not in sensitive_keys}
-        
+        save_config = {k: v for k, v in self._file.items() if k not in SENSITIVE_KEYS}
+
         # Garante que o diretório de configuração existe
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(save_config, f, default_flow_style=False, sort_keys=False)
\ No newline at end of file
+        directory = os.path.dirname(self.config_path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Escreve em um arquivo temporário no mesmo diretório e renomeia:
+        # leitores (e o próprio watcher) nunca veem um arquivo pela metade
+        with self._write_lock:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".settings-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    yaml.safe_dump(save_config, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.config_path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._file_stamp = self._stamp()
+
+    def _stamp(self):
+        """Identifica a versão do arquivo em disco (mtime e tamanho)"""
+        try:
+            stat = os.stat(self.config_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _read_changed(self):
+        """Lê o arquivo se ele mudou em disco; retorna None caso contrário"""
+        if self._stamp() == self._file_stamp:
+            return None
+        data = self._load_config()
+        if not data and self._file:
+            # Arquivo ilegível ou removido: mantém a configuração atual
+            return None
+        return data
+
+    def _apply(self, data):
+        self._file = data
+        self._swap()
+        print(f"Configurações recarregadas de {self.config_path}")
+
+    def reload(self):
+        """
+        Recarrega o arquivo se ele mudou em disco
+
+        Returns:
+            True se um novo snapshot foi publicado
+        """
+        data = self._read_changed()
+        if data is None:
+            return False
+        self._apply(data)
+        return True
+
+    async def watch(self, interval=5.0):
+        """
+        Observa o arquivo e troca o snapshot quando ele muda (hot reload)
+
+        Args:
+            interval (float): Segundos entre verificações
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Alterações feitas por set() ainda não gravadas têm prioridade
+                if self._save_handle is None:
+                    data = await asyncio.to_thread(self._read_changed)
+                    if data is not None and self._save_handle is None:
+                        self._apply(data)
+            except Exception as e:
+                print(f"Erro ao recarregar configurações: {e}")
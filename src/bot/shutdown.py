@@ -0,0 +1,205 @@
+"""
+Coordenador de desligamento gracioso do bot.
+Executa, em ordem e com prazos, os hooks de drenagem registrados pelos
+subsistemas (filas de eventos, mensagens pendentes, gravações no banco, logs)
+para que um deploy não perca XP ou registros ainda em memória.
+"""
+
+import asyncio
+import inspect
+import logging
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Prioridades padrão (menor executa primeiro)
+PRIORITY_INTAKE = 10       # Para de aceitar trabalho novo (filas de eventos)
+PRIORITY_OUTBOUND = 20     # Mensagens ainda não enviadas ao Discord
+PRIORITY_STORAGE = 30      # Gravações pendentes no banco de dados
+PRIORITY_CONNECTION = 40   # Fecha a conexão com o gateway
+PRIORITY_LOGS = 50         # Descarrega os handlers de log por último
+
+@dataclass
+class DrainResult:
+    """Resultado de um hook de drenagem"""
+    flushed: int = 0
+    dropped: int = 0
+
+@dataclass
+class _DrainHook:
+    name: str
+    callback: Callable
+    priority: int
+    timeout: float
+    pending: Optional[Callable[[], int]] = None
+
+@dataclass
+class ShutdownReport:
+    """Relatório consolidado do desligamento"""
+    reason: str
+    duration: float = 0.0
+    hooks: Dict[str, Dict[str, object]] = field(default_factory=dict)
+
+    @property
+    def flushed(self) -> int:
+        return sum(h["flushed"] for h in self.hooks.values())
+
+    @property
+    def dropped(self) -> int:
+        return sum(h["dropped"] for h in self.hooks.values())
+
+    def summary(self) -> str:
+        """Resumo em uma linha para o log"""
+        return (
+            f"Desligamento ({self.reason}) em {self.duration:.2f}s: "
+            f"{self.flushed} itens descarregados, {self.dropped} descartados"
+        )
+
+class ShutdownCoordinator:
+    """
+    Registra hooks de drenagem e os executa em ordem de prioridade,
+    cada um com seu próprio prazo dentro de um prazo global.
+    """
+
+    def __init__(self, total_timeout: float = 25.0):
+        """
+        Args:
+            total_timeout: Tempo máximo (segundos) para todo o desligamento.
+                Deve ficar abaixo do período de graça do orquestrador.
+        """
+        self.total_timeout = total_timeout
+        self.log = logging.getLogger('bot.shutdown')
+        self._hooks: List[_DrainHook] = []
+        self._requested: Optional[asyncio.Event] = None
+        self._reason = "manual"
+        self._report: Optional[ShutdownReport] = None
+
+    def register(self,
+                 name: str,
+                 callback: Callable,
+                 priority: int = PRIORITY_STORAGE,
+                 timeout: float = 5.0,
+                 pending: Optional[Callable[[], int]] = None):
+        """
+        Registra um hook de drenagem
+
+        Args:
+            name: Nome do hook (aparece no relatório)
+            callback: Função (sync ou async) que drena o trabalho pendente.
+                Pode retornar DrainResult, uma tupla (flushed, dropped),
+                um inteiro (flushed) ou None. Funções síncronas rodam numa
+                thread (asyncio.to_thread) para que o prazo valha para elas.
+            priority: Ordem de execução (menor executa primeiro)
+            timeout: Prazo do hook em segundos
+            pending: Função que informa quantos itens ainda estão pendentes,
+                usada para contabilizar descartes quando o prazo estoura
+        """
+        self._hooks.append(_DrainHook(name, callback, priority, timeout, pending))
+        self._hooks.sort(key=lambda h: h.priority)
+        return self
+
+    @property
+    def requested(self) -> asyncio.Event:
+        if self._requested is None:
+            self._requested = asyncio.Event()
+        return self._requested
+
+    def request(self, reason: str = "manual"):
+        """Sinaliza que o desligamento deve começar"""
+        self._reason = reason
+        self.requested.set()
+
+    async def wait(self):
+        """Aguarda até que o desligamento seja solicitado"""
+        await self.requested.wait()
+
+    def install_signal_handlers(self, loop: asyncio.AbstractEventLoop):
+        """
+        Instala handlers de SIGTERM/SIGINT que disparam o desligamento
+
+        Args:
+            loop: Loop de eventos em execução
+        """
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request, sig.name)
+            except (NotImplementedError, RuntimeError):
+                # Windows não suporta add_signal_handler
+                signal.signal(sig, lambda s, _f: loop.call_soon_threadsafe(self.request, signal.Signals(s).name))
+
+    async def shutdown(self, reason: Optional[str] = None) -> ShutdownReport:
+        """
+        Executa todos os hooks registrados e retorna o relatório
+
+        Chamadas repetidas retornam o mesmo relatório sem drenar de novo.
+        """
+        if self._report is not None:
+            return self._report
+
+        report = ShutdownReport(reason=reason or self._reason)
+        self._report = report
+        started = time.monotonic()
+        deadline = started + self.total_timeout
+        self.log.info(f"Iniciando desligamento ({report.reason}) com {len(self._hooks)} hooks")
+
+        for hook in self._hooks:
+            remaining = deadline - time.monotonic()
+            report.hooks[hook.name] = await self._run_hook(hook, max(0.0, min(hook.timeout, remaining)))
+
+        report.duration = time.monotonic() - started
+        self.log.info(report.summary())
+        return report
+
+    async def _run_hook(self, hook: _DrainHook, timeout: float) -> Dict[str, object]:
+        """Executa um hook respeitando o prazo e normaliza o resultado"""
+        status = "ok"
+        result = DrainResult()
+        hook_started = time.monotonic()
+
+        try:
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            if inspect.iscoroutinefunction(hook.callback):
+                value = await asyncio.wait_for(hook.callback(), timeout=timeout)
+            else:
+                # Um hook síncrono que trava não pode segurar o loop além do prazo
+                value = await asyncio.wait_for(asyncio.to_thread(hook.callback), timeout=timeout)
+                if inspect.isawaitable(value):
+                    remaining = timeout - (time.monotonic() - hook_started)
+                    value = await asyncio.wait_for(value, timeout=max(0.0, remaining))
+            result = self._normalize(value)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            result.dropped = self._pending(hook)
+            self.log.warning(f"Hook de desligamento '{hook.name}' excedeu o prazo de {timeout:.1f}s")
+        except Exception as e:
+            status = "error"
+            result.dropped = self._pending(hook)
+            self.log.error(f"Erro no hook de desligamento '{hook.name}': {e}")
+
+        return {
+            "status": status,
+            "flushed": result.flushed,
+            "dropped": result.dropped,
+            "seconds": round(time.monotonic() - hook_started, 3)
+        }
+
+    @staticmethod
+    def _normalize(value) -> DrainResult:
+        if isinstance(value, DrainResult):
+            return value
+        if isinstance(value, tuple):
+            return DrainResult(*value)
+        if isinstance(value, int):
+            return DrainResult(flushed=value)
+        return DrainResult()
+
+    @staticmethod
+    def _pending(hook: _DrainHook) -> int:
+        if hook.pending is None:
+            return 0
+        try:
+            return int(hook.pending())
+        except Exception:
+            return 0
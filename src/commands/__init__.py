@@ -5,12 +5,14 @@ Este pacote contém todos os comandos disponíveis organizados por categoria.
 
 # Importa os módulos de comandos
 from . import admin
+from . import debug
 from . import general
 from . import music
 
 # Lista de módulos para carregamento automático
 command_modules = [
     admin,
+    debug,
     general,
     music
 ]
@@ -1,10 +1,85 @@
+import asyncio
+import time
 import discord
 from discord import app_commands
 from src.base import create_embed, create_components
+from src.base.embed_templates import embed_templates, ERROR
+from src.base.utils import parse_time
+from src.utils import get_guild_config, log_digest, scheduler
+from src.utils.database import db_manager
+
+# Banimentos temporários mais longos devem ser permanentes
+MAX_TEMPBAN_SECONDS = 365 * 86400
+
+# Erros fixos dos comandos de moderação, construídos uma única vez
+BOT_CANNOT_KICK = embed_templates.register(
+    "bot_cannot_kick", base=ERROR, description="Não tenho permissão para expulsar membros!"
+)
+KICK_HIERARCHY = embed_templates.register(
+    "kick_hierarchy", base=ERROR,
+    description="Você não pode expulsar alguém com cargo igual ou superior ao seu!"
+)
+KICK_FAILED = embed_templates.register(
+    "kick_failed", base=ERROR,
+    description="Não foi possível expulsar o membro. Verifique as permissões."
+)
+BOT_CANNOT_BAN = embed_templates.register(
+    "bot_cannot_ban", base=ERROR, description="Não tenho permissão para banir membros!"
+)
+BAN_HIERARCHY = embed_templates.register(
+    "ban_hierarchy", base=ERROR,
+    description="Você não pode banir alguém com cargo igual ou superior ao seu!"
+)
+INVALID_DURATION = embed_templates.register(
+    "invalid_duration", base=ERROR,
+    description="Duração inválida. Use por exemplo `30m`, `2h` ou `1d12h` (máximo de 1 ano)."
+)
+CUSTOM_COMMAND_NOT_FOUND = embed_templates.register(
+    "custom_command_not_found", base=ERROR, description="Comando personalizado não encontrado."
+)
+CUSTOM_COMMAND_RENAME_FAILED = embed_templates.register(
+    "custom_command_rename_failed", base=ERROR,
+    description="Não foi possível renomear: o comando não existe ou o novo nome já está em uso."
+)
+CLEAR_RANGE = embed_templates.register(
+    "clear_range", base=ERROR, description="A quantidade deve estar entre 1 e 100 mensagens."
+)
+
+async def _log_moderation(guild, title, value, color):
+    """
+    Registra uma ação de moderação no digest do canal de log do servidor
+    
+    Args:
+        guild: Servidor onde a ação ocorreu
+        title: Título do evento
+        value: Detalhes do evento
+        color: Cor do evento
+    """
+    guild_config = await get_guild_config(guild.id)
+    if guild_config.get('recursos.moderacao.logs_habilitado') and guild_config.get('log_channel_id'):
+        log_digest.add(guild.get_channel(guild_config['log_channel_id']), title, value, color)
 
 def setup(cmd):
     """Configura comandos administrativos do bot"""
     
+    @scheduler.handler("unban")
+    async def unban_job(job):
+        # Fim de um banimento temporário (persistido; sobrevive a reinícios)
+        guild = cmd.bot.get_guild(job["guild_id"])
+        if guild is None:
+            return
+        user_id = job["payload"]["user_id"]
+        try:
+            await guild.unban(discord.Object(id=user_id), reason="Fim do banimento temporário")
+        except discord.NotFound:
+            return
+        await _log_moderation(
+            guild,
+            "🔓 Banimento Temporário Encerrado",
+            f"{job['payload'].get('user', user_id)} (`{user_id}`)",
+            discord.Color.green()
+        )
+    
     @cmd.create_command(
         name="kick",
         description="Expulsa um membro do servidor",
@@ -28,11 +103,7 @@ def setup(cmd):
         # Verifica permissões do bot
         if not interaction.guild.me.guild_permissions.kick_members:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Não tenho permissão para expulsar membros!",
-                    color=discord.Color.red()
-                ),
+                embed=BOT_CANNOT_KICK.embed,
                 ephemeral=True
             )
             return
@@ -40,11 +111,7 @@ def setup(cmd):
         # Verifica hierarquia de cargos
         if membro.top_role >= interaction.user.top_role and interaction.user.id != interaction.guild.owner_id:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Você não pode expulsar alguém com cargo igual ou superior ao seu!",
-                    color=discord.Color.red()
-                ),
+                embed=KICK_HIERARCHY.embed,
                 ephemeral=True
             )
             return
@@ -52,6 +119,12 @@ def setup(cmd):
         # Executa a expulsão
         try:
             await membro.kick(reason=f"{motivo} - Por: {interaction.user}")
+            await _log_moderation(
+                interaction.guild,
+                "👢 Membro Expulso",
+                f"{membro} (`{membro.id}`)\nMotivo: {motivo}\nPor: {interaction.user.mention}",
+                discord.Color.orange()
+            )
             
             # Notifica sobre o sucesso
             await interaction.response.send_message(
@@ -68,20 +141,12 @@ def setup(cmd):
             )
         except discord.Forbidden:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Não foi possível expulsar o membro. Verifique as permissões.",
-                    color=discord.Color.red()
-                ),
+                embed=KICK_FAILED.embed,
                 ephemeral=True
             )
         except Exception as e:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description=f"Ocorreu um erro: {str(e)}",
-                    color=discord.Color.red()
-                ),
+                embed=ERROR.stamp(description=f"Ocorreu um erro: {str(e)}"),
                 ephemeral=True
             )
     
@@ -117,11 +182,7 @@ def setup(cmd):
         # Verifica permissões do bot
         if not interaction.guild.me.guild_permissions.ban_members:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Não tenho permissão para banir membros!",
-                    color=discord.Color.red()
-                ),
+                embed=BOT_CANNOT_BAN.embed,
                 ephemeral=True
             )
             return
@@ -129,11 +190,7 @@ def setup(cmd):
         # Verifica hierarquia de cargos
         if membro.top_role >= interaction.user.top_role and interaction.user.id != interaction.guild.owner_id:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Você não pode banir alguém com cargo igual ou superior ao seu!",
-                    color=discord.Color.red()
-                ),
+                embed=BAN_HIERARCHY.embed,
                 ephemeral=True
             )
             return
@@ -146,6 +203,15 @@ def setup(cmd):
                 
             try:
                 await membro.ban(reason=f"{motivo} - Por: {interaction.user}", delete_message_days=dias)
+                # Um banimento permanente substitui um temporário
+                await scheduler.cancel("unban", interaction.guild.id, membro.id)
+                await _log_moderation(
+                    interaction.guild,
+                    "🔨 Membro Banido",
+                    f"{membro} (`{membro.id}`)\nMotivo: {motivo}\nPor: {interaction.user.mention}\n"
+                    f"Dias de mensagens excluídas: {dias}",
+                    discord.Color.red()
+                )
                 
                 await button_interaction.response.edit_message(
                     embed=create_embed(
@@ -163,11 +229,7 @@ def setup(cmd):
                 )
             except Exception as e:
                 await button_interaction.response.send_message(
-                    embed=create_embed(
-                        title="❌ Erro",
-                        description=f"Ocorreu um erro: {str(e)}",
-                        color=discord.Color.red()
-                    ),
+                    embed=ERROR.stamp(description=f"Ocorreu um erro: {str(e)}"),
                     ephemeral=True
                 )
         
@@ -216,6 +278,94 @@ def setup(cmd):
             view=confirmation_view
         )
         
+    @cmd.create_command(
+        name="tempban",
+        description="Bane um membro por um período",
+        options=[
+            {
+                "name": "membro",
+                "description": "O membro a ser banido",
+                "type": discord.Member,
+                "required": True
+            },
+            {
+                "name": "duracao",
+                "description": "Duração do banimento (ex: 30m, 2h, 7d)",
+                "type": str,
+                "required": True
+            },
+            {
+                "name": "motivo",
+                "description": "Motivo do banimento",
+                "type": str,
+                "required": False
+            }
+        ],
+        permissions=discord.Permissions(ban_members=True)
+    )
+    async def tempban_command(interaction, membro: discord.Member, duracao: str, motivo: str = "Nenhum motivo informado"):
+        seconds = parse_time(duracao)
+        if seconds <= 0 or seconds > MAX_TEMPBAN_SECONDS:
+            await interaction.response.send_message(embed=INVALID_DURATION.embed, ephemeral=True)
+            return
+        
+        # Verifica permissões do bot
+        if not interaction.guild.me.guild_permissions.ban_members:
+            await interaction.response.send_message(
+                embed=BOT_CANNOT_BAN.embed,
+                ephemeral=True
+            )
+            return
+            
+        # Verifica hierarquia de cargos
+        if membro.top_role >= interaction.user.top_role and interaction.user.id != interaction.guild.owner_id:
+            await interaction.response.send_message(
+                embed=BAN_HIERARCHY.embed,
+                ephemeral=True
+            )
+            return
+        
+        try:
+            await membro.ban(reason=f"{motivo} ({duracao}) - Por: {interaction.user}", delete_message_days=0)
+            try:
+                # Um novo tempban do mesmo membro substitui o desbanimento anterior
+                await scheduler.schedule(
+                    "unban", seconds,
+                    guild_id=interaction.guild.id,
+                    payload={"user_id": membro.id, "user": str(membro)},
+                    key=membro.id
+                )
+            except Exception:
+                # Sem o desbanimento agendado o banimento seria permanente
+                await interaction.guild.unban(membro, reason="Falha ao agendar o fim do banimento temporário")
+                raise
+            await _log_moderation(
+                interaction.guild,
+                "⏳ Membro Banido Temporariamente",
+                f"{membro} (`{membro.id}`)\nDuração: {duracao}\nMotivo: {motivo}\nPor: {interaction.user.mention}",
+                discord.Color.red()
+            )
+            
+            await interaction.response.send_message(
+                embed=create_embed(
+                    title="⏳ Membro Banido Temporariamente",
+                    description=f"{membro.mention} foi banido do servidor.",
+                    fields=[
+                        {"name": "Duração", "value": duracao},
+                        {"name": "Desbanimento", "value": f"<t:{int(time.time()) + seconds}:R>"},
+                        {"name": "Motivo", "value": motivo},
+                        {"name": "Por", "value": interaction.user.mention}
+                    ],
+                    color=discord.Color.red(),
+                    timestamp=True
+                )
+            )
+        except Exception as e:
+            await interaction.response.send_message(
+                embed=ERROR.stamp(description=f"Ocorreu um erro: {str(e)}"),
+                ephemeral=True
+            )
+        
     @cmd.create_command(
         name="clear",
         description="Limpa mensagens do chat",
@@ -233,17 +383,16 @@ def setup(cmd):
                 "required": False
             }
         ],
-        permissions=discord.Permissions(manage_messages=True)
+        permissions=discord.Permissions(manage_messages=True),
+        # Purge é caro: uma limpeza por vez por servidor e no máximo 3 por minuto
+        cooldown={"rate": 3, "per": 60, "scope": "guild"},
+        max_concurrency={"limit": 1, "scope": "guild"}
     )
     async def clear_command(interaction, quantidade: int, usuario: discord.Member = None):
         # Valida a quantidade
         if quantidade < 1 or quantidade > 100:
             await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="A quantidade deve estar entre 1 e 100 mensagens.",
-                    color=discord.Color.red()
-                ),
+                embed=CLEAR_RANGE.embed,
                 ephemeral=True
             )
             return
@@ -267,6 +416,13 @@ def setup(cmd):
             
             # Notifica sobre o resultado
             user_text = f" de {usuario.mention}" if usuario else ""
+            await _log_moderation(
+                interaction.guild,
+                "🧹 Chat Limpo",
+                f"{len(deleted)} mensagens{user_text} em {interaction.channel.mention}\n"
+                f"Por: {interaction.user.mention}",
+                discord.Color.blue()
+            )
             await interaction.followup.send(
                 embed=create_embed(
                     title="🧹 Chat Limpo",
@@ -277,10 +433,76 @@ def setup(cmd):
             )
         except Exception as e:
             await interaction.followup.send(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description=f"Ocorreu um erro ao limpar as mensagens: {str(e)}",
-                    color=discord.Color.red()
-                ),
+                embed=ERROR.stamp(description=f"Ocorreu um erro ao limpar as mensagens: {str(e)}"),
                 ephemeral=True
-            )
\ No newline at end of file
+            )
+
+    cmd.get_group("comando", description="Gerencia os comandos personalizados do servidor")
+
+    @cmd.create_command(
+        name="remover",
+        description="Remove um comando personalizado",
+        group="comando",
+        options=[
+            {
+                "name": "nome",
+                "description": "Comando a ser removido",
+                "type": str,
+                "required": True,
+                "autocomplete": "custom_commands"
+            }
+        ],
+        permissions=discord.Permissions(manage_guild=True)
+    )
+    async def custom_command_delete(interaction, nome: str):
+        if not await asyncio.to_thread(db_manager.delete_custom_command, interaction.guild_id, nome):
+            await interaction.response.send_message(embed=CUSTOM_COMMAND_NOT_FOUND.embed, ephemeral=True)
+            return
+
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="🗑️ Comando Removido",
+                description=f"O comando `{nome.lower()}` foi removido.",
+                color=discord.Color.red()
+            ),
+            ephemeral=True
+        )
+
+    @cmd.create_command(
+        name="renomear",
+        description="Renomeia um comando personalizado",
+        group="comando",
+        options=[
+            {
+                "name": "nome",
+                "description": "Comando a ser renomeado",
+                "type": str,
+                "required": True,
+                "autocomplete": "custom_commands"
+            },
+            {
+                "name": "novo_nome",
+                "description": "Novo nome do comando",
+                "type": str,
+                "required": True,
+                "max_length": 32
+            }
+        ],
+        permissions=discord.Permissions(manage_guild=True)
+    )
+    async def custom_command_rename(interaction, nome: str, novo_nome: str):
+        renamed = await asyncio.to_thread(
+            db_manager.rename_custom_command, interaction.guild_id, nome, novo_nome
+        )
+        if not renamed:
+            await interaction.response.send_message(embed=CUSTOM_COMMAND_RENAME_FAILED.embed, ephemeral=True)
+            return
+
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="✏️ Comando Renomeado",
+                description=f"`{nome.lower()}` agora é `{novo_nome.lower()}`.",
+                color=discord.Color.blue()
+            ),
+            ephemeral=True
+        )
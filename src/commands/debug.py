@@ -0,0 +1,126 @@
+import os
+import discord
+from src.base import create_embed, command_stats
+from src.base.embed_templates import OWNER_ONLY
+from src.base.views import view_registry
+
+def _is_owner(interaction):
+    """Verifica se quem usou o comando é o dono do bot (OWNER_ID)"""
+    owner_id = os.getenv("OWNER_ID")
+    return owner_id is not None and str(interaction.user.id) == owner_id
+
+async def _deny(interaction):
+    """Responde que o comando é restrito ao dono do bot"""
+    await interaction.response.send_message(
+        embed=OWNER_ONLY.embed,
+        ephemeral=True
+    )
+
+def setup(cmd):
+    """Configura comandos de diagnóstico (apenas para o dono do bot)"""
+    
+    cmd.get_group("debug", description="Diagnóstico interno do bot")
+    
+    @cmd.create_command(
+        name="events",
+        description="Mostra os handlers de eventos mais lentos",
+        group="debug"
+    )
+    async def debug_events_command(interaction):
+        if not _is_owner(interaction):
+            await _deny(interaction)
+            return
+        
+        bus = getattr(interaction.client, "event_bus", None)
+        rows = bus.stats(limit=10) if bus else []
+        
+        fields = [
+            {
+                "name": f"{row['event']} → {row['handler']}",
+                "value": (
+                    f"p50 {row['p50'] * 1000:.1f}ms • p95 {row['p95'] * 1000:.1f}ms • "
+                    f"máx {row['max'] * 1000:.1f}ms\n"
+                    f"{row['count']} chamadas • {row['errors']} erros • {row['timeouts']} timeouts"
+                ),
+                "inline": False
+            }
+            for row in rows
+        ]
+        
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="🐢 Handlers de Eventos Mais Lentos",
+                description=None if fields else "Nenhum evento processado ainda.",
+                fields=fields,
+                color=discord.Color.blurple()
+            ),
+            ephemeral=True
+        )
+
+    
+    @cmd.create_command(
+        name="commands",
+        description="Mostra os comandos com maior tempo até a primeira resposta",
+        group="debug"
+    )
+    async def debug_commands_command(interaction):
+        if not _is_owner(interaction):
+            await _deny(interaction)
+            return
+        
+        fields = [
+            {
+                "name": f"/{row['command'].replace('.', ' ')}",
+                "value": (
+                    f"1ª resposta p95 {row['ttfr']['p95'] * 1000:.0f}ms • "
+                    f"total p95 {row['total']['p95'] * 1000:.0f}ms\n"
+                    f"{row['calls']} chamadas • erros {row['error_rate']:.1%} • "
+                    f"{row['deadline_missed']} acima de 3s • {row['auto_deferred']} adiados • "
+                    f"{row['rate_limited']} bloqueados • "
+                    f"{row['db_calls']:.1f} consultas/uso"
+                ),
+                "inline": False
+            }
+            for row in command_stats(limit=10)
+        ]
+        
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="⏱️ Latência dos Comandos",
+                description=None if fields else "Nenhum comando executado ainda.",
+                fields=fields,
+                color=discord.Color.blurple()
+            ),
+            ephemeral=True
+        )
+    
+    @cmd.create_command(
+        name="views",
+        description="Mostra as views de componentes vivas e a memória estimada",
+        group="debug"
+    )
+    async def debug_views_command(interaction):
+        if not _is_owner(interaction):
+            await _deny(interaction)
+            return
+        
+        stats = view_registry.stats()
+        top_guilds = "\n".join(f"`{guild_id}` • {count}" for guild_id, count in stats["top_guilds"]) or "-"
+        top_users = "\n".join(f"<@{user_id}> • {count}" for user_id, count in stats["top_users"]) or "-"
+        
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="🧩 Views Vivas",
+                description=(
+                    f"**{stats['live']}** de {stats['max_views']} views • "
+                    f"~{stats['bytes'] / 1024:.1f} KiB de {stats['max_bytes'] / 1024 / 1024:.0f} MiB\n"
+                    f"{stats['evicted']} expulsas por limite"
+                ),
+                fields=[
+                    {"name": "Servidores", "value": top_guilds},
+                    {"name": "Usuários", "value": top_users}
+                ],
+                color=discord.Color.blurple()
+            ),
+            ephemeral=True
+        )
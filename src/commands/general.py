@@ -1,9 +1,37 @@
+import time
 import discord
 from src.base import create_embed, create_components, create_modal
+from src.base.embed_templates import embed_templates, ERROR
+from src.base.utils import parse_time
+from src.utils import scheduler
+
+# Lembretes muito longos ocupam o banco sem propósito
+MAX_REMINDER_SECONDS = 365 * 86400
+
+INVALID_REMINDER = embed_templates.register(
+    "invalid_reminder", base=ERROR,
+    description="Tempo inválido. Use por exemplo `10m`, `2h` ou `1d` (máximo de 1 ano)."
+)
 
 def setup(cmd):
     """Configura comandos gerais do bot"""
     
+    @scheduler.handler("reminder")
+    async def reminder_job(job):
+        payload = job["payload"]
+        channel = cmd.bot.get_channel(payload["channel_id"])
+        if channel is None:
+            return
+        await channel.send(
+            content=f"<@{payload['user_id']}>",
+            embed=create_embed(
+                title="⏰ Lembrete",
+                description=payload["message"],
+                color=discord.Color.blurple()
+            ),
+            allowed_mentions=discord.AllowedMentions(users=True, everyone=False, roles=False)
+        )
+    
     @cmd.create_command(
         name="help",
         description="Mostra os comandos disponíveis"
@@ -134,4 +162,49 @@ def setup(cmd):
             callback=process_feedback  # Referência à função definida acima
         )
         
-        await interaction.response.send_modal(modal)
\ No newline at end of file
+        await interaction.response.send_modal(modal)
+    
+    @cmd.create_command(
+        name="lembrete",
+        description="Agenda um lembrete neste canal",
+        options=[
+            {
+                "name": "tempo",
+                "description": "Daqui a quanto tempo (ex: 10m, 2h, 1d)",
+                "type": str,
+                "required": True
+            },
+            {
+                "name": "mensagem",
+                "description": "O que lembrar",
+                "type": str,
+                "required": True,
+                "max_length": 1000
+            }
+        ]
+    )
+    async def reminder_command(interaction, tempo: str, mensagem: str):
+        seconds = parse_time(tempo)
+        if seconds <= 0 or seconds > MAX_REMINDER_SECONDS:
+            await interaction.response.send_message(embed=INVALID_REMINDER.embed, ephemeral=True)
+            return
+        
+        # Persistido no banco: o lembrete sobrevive a reinícios do bot
+        await scheduler.schedule(
+            "reminder", seconds,
+            guild_id=interaction.guild_id,
+            payload={
+                "channel_id": interaction.channel_id,
+                "user_id": interaction.user.id,
+                "message": mensagem
+            }
+        )
+        await interaction.response.send_message(
+            embed=create_embed(
+                title="⏰ Lembrete Agendado",
+                description=f"Vou te lembrar <t:{int(time.time()) + seconds}:R>.",
+                fields=[{"name": "Mensagem", "value": mensagem}],
+                color=discord.Color.blurple()
+            ),
+            ephemeral=True
+        )
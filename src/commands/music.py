@@ -1,9 +1,145 @@
 import discord
 from src.base import create_embed, create_components
+from src.base.embed_templates import embed_templates, VOICE_REQUIRED, SAME_VOICE_CHANNEL
+from src.base.router import component_router
+from src.base.embed_templates import ERROR
+from src.base.paginator import Paginator, Page
+from src.utils.player import players
+
+# Embeds de status fixos, construídos uma única vez
+STOPPED = embed_templates.register(
+    "music_stopped", title="⏹️ Música Parada",
+    description="A reprodução foi interrompida.", color=discord.Color.red()
+)
+PAUSED = embed_templates.register(
+    "music_paused", title="⏸️ Música Pausada",
+    description="A reprodução foi pausada.", color=discord.Color.yellow()
+)
+RESUMED = embed_templates.register(
+    "music_resumed", title="▶️ Música Retomada",
+    description="A reprodução foi retomada.", color=discord.Color.green()
+)
+SKIPPED = embed_templates.register(
+    "music_skipped", title="⏭️ Música Pulada",
+    description="Pulando para a próxima música.", color=discord.Color.blue()
+)
+QUEUE_CLEARED = embed_templates.register(
+    "queue_cleared", title="🗑️ Fila Limpa",
+    description="Todas as músicas da fila foram removidas.", color=discord.Color.red()
+)
+NOTHING_PLAYING = embed_templates.register(
+    "music_nothing_playing", base=ERROR, description="Nenhuma música está tocando."
+)
+NOT_PAUSED = embed_templates.register(
+    "music_not_paused", base=ERROR, description="A música não está pausada."
+)
+TRACK_NOT_FOUND = embed_templates.register(
+    "music_not_found", base=ERROR, description="Nenhuma música encontrada para essa URL ou busca."
+)
+QUEUE_FULL = embed_templates.register(
+    "music_queue_full", base=ERROR, description="A fila de músicas está cheia."
+)
+CONNECT_FAILED = embed_templates.register(
+    "music_connect_failed", base=ERROR, description="Não foi possível conectar ao canal de voz."
+)
+
+# Botões dos controles de reprodução (atendidos pelo component_router)
+PLAYER_BUTTONS = [
+    {"style": discord.ButtonStyle.secondary, "label": "Pausar", "emoji": "⏸️", "route": "music_pause"},
+    {"style": discord.ButtonStyle.danger, "label": "Parar", "emoji": "⏹️", "route": "music_stop"},
+    {"style": discord.ButtonStyle.primary, "label": "Pular", "emoji": "⏭️", "route": "music_skip"}
+]
+
+async def _check_voice(interaction, require_bot: bool = True) -> bool:
+    """
+    Verifica se o usuário (e o bot) estão no mesmo canal de voz
+
+    Responde com o erro correspondente quando não estiverem.
+
+    Returns:
+        True se o comando pode continuar
+    """
+    if not interaction.user.voice:
+        await interaction.response.send_message(embed=VOICE_REQUIRED.embed, ephemeral=True)
+        return False
+
+    if require_bot and (not interaction.guild.voice_client or
+                        interaction.guild.voice_client.channel != interaction.user.voice.channel):
+        await interaction.response.send_message(embed=SAME_VOICE_CHANNEL.embed, ephemeral=True)
+        return False
+    return True
+
+async def _queue_source(key: str, cursor, page_size: int) -> Page:
+    """Páginas da fila do player (posição 0 é a faixa tocando); o cursor é o deslocamento"""
+    player = players.get(int(key))
+    total = len(player) if player else 0
+    # Limitado ao início da última página: a fila pode ter encolhido desde o clique
+    offset = min(int(cursor or 0), max(0, (total - 1) // page_size * page_size))
+    end = offset + page_size
+    return Page(
+        player.listing(offset, page_size) if player else [],
+        # "" aponta para a primeira página (mesma entrada de cache que None)
+        prev_cursor=(str(offset - page_size) if offset > page_size else "") if offset > 0 else None,
+        next_cursor=str(end) if end < total else None,
+        total=total,
+        offset=offset
+    )
+
+def _render_queue(page: Page, index: int, page_size: int) -> discord.Embed:
+    """Renderiza uma página da fila"""
+    offset = index * page_size
+    pages = max(1, -(-page.total // page_size))
+    return create_embed(
+        title="🎶 Fila de Músicas",
+        description="Músicas na fila:" if page.total else "A fila está vazia.",
+        fields=[
+            {
+                "name": "1. Tocando agora" if position == 0 else f"{position + 1}.",
+                "value": f"[{track.title}]({track.url}) • {track.length}"
+            }
+            for position, track in enumerate(page.items, start=offset)
+        ],
+        footer={"text": f"Página {index + 1}/{pages} • Total: {page.total} músicas"},
+        color=discord.Color.blue()
+    )
+
+# Só a página visível da fila é montada; os botões ◀️/▶️ usam as rotas queue_prev/queue_next
+queue_paginator = Paginator(
+    "queue",
+    _queue_source,
+    _render_queue,
+    page_size=10,
+    extra_buttons=lambda guild_id: [
+        {"style": discord.ButtonStyle.danger, "label": "Limpar Fila", "emoji": "🗑️", "route": "queue_clear"}
+    ]
+)
+
+# Páginas em cache ficam obsoletas quando a fila anda
+players.on_change(lambda guild_id: queue_paginator.invalidate(str(guild_id)))
+
+def _track_embed(track, position: int, added: int, interaction) -> discord.Embed:
+    """Embed de resposta do /play"""
+    if position == 0:
+        title, status = "🎵 Tocando Música", "Tocando agora."
+    else:
+        title, status = "🎵 Adicionada à Fila", f"Posição na fila: {position}."
+    if added > 1:
+        status += f" {added} músicas da playlist adicionadas."
+    return create_embed(
+        title=title,
+        description=f"[{track.title}]({track.url})\n{status}",
+        thumbnail=track.thumbnail,
+        fields=[
+            {"name": "Duração", "value": track.length},
+            {"name": "Canal", "value": interaction.user.voice.channel.name},
+            {"name": "Solicitado por", "value": interaction.user.mention}
+        ],
+        color=discord.Color.blue()
+    )
 
 def setup(cmd):
     """Configura os comandos de música do bot"""
-    
+
     @cmd.create_command(
         name="play",
         description="Toca uma música a partir de uma URL",
@@ -18,218 +154,136 @@ def setup(cmd):
     )
     async def play_command(interaction, url: str):
         # Verifica canal de voz
-        if not interaction.user.voice:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Você precisa estar em um canal de voz para usar este comando!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+        if not await _check_voice(interaction, require_bot=False):
+            return
+
+        # O bot não troca de canal enquanto toca para outras pessoas
+        voice_client = interaction.guild.voice_client
+        if voice_client and voice_client.channel != interaction.user.voice.channel:
+            await interaction.response.send_message(embed=SAME_VOICE_CHANNEL.embed, ephemeral=True)
             return
-            
-        # Resposta imediata para evitar timeout
+
+        # Resposta imediata: resolver a URL pode levar alguns segundos
         await interaction.response.defer()
-        
-        # Simulação temporária - implementação real requer wavelink ou discord.py[voice]
+
+        player = players.get_or_create(interaction.guild_id)
+        tracks = await player.node.resolve(url, limit=players.max_playlist)
+        if not tracks:
+            await interaction.followup.send(embed=TRACK_NOT_FOUND.embed, ephemeral=True)
+            return
+
+        try:
+            await player.connect(interaction.user.voice.channel)
+        except Exception as e:
+            # Após o defer, um erro não tratado deixaria o "pensando..." para sempre
+            player.log.warning(f"Falha ao conectar ao canal de voz no servidor {interaction.guild_id}: {e}")
+            await interaction.followup.send(embed=CONNECT_FAILED.embed, ephemeral=True)
+            return
+
+        first, added = None, 0
+        for track in tracks:
+            position = await player.enqueue(track.for_requester(interaction.user.id))
+            if position is None:
+                break
+            if first is None:
+                first = (track, position)
+            added += 1
+
+        if first is None:
+            await interaction.followup.send(embed=QUEUE_FULL.embed, ephemeral=True)
+            return
+
         await interaction.followup.send(
-            embed=create_embed(
-                title="🎵 Tocando Música",
-                description=f"[Música]({url}) adicionada à fila.",
-                thumbnail="https://img.youtube.com/vi/ID_DO_VIDEO/maxresdefault.jpg",
-                fields=[
-                    {"name": "Canal", "value": interaction.user.voice.channel.name},
-                    {"name": "Solicitado por", "value": interaction.user.mention}
-                ],
-                color=discord.Color.blue()
-            ),
-            view=create_components([
-                {
-                    "type": "button",
-                    "style": discord.ButtonStyle.secondary,
-                    "label": "Pausar",
-                    "emoji": "⏸️",
-                    "custom_id": "music_pause"
-                },
-                {
-                    "type": "button",
-                    "style": discord.ButtonStyle.danger,
-                    "label": "Parar",
-                    "emoji": "⏹️",
-                    "custom_id": "music_stop"
-                },
-                {
-                    "type": "button",
-                    "style": discord.ButtonStyle.primary,
-                    "label": "Pular",
-                    "emoji": "⏭️",
-                    "custom_id": "music_skip"
-                }
-            ])
+            embed=_track_embed(*first, added, interaction),
+            view=create_components(PLAYER_BUTTONS)
         )
-    
+
     @cmd.create_command(
         name="stop",
         description="Para a reprodução atual"
     )
+    @component_router.route("music_stop")
     async def stop_command(interaction):
-        # Verificações de contexto
-        if not interaction.user.voice:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Você precisa estar em um canal de voz!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+        if not await _check_voice(interaction):
             return
-            
-        if not interaction.guild.voice_client or interaction.guild.voice_client.channel != interaction.user.voice.channel:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="O bot precisa estar no mesmo canal que você!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+
+        player = players.get(interaction.guild_id)
+        if player is None or player.current is None:
+            await interaction.response.send_message(embed=NOTHING_PLAYING.embed, ephemeral=True)
             return
-            
-        # Simulação temporária de parar música
-        await interaction.response.send_message(
-            embed=create_embed(
-                title="⏹️ Música Parada",
-                description="A reprodução foi interrompida.",
-                color=discord.Color.red()
-            )
-        )
-    
+
+        player.stop()
+        await interaction.response.send_message(embed=STOPPED.embed)
+
     @cmd.create_command(
         name="pause",
         description="Pausa a música atual"
     )
+    @component_router.route("music_pause")
     async def pause_command(interaction):
-        # Verificações de contexto
-        if not interaction.user.voice:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Você precisa estar em um canal de voz!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+        if not await _check_voice(interaction):
             return
-            
-        if not interaction.guild.voice_client or interaction.guild.voice_client.channel != interaction.user.voice.channel:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="O bot precisa estar no mesmo canal que você!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+
+        player = players.get(interaction.guild_id)
+        if player is None or not player.pause():
+            await interaction.response.send_message(embed=NOTHING_PLAYING.embed, ephemeral=True)
             return
-            
-        # Simulação temporária de pausar música
+
         await interaction.response.send_message(
-            embed=create_embed(
-                title="⏸️ Música Pausada",
-                description="A reprodução foi pausada.",
-                color=discord.Color.yellow()
-            ),
+            embed=PAUSED.embed,
             view=create_components([
                 {
-                    "type": "button",
                     "style": discord.ButtonStyle.success,
                     "label": "Retomar",
                     "emoji": "▶️",
-                    "custom_id": "music_resume"
+                    "route": "music_resume"
                 }
             ])
         )
-    
+
+    @component_router.route("music_resume")
+    async def resume_button(interaction):
+        if not await _check_voice(interaction):
+            return
+
+        player = players.get(interaction.guild_id)
+        if player is None or not player.resume():
+            await interaction.response.send_message(embed=NOT_PAUSED.embed, ephemeral=True)
+            return
+
+        await interaction.response.send_message(embed=RESUMED.embed)
+
     @cmd.create_command(
         name="queue",
         description="Mostra a fila de músicas"
     )
     async def queue_command(interaction):
-        # Simulação temporária de fila de músicas
-        await interaction.response.send_message(
-            embed=create_embed(
-                title="🎶 Fila de Músicas",
-                description="Músicas na fila:",
-                fields=[
-                    {"name": "1. Tocando agora", "value": "Nome da Música 1 - Autor"},
-                    {"name": "2.", "value": "Nome da Música 2 - Autor"},
-                    {"name": "3.", "value": "Nome da Música 3 - Autor"}
-                ],
-                footer={"text": "Página 1/1 • Total: 3 músicas"},
-                color=discord.Color.blue()
-            ),
-            view=create_components([
-                {
-                    "type": "button",
-                    "style": discord.ButtonStyle.secondary,
-                    "label": "Anterior",
-                    "emoji": "◀️",
-                    "custom_id": "queue_prev",
-                    "disabled": True
-                },
-                {
-                    "type": "button",
-                    "style": discord.ButtonStyle.danger,
-                    "label": "Limpar Fila",
-                    "emoji": "🗑️",
-                    "custom_id": "queue_clear"
-                },
-                {
-                    "type": "button", 
-                    "style": discord.ButtonStyle.secondary,
-                    "label": "Próxima",
-                    "emoji": "▶️",
-                    "custom_id": "queue_next",
-                    "disabled": True
-                }
-            ])
-        )
-    
+        await interaction.response.send_message(**await queue_paginator.message(interaction.guild_id))
+
+    @component_router.route("queue_clear")
+    async def queue_clear_button(interaction):
+        if not await _check_voice(interaction):
+            return
+
+        player = players.get(interaction.guild_id)
+        if player is not None:
+            player.clear()
+        await interaction.response.edit_message(embed=QUEUE_CLEARED.embed, view=None)
+
     @cmd.create_command(
         name="skip",
         description="Pula para a próxima música"
     )
+    @component_router.route("music_skip")
     async def skip_command(interaction):
-        # Verificações de contexto
-        if not interaction.user.voice:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="Você precisa estar em um canal de voz!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+        if not await _check_voice(interaction):
             return
-            
-        if not interaction.guild.voice_client or interaction.guild.voice_client.channel != interaction.user.voice.channel:
-            await interaction.response.send_message(
-                embed=create_embed(
-                    title="❌ Erro",
-                    description="O bot precisa estar no mesmo canal que você!",
-                    color=discord.Color.red()
-                ),
-                ephemeral=True
-            )
+
+        player = players.get(interaction.guild_id)
+        if player is None or player.current is None:
+            await interaction.response.send_message(embed=NOTHING_PLAYING.embed, ephemeral=True)
             return
-            
-        # Simulação temporária de pular música
-        await interaction.response.send_message(
-            embed=create_embed(
-                title="⏭️ Música Pulada",
-                description="Pulando para a próxima música.",
-                color=discord.Color.blue()
-            )
-        )
\ No newline at end of file
+
+        # Abrir a próxima faixa pode demorar; responde antes
+        await interaction.response.send_message(embed=SKIPPED.embed)
+        await player.skip()
@@ -6,21 +6,45 @@ Este módulo agrega todos os manipuladores de eventos do bot.
 # Importa os manipuladores de eventos
 from .member import setup as setup_member_events
 from .message import setup as setup_message_events
+from .pipeline import GuildEventPipeline
+from .bus import EventBus
 
-def setup_all_events(bot):
+def setup_all_events(bot, pipeline=None, config=None):
     """
     Configura todos os manipuladores de eventos para o bot
     
     Args:
         bot: Instância do bot Discord
+        pipeline: GuildEventPipeline opcional para enfileirar eventos por servidor
+        config: Configuração do bot
+    
+    Returns:
+        Dicionário com o barramento ("bus") e os manipuladores criados ("member", "message")
     """
+    bus = EventBus(bot, pipeline)
+    
+    # Eventos por servidor passam pelas filas do pipeline
+    bus.route(
+        'on_message', kind="message",
+        key=lambda message: message.guild.id,
+        # Filtros baratos antes de ocupar espaço na fila
+        accept=lambda message: not message.author.bot and message.guild is not None
+    )
+    bus.route('on_member_join', kind="member_join", key=lambda member: member.guild.id)
+    bus.route('on_member_remove', kind="member_remove", key=lambda member: member.guild.id)
+    
     # Registra cada grupo de eventos
-    setup_member_events(bot)
-    setup_message_events(bot)
+    return {
+        "bus": bus,
+        "member": setup_member_events(bus, config),
+        "message": setup_message_events(bus, config)
+    }
 
 # Exporta funções relevantes
 __all__ = [
     "setup_all_events",
+    "EventBus",
+    "GuildEventPipeline",
     "setup_member_events",
     "setup_message_events"
 ]
\ No newline at end of file
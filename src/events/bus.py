@@ -0,0 +1,163 @@
+"""
+Barramento de eventos do bot.
+Módulos se inscrevem em eventos do Discord com prioridade e prazo opcional;
+o barramento registra um único listener por evento, isola erros de cada
+handler e mede a latência de cada um em histogramas.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics, Histogram
+
+class Subscription:
+    """Handler inscrito em um evento"""
+    __slots__ = ("event", "name", "callback", "priority", "timeout", "latency", "errors", "timeouts")
+
+    def __init__(self, event: str, callback: Callable[..., Awaitable], priority: int,
+                 timeout: Optional[float], name: Optional[str]):
+        self.event = event
+        self.callback = callback
+        self.priority = priority
+        self.timeout = timeout
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+        self.latency: Histogram = metrics.histogram(f"bus.{event}.{self.name}")
+        self.errors = metrics.counter(f"bus.{event}.{self.name}.errors")
+        self.timeouts = metrics.counter(f"bus.{event}.{self.name}.timeouts")
+
+class _Route:
+    """Como um evento é enfileirado no GuildEventPipeline"""
+    __slots__ = ("kind", "key", "accept")
+
+    def __init__(self, kind, key, accept):
+        self.kind = kind
+        self.key = key
+        self.accept = accept
+
+class EventBus:
+    """Despacha eventos do gateway para os handlers inscritos"""
+
+    def __init__(self, bot, pipeline=None):
+        """
+        Args:
+            bot: Instância do bot Discord
+            pipeline: GuildEventPipeline opcional; eventos com rota definida
+                em route() são enfileirados por servidor antes do despacho
+        """
+        self.bot = bot
+        self.pipeline = pipeline
+        self.log = get_logger('events.bus')
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._routes: Dict[str, _Route] = {}
+
+    def subscribe(self,
+                  event: str,
+                  callback: Callable[..., Awaitable],
+                  priority: int = 100,
+                  timeout: Optional[float] = None,
+                  name: Optional[str] = None) -> Subscription:
+        """
+        Inscreve um handler em um evento
+
+        Args:
+            event: Nome do evento do Discord (ex: 'on_message')
+            callback: Corrotina que recebe os argumentos do evento
+            priority: Ordem de execução (menor executa primeiro)
+            timeout: Prazo em segundos para o handler (None = sem prazo)
+            name: Nome exibido nas métricas (padrão: qualname do callback)
+
+        Returns:
+            A inscrição criada
+        """
+        subscription = Subscription(event, callback, priority, timeout, name)
+        handlers = self._subscriptions.get(event)
+        if handlers is None:
+            handlers = self._subscriptions[event] = []
+            self._attach(event)
+        handlers.append(subscription)
+        handlers.sort(key=lambda s: s.priority)
+        return subscription
+
+    def on(self, event: str, priority: int = 100, timeout: Optional[float] = None):
+        """Versão decorador de subscribe()"""
+        def decorator(func):
+            self.subscribe(event, func, priority=priority, timeout=timeout)
+            return func
+        return decorator
+
+    def route(self,
+              event: str,
+              kind: str,
+              key: Callable[..., Any],
+              accept: Optional[Callable[..., bool]] = None):
+        """
+        Enfileira um evento no pipeline por servidor em vez de despachá-lo inline
+
+        Args:
+            event: Nome do evento
+            kind: Tipo do evento no pipeline (define a política de transbordo)
+            key: Função que extrai o ID do servidor dos argumentos do evento
+            accept: Filtro barato aplicado antes de enfileirar
+        """
+        self._routes[event] = _Route(kind, key, accept)
+        return self
+
+    def _attach(self, event: str):
+        """Registra um único listener no bot para o evento"""
+        async def listener(*args):
+            route = self._routes.get(event)
+            if route is None or self.pipeline is None:
+                await self.dispatch(event, *args)
+                return
+            if route.accept is not None and not route.accept(*args):
+                return
+            await self.pipeline.submit(route.key(*args), route.kind, self.dispatch, event, *args)
+
+        listener.__name__ = event
+        self.bot.add_listener(listener, event)
+
+    async def dispatch(self, event: str, *args):
+        """
+        Executa os handlers do evento em ordem de prioridade
+
+        Um handler que falha ou estoura o prazo não impede os seguintes.
+        """
+        for subscription in self._subscriptions.get(event, ()):
+            start = time.perf_counter()
+            try:
+                if subscription.timeout is None:
+                    await subscription.callback(*args)
+                else:
+                    await asyncio.wait_for(subscription.callback(*args), subscription.timeout)
+            except asyncio.TimeoutError:
+                subscription.timeouts.inc()
+                self.log.warning(f"Handler '{subscription.name}' de {event} excedeu {subscription.timeout}s")
+            except Exception as e:
+                subscription.errors.inc()
+                self.log.error(f"Erro no handler '{subscription.name}' de {event}: {e}")
+            finally:
+                subscription.latency.observe(time.perf_counter() - start)
+
+    def stats(self, limit: int = 10, sort_by: str = "p95") -> List[Dict[str, Any]]:
+        """
+        Handlers mais lentos
+
+        Args:
+            limit: Quantidade de handlers retornados
+            sort_by: Campo usado na ordenação ('p95', 'p99', 'mean' ou 'max')
+        """
+        rows = []
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                row = subscription.latency.snapshot()
+                row.update({
+                    "event": subscription.event,
+                    "handler": subscription.name,
+                    "errors": subscription.errors.value,
+                    "timeouts": subscription.timeouts.value
+                })
+                rows.append(row)
+        rows.sort(key=lambda r: r[sort_by], reverse=True)
+        return rows[:limit]
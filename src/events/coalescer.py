@@ -0,0 +1,168 @@
+"""
+Agrupamento adaptativo de boas-vindas durante rajadas de entradas (raids).
+Em ritmo normal cada membro recebe sua própria mensagem; quando a taxa de
+entradas de um servidor passa do limite, as entradas são acumuladas por uma
+janela curta e anunciadas em um único embed.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+# Valores padrão (sobrescritos por recursos.boas_vindas.rajada e pelo servidor)
+DEFAULT_THRESHOLD = 5      # Entradas dentro da janela de detecção para ativar o agrupamento
+DEFAULT_WINDOW = 10.0      # Janela de detecção (segundos)
+DEFAULT_BATCH_DELAY = 5.0  # Tempo acumulando entradas antes de anunciar (segundos)
+DEFAULT_MAX_BATCH = 50     # Máximo de membros por anúncio agrupado
+
+class _GuildJoins:
+    __slots__ = ("recent", "pending", "channel", "flush_task", "window")
+
+    def __init__(self, window: float):
+        self.recent = deque()
+        self.pending: List[Any] = []
+        self.channel = None
+        self.flush_task: Optional[asyncio.Task] = None
+        self.window = window
+
+    def prune(self, now: float):
+        """Descarta entradas fora da janela de detecção"""
+        while self.recent and now - self.recent[0] > self.window:
+            self.recent.popleft()
+
+    def idle(self, now: float) -> bool:
+        """Sem entradas na janela nem anúncio pendente: o estado pode ser descartado"""
+        self.prune(now)
+        return not self.recent and not self.pending and self.flush_task is None
+
+class JoinCoalescer:
+    """Decide entre anúncio individual e agrupado com base na taxa de entradas"""
+
+    def __init__(self,
+                 send_batch: Callable[[Any, List[Any]], Awaitable[None]],
+                 threshold: int = DEFAULT_THRESHOLD,
+                 window: float = DEFAULT_WINDOW,
+                 batch_delay: float = DEFAULT_BATCH_DELAY,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Args:
+            send_batch: Corrotina (canal, membros) que envia o anúncio agrupado
+            threshold: Entradas na janela que ativam o agrupamento
+            window: Janela de detecção em segundos
+            batch_delay: Tempo de acúmulo antes de anunciar
+            max_batch: Membros por anúncio (lotes maiores são divididos)
+        """
+        self.send_batch = send_batch
+        self.threshold = threshold
+        self.window = window
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self.log = get_logger('events.coalescer')
+        self._guilds: Dict[Any, _GuildJoins] = {}
+        self._last_sweep = time.monotonic()
+
+    def offer(self, guild_id, member, channel, settings: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Registra uma entrada e decide se ela deve ser agrupada
+
+        Args:
+            guild_id: ID do servidor
+            member: Membro que entrou
+            channel: Canal de boas-vindas
+            settings: Limites específicos do servidor (threshold, window, batch_delay)
+
+        Returns:
+            True se a entrada foi acumulada (o chamador não deve enviar nada),
+            False se o chamador deve enviar a mensagem individual
+        """
+        settings = settings or {}
+        threshold = settings.get("threshold", self.threshold)
+        window = settings.get("window", self.window)
+
+        now = time.monotonic()
+        if now - self._last_sweep >= self.window:
+            self._sweep(now)
+
+        state = self._guilds.get(guild_id)
+        if state is None:
+            state = self._guilds[guild_id] = _GuildJoins(window)
+        state.window = window
+        state.recent.append(now)
+        state.prune(now)
+
+        # Já em modo rajada ou taxa acima do limite: acumula
+        if state.flush_task is not None or len(state.recent) > threshold:
+            state.pending.append(member)
+            state.channel = channel
+            if state.flush_task is None:
+                delay = settings.get("batch_delay", self.batch_delay)
+                state.flush_task = asyncio.create_task(self._flush_later(guild_id, delay))
+                metrics.counter("welcome.bursts").inc()
+                self.log.info(f"Rajada de entradas detectada no servidor {guild_id}; agrupando boas-vindas")
+            metrics.counter("welcome.coalesced").inc()
+            return True
+
+        metrics.counter("welcome.individual").inc()
+        return False
+
+    def _sweep(self, now: float):
+        """Remove servidores cuja última entrada já saiu da janela"""
+        for guild_id in [guild_id for guild_id, state in self._guilds.items() if state.idle(now)]:
+            del self._guilds[guild_id]
+        self._last_sweep = now
+
+    async def _flush_later(self, guild_id, delay: float):
+        await asyncio.sleep(delay)
+        state = self._guilds.get(guild_id)
+        if state is not None:
+            state.flush_task = None
+        await self.flush(guild_id)
+
+    async def flush(self, guild_id) -> int:
+        """
+        Envia imediatamente os anúncios pendentes de um servidor
+
+        Returns:
+            Número de membros anunciados
+        """
+        state = self._guilds.get(guild_id)
+        if state is None or not state.pending:
+            return 0
+
+        members, state.pending = state.pending, []
+        channel = state.channel
+        if state.idle(time.monotonic()):
+            del self._guilds[guild_id]
+
+        for start in range(0, len(members), self.max_batch):
+            batch = members[start:start + self.max_batch]
+            try:
+                await self.send_batch(channel, batch)
+                metrics.counter("welcome.batches").inc()
+            except Exception as e:
+                self.log.error(f"Erro ao enviar boas-vindas agrupadas no servidor {guild_id}: {e}")
+        return len(members)
+
+    async def flush_all(self):
+        """
+        Envia tudo que está pendente (usado no desligamento)
+
+        Returns:
+            Tupla (anunciados, descartados) para o relatório de desligamento
+        """
+        flushed = 0
+        for guild_id, state in list(self._guilds.items()):
+            if state.flush_task is not None:
+                state.flush_task.cancel()
+                state.flush_task = None
+            flushed += await self.flush(guild_id)
+        return flushed, 0
+
+    @property
+    def pending(self) -> int:
+        """Total de membros aguardando anúncio"""
+        return sum(len(state.pending) for state in self._guilds.values())
@@ -1,20 +1,42 @@
 import discord
 from discord import Member
-from src.utils import logger, get_guild
+from src.utils import log_digest, get_guild_config
+from src.utils.logger import get_logger
+from src.utils.guild_config import guild_configs
+from src.utils.templates import templates
+from src.utils.prefix_index import member_index, custom_command_index, playlist_index
 from src.base import create_embed
+from .coalescer import JoinCoalescer
+
+# Usados quando settings.yml não define mensagens.boas_vindas / mensagens.saida
+DEFAULT_WELCOME = "Olá {user}, seja bem-vindo(a) ao servidor!\nAgora somos {count} membros!"
+DEFAULT_LEAVE = "{user_name} saiu do servidor."
 
 class MemberEventHandler:
     """Manipulador de eventos relacionados a membros do servidor"""
     
-    def __init__(self, bot):
+    def __init__(self, bot, config=None):
         """
         Inicializa o manipulador de eventos de membros
         
         Args:
             bot: Instância do bot Discord
+            config: Configuração do bot (templates em mensagens.*)
         """
         self.bot = bot
-        self.log = logger.get_logger('events.member')
+        get = config.get if config else (lambda key, default=None: default)
+        self.welcome_template = get("mensagens.boas_vindas", DEFAULT_WELCOME)
+        self.leave_template = get("mensagens.saida", DEFAULT_LEAVE)
+        
+        # Agrupa boas-vindas durante rajadas de entradas (raids)
+        self.coalescer = JoinCoalescer(
+            self._send_batch_welcome,
+            threshold=get("recursos.boas_vindas.rajada.limite", 5),
+            window=get("recursos.boas_vindas.rajada.janela", 10),
+            batch_delay=get("recursos.boas_vindas.rajada.espera", 5),
+            max_batch=get("recursos.boas_vindas.rajada.max_membros", 50)
+        )
+        self.log = get_logger('events.member')
         self.log.info('Manipulador de eventos de membros inicializado')
     
     async def on_member_join(self, member: Member):
@@ -26,33 +48,64 @@ class MemberEventHandler:
         """
         self.log.info(f"Membro {member.name} (ID: {member.id}) entrou no servidor {member.guild.name}")
         
-        # Busca configurações do servidor
-        guild_config = get_guild(member.guild.id)
+        # Configuração efetiva do servidor (padrões → settings.yml → documento)
+        guild_config = await get_guild_config(member.guild.id)
         
         # Verifica se existe canal de boas-vindas configurado
-        if guild_config and guild_config.get('welcome_channel_id'):
+        if guild_config.get('welcome_channel_id'):
             welcome_channel = self.bot.get_channel(guild_config['welcome_channel_id'])
             
             if welcome_channel:
-                # Monta a mensagem de boas-vindas (personalizada ou padrão)
+                # Em rajadas a entrada é anunciada depois, junto com as demais
+                if self.coalescer.offer(member.guild.id, member, welcome_channel, self._burst_settings(guild_config)):
+                    return
+                
+                # Mensagem personalizada do servidor vai como texto; a padrão vai em embed
                 welcome_message = guild_config.get('welcome_message')
                 if welcome_message:
-                    # Substitui placeholders na mensagem
-                    welcome_message = welcome_message.replace('{user}', member.mention)
-                    welcome_message = welcome_message.replace('{server}', member.guild.name)
-                    await welcome_channel.send(welcome_message)
+                    template = templates.get(member.guild.id, welcome_message)
+                    await welcome_channel.send(template.render(member))
                 else:
-                    # Mensagem padrão com embed
+                    template = templates.get(None, guild_config.get("mensagens.boas_vindas", self.welcome_template))
                     await welcome_channel.send(
                         embed=create_embed(
                             title=f"Bem-vindo(a) a {member.guild.name}!",
-                            description=f"Olá {member.mention}, seja bem-vindo(a) ao servidor!\n"
-                                       f"Agora somos {len(member.guild.members)} membros!",
+                            description=template.render(member),
                             thumbnail=member.display_avatar.url,
                             color=discord.Color.green()
                         )
                     )
     
+    def _burst_settings(self, guild_config):
+        """Limites de rajada efetivos do servidor (recursos.boas_vindas.rajada.*)"""
+        return {
+            "threshold": guild_config.get("recursos.boas_vindas.rajada.limite"),
+            "window": guild_config.get("recursos.boas_vindas.rajada.janela"),
+            "batch_delay": guild_config.get("recursos.boas_vindas.rajada.espera")
+        }
+    
+    async def _send_batch_welcome(self, channel, members):
+        """
+        Envia um único embed de boas-vindas para vários membros
+        
+        Args:
+            channel: Canal de boas-vindas
+            members: Membros que entraram durante a rajada
+        """
+        guild = members[0].guild
+        mentions = ", ".join(member.mention for member in members)
+        if len(mentions) > 4000:
+            mentions = mentions[:4000].rsplit(",", 1)[0] + ", ..."
+        
+        await channel.send(
+            embed=create_embed(
+                title=f"Bem-vindos(as) a {guild.name}!",
+                description=f"{len(members)} novos membros chegaram:\n{mentions}",
+                footer={"text": f"Agora somos {guild.member_count} membros!"},
+                color=discord.Color.green()
+            )
+        )
+    
     async def on_member_remove(self, member: Member):
         """
         Processa a saída de um membro do servidor
@@ -62,36 +115,63 @@ class MemberEventHandler:
         """
         self.log.info(f"Membro {member.name} (ID: {member.id}) saiu do servidor {member.guild.name}")
         
-        # Busca configurações do servidor
-        guild_config = get_guild(member.guild.id)
+        # Configuração efetiva do servidor
+        guild_config = await get_guild_config(member.guild.id)
         
         # Verifica se existe canal de log configurado
-        if guild_config and guild_config.get('log_channel_id'):
+        if guild_config.get('recursos.moderacao.logs_habilitado') and guild_config.get('log_channel_id'):
             log_channel = self.bot.get_channel(guild_config['log_channel_id'])
             
             if log_channel:
-                # Notifica sobre a saída do membro
-                await log_channel.send(
-                    embed=create_embed(
-                        title="Membro Saiu",
-                        description=f"{member.name} saiu do servidor.",
-                        fields=[
-                            {"name": "ID", "value": str(member.id), "inline": True},
-                            {"name": "Entrou em", "value": member.joined_at.strftime("%d/%m/%Y") if member.joined_at else "Desconhecido", "inline": True}
-                        ],
-                        thumbnail=member.display_avatar.url,
-                        color=discord.Color.red(),
-                        timestamp=True
-                    )
+                # Registra a saída no digest do canal (enviado em lote)
+                joined = member.joined_at.strftime("%d/%m/%Y") if member.joined_at else "Desconhecido"
+                template = templates.get(None, guild_config.get("mensagens.saida", self.leave_template))
+                log_digest.add(
+                    log_channel,
+                    title="📤 Membro Saiu",
+                    value=f"{template.render(member)}\n"
+                          f"ID: `{member.id}` • Entrou em: {joined}",
+                    color=discord.Color.red()
                 )
 
-def setup(bot):
+    async def index_join(self, member: Member):
+        """Adiciona o membro ao índice de autocomplete do servidor"""
+        member_index.add(member.guild.id, member.display_name, str(member.id))
+    
+    async def index_remove(self, member: Member):
+        """Remove o membro do índice de autocomplete do servidor"""
+        member_index.remove(member.guild.id, member.display_name, str(member.id))
+    
+    async def index_update(self, before: Member, after: Member):
+        """Atualiza o índice quando o nome exibido do membro muda"""
+        if before.display_name != after.display_name:
+            member_index.remove(after.guild.id, before.display_name, str(after.id))
+            member_index.add(after.guild.id, after.display_name, str(after.id))
+    
+    async def forget_guild(self, guild):
+        """Descarta os índices de autocomplete e a configuração de um servidor que o bot deixou"""
+        for index in (member_index, custom_command_index, playlist_index):
+            index.forget(guild.id)
+        guild_configs.forget(guild.id)
+
+def setup(bus, config=None):
     """
-    Registra os manipuladores de eventos no bot
+    Inscreve os manipuladores de eventos de membros no barramento
     
     Args:
-        bot: Instância do bot Discord
+        bus: EventBus do bot
+        config: Configuração do bot
+    
+    Returns:
+        O MemberEventHandler criado
     """
-    handler = MemberEventHandler(bot)
-    bot.add_listener(handler.on_member_join, 'on_member_join')
-    bot.add_listener(handler.on_member_remove, 'on_member_remove')
\ No newline at end of file
+    handler = MemberEventHandler(bus.bot, config)
+    bus.subscribe('on_member_join', handler.on_member_join, name='member.welcome')
+    bus.subscribe('on_member_remove', handler.on_member_remove, name='member.leave_log')
+    
+    # Índice de autocomplete de membros (barato, executa antes dos demais)
+    bus.subscribe('on_member_join', handler.index_join, priority=10, name='member.index')
+    bus.subscribe('on_member_remove', handler.index_remove, priority=10, name='member.index')
+    bus.subscribe('on_member_update', handler.index_update, name='member.index')
+    bus.subscribe('on_guild_remove', handler.forget_guild, name='member.forget_indexes')
+    return handler
\ No newline at end of file
@@ -1,23 +1,51 @@
+import asyncio
+import time
 import discord
 from discord.ext import commands
-from src.utils import logger, add_xp, get_custom_command
+from src.utils import add_xp, get_guild_config
+from src.utils.database import db_manager
+from src.utils.templates import templates
+from src.utils.custom_commands import custom_commands
+from src.utils.logger import get_logger, log_context
+from .stages import MessagePipeline, Stage
 
 class MessageEventHandler:
     """Manipula eventos relacionados a mensagens no Discord"""
     
-    def __init__(self, bot):
+    def __init__(self, bot, config=None):
         """
         Inicializa o manipulador de eventos
         
         Args:
             bot: Instância do bot Discord
+            config: Configuração do bot (usa os valores padrão se None)
         """
         self.bot = bot
-        self.log = logger.get_logger('events.message')
-        self.log.info('Manipulador de mensagens inicializado')
+        self.log = get_logger('events.message')
+        
+        # Sistema de níveis (recursos.niveis no settings.yml)
+        get = config.get if config else (lambda key, default=None: default)
+        self.xp_enabled = get("recursos.niveis.habilitado", True)
+        self.xp_amount = get("recursos.niveis.xp_por_mensagem", 2)
+        self.xp_cooldown = get("recursos.niveis.cooldown", 60)
+        self.level_up_template = get(
+            "mensagens.subida_nivel", "🎉 Parabéns, {user}! Você alcançou o **nível {level}**!"
+        )
+        
+        # Último ganho de XP por (servidor, usuário), em tempo monotônico
+        self.xp_cooldowns = {}
         
-        # Cache para comandos personalizados (reduz consultas ao banco)
-        self.custom_commands_cache = {}
+        # Estágios em ordem: filtros baratos primeiro, I/O por último
+        self.pipeline = MessagePipeline([
+            Stage("bot_filter", self._filter_bots),
+            Stage("dm_filter", self._filter_dms),
+            Stage("guild_config", self._load_guild_config),
+            Stage("cooldown", self._check_cooldown,
+                  when=lambda ctx: ctx.data["config"].get("recursos.niveis.habilitado", self.xp_enabled)),
+            Stage("xp", self._award_xp, when=lambda ctx: ctx.data.get("award_xp", False)),
+            Stage("custom_command", self._match_custom_command)
+        ])
+        self.log.info('Manipulador de mensagens inicializado')
     
     async def on_message(self, message):
         """
@@ -26,68 +54,91 @@ class MessageEventHandler:
         Args:
             message: Objeto de mensagem do Discord
         """
-        # Ignora mensagens do próprio bot
-        if message.author.bot:
-            return
-            
-        # Ignora mensagens privadas (DM)
-        if not message.guild:
-            return
-            
-        # Adiciona XP ao usuário (sistema de níveis)
+        guild_id = message.guild.id if message.guild else None
+        with log_context(guild_id=guild_id, user_id=message.author.id):
+            await self.pipeline.process(message)
+    
+    #=================== ESTÁGIOS ===================
+    
+    async def _filter_bots(self, ctx):
+        """Ignora mensagens de bots (incluindo o próprio)"""
+        return not ctx.message.author.bot
+    
+    async def _filter_dms(self, ctx):
+        """Ignora mensagens privadas (DM)"""
+        return ctx.message.guild is not None
+    
+    async def _load_guild_config(self, ctx):
+        """Anexa a configuração efetiva do servidor ao contexto (em cache após a primeira mensagem)"""
+        ctx.data["config"] = await get_guild_config(ctx.message.guild.id)
+    
+    async def _check_cooldown(self, ctx):
+        """Marca a mensagem para ganho de XP se o cooldown do usuário expirou"""
+        key = (ctx.message.guild.id, ctx.message.author.id)
+        now = time.monotonic()
+        last = self.xp_cooldowns.get(key)
+        if last is None or now - last >= ctx.data["config"].get("recursos.niveis.cooldown", self.xp_cooldown):
+            self.xp_cooldowns[key] = now
+            ctx.data["award_xp"] = True
+        
+        # Evita crescimento ilimitado do dicionário de cooldowns
+        if len(self.xp_cooldowns) > 100_000:
+            cutoff = now - self.xp_cooldown
+            self.xp_cooldowns = {k: t for k, t in self.xp_cooldowns.items() if t >= cutoff}
+    
+    async def _award_xp(self, ctx):
+        """Adiciona XP ao usuário e anuncia subidas de nível"""
+        message = ctx.message
         guild_id = message.guild.id
         user_id = message.author.id
         
-        # Registra mensagem e adiciona XP
-        new_level, leveled_up = add_xp(guild_id, user_id)
+        config = ctx.data["config"]
+        xp_amount = config.get("recursos.niveis.xp_por_mensagem", self.xp_amount)
+        
+        # pymongo é síncrono; roda fora do loop de eventos
+        new_level, leveled_up = await asyncio.to_thread(add_xp, guild_id, user_id, xp_amount)
         
         # Notifica quando o usuário subir de nível
         if leveled_up:
-            await message.channel.send(
-                f"🎉 Parabéns, {message.author.mention}! Você alcançou o **nível {new_level}**!"
-            )
+            template = templates.get(None, config.get("mensagens.subida_nivel", self.level_up_template))
+            await message.channel.send(template.render(message.author, level=new_level))
             self.log.info(f"Usuário {user_id} subiu para o nível {new_level} no servidor {guild_id}")
-        
-        # Processa comandos personalizados
-        if message.content.startswith('!'):
-            cmd_name = message.content.split()[0][1:].lower()
-            await self._handle_custom_command(message, cmd_name)
     
-    async def _handle_custom_command(self, message, cmd_name):
-        """
-        Processa comandos personalizados
-        
-        Args:
-            message: Objeto de mensagem do Discord
-            cmd_name: Nome do comando (sem o prefixo)
-        """
+    async def _match_custom_command(self, ctx):
+        """Responde comandos personalizados usando o índice compilado do servidor"""
+        message = ctx.message
         guild_id = message.guild.id
+        guild_commands = await custom_commands.get(
+            guild_id, lambda: asyncio.to_thread(db_manager.load_custom_commands, guild_id)
+        )
         
-        # Verifica o cache primeiro
-        guild_commands = self.custom_commands_cache.get(guild_id, {})
-        command = guild_commands.get(cmd_name)
-        
-        # Se não estiver no cache, consulta o banco
-        if not command:
-            command = get_custom_command(guild_id, cmd_name)
-            
-            # Atualiza o cache se o comando existir
-            if command:
-                if guild_id not in self.custom_commands_cache:
-                    self.custom_commands_cache[guild_id] = {}
-                self.custom_commands_cache[guild_id][cmd_name] = command
+        match = guild_commands.match(message.content)
+        if match is None:
+            return
+        command, end = match
+        args = message.content[end:].strip() if command.needs_args else ""
         
-        # Executa o comando, se existir
-        if command:
-            await message.channel.send(command['response'])
-            self.log.debug(f"Comando personalizado '{cmd_name}' executado no servidor {guild_id}")
+        await message.channel.send(command.render(message, args))
+        # Caminho quente: formatação adiada e amostrada (logs.amostragem)
+        self.log.debug("Comando personalizado '%s' executado no servidor %s", command.name, guild_id,
+                       extra={"command": command.name})
+    
+    async def forget_guild(self, guild):
+        """Descarta o índice de comandos de um servidor que o bot deixou"""
+        custom_commands.forget(guild.id)
 
-def setup(bot):
+def setup(bus, config=None):
     """
-    Registra o manipulador de eventos no bot
+    Inscreve o manipulador de mensagens no barramento
     
     Args:
-        bot: Instância do bot Discord
+        bus: EventBus do bot
+        config: Configuração do bot
+    
+    Returns:
+        O MessageEventHandler criado
     """
-    handler = MessageEventHandler(bot)
-    bot.add_listener(handler.on_message, 'on_message')
\ No newline at end of file
+    handler = MessageEventHandler(bus.bot, config)
+    bus.subscribe('on_message', handler.on_message, name='message.pipeline')
+    bus.subscribe('on_guild_remove', handler.forget_guild, name='message.forget_commands')
+    return handler
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Pipeline de eventos com filas limitadas por servidor.
+Eventos do gateway são enfileirados por servidor e processados por um pool de
+workers com escalonamento round-robin, para que um servidor inundado (raid)
+não aumente a latência dos demais.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+# Políticas de transbordo quando a fila de um servidor está cheia
+DROP_NEWEST = "drop_newest"   # Descarta o evento que está chegando
+DROP_OLDEST = "drop_oldest"   # Descarta o evento descartável mais antigo da fila
+BLOCK = "block"               # Nunca descarta: aguarda espaço (backpressure)
+
+# Padrões: XP pode ser perdido, entradas e saídas de membros nunca
+DEFAULT_POLICIES = {
+    "message": DROP_NEWEST,
+    "member_join": BLOCK,
+    "member_remove": BLOCK
+}
+
+class _GuildQueue:
+    """Fila de um servidor"""
+    __slots__ = ("guild_id", "items", "scheduled", "space")
+
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.items = deque()
+        self.scheduled = False
+        self.space = asyncio.Event()
+
+class GuildEventPipeline:
+    """
+    Filas limitadas por servidor com pool de workers e escalonamento justo.
+
+    Cada servidor fica no máximo uma vez no anel de prontos e processa um
+    evento por vez, o que preserva a ordem dentro do servidor e alterna
+    entre servidores a cada evento.
+    """
+
+    def __init__(self,
+                 workers: int = 8,
+                 max_queue_size: int = 256,
+                 policies: Optional[Dict[str, str]] = None,
+                 default_policy: str = DROP_NEWEST):
+        """
+        Args:
+            workers: Número de workers concorrentes
+            max_queue_size: Capacidade da fila de cada servidor
+            policies: Política de transbordo por tipo de evento
+            default_policy: Política para tipos não listados
+        """
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.default_policy = default_policy
+        self.log = get_logger('events.pipeline')
+
+        self._queues: Dict[Any, _GuildQueue] = {}
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._closing = False
+        self._idle: Optional[asyncio.Event] = None
+        self._depth = metrics.gauge("events.queue.depth")
+        self._wait = metrics.histogram("events.queue.wait")
+
+    #=================== CICLO DE VIDA ===================
+
+    def start(self):
+        """Inicia os workers (deve ser chamado com o loop em execução)"""
+        if self._tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self.log.info(f"Pipeline de eventos iniciado com {self.workers} workers")
+
+    async def drain(self):
+        """
+        Para de aceitar eventos, processa o que está na fila e encerra os workers
+
+        Returns:
+            Tupla (processados, descartados) para o relatório de desligamento
+        """
+        self._closing = True
+        # Acorda quem aguarda espaço sob a política block (será rejeitado)
+        for queue in self._queues.values():
+            queue.space.set()
+        pending = self.depth
+        if self._tasks:
+            await self._idle.wait()
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+        return pending - self.depth, self.depth
+
+    #=================== ENFILEIRAMENTO ===================
+
+    async def submit(self, guild_id, kind: str, handler: Callable[..., Awaitable], *args) -> bool:
+        """
+        Enfileira um evento para o servidor
+
+        Args:
+            guild_id: ID do servidor (None para DMs)
+            kind: Tipo do evento (define a política de transbordo)
+            handler: Corrotina que processa o evento
+            *args: Argumentos do handler
+
+        Returns:
+            True se o evento foi aceito, False se foi descartado
+        """
+        if self._closing or not self._tasks:
+            metrics.counter(f"events.rejected.{kind}").inc()
+            return False
+
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = self._queues[guild_id] = _GuildQueue(guild_id)
+
+        if len(queue.items) >= self.max_queue_size:
+            policy = self.policies.get(kind, self.default_policy)
+            if policy == BLOCK:
+                metrics.counter(f"events.blocked.{kind}").inc()
+                while len(queue.items) >= self.max_queue_size and not self._closing:
+                    queue.space.clear()
+                    await queue.space.wait()
+                # A drenagem pode ter começado enquanto aguardávamos
+                if self._closing:
+                    metrics.counter(f"events.rejected.{kind}").inc()
+                    return False
+                # A fila pode ter sido liberada por um worker enquanto aguardávamos
+                queue = self._queues.setdefault(guild_id, queue)
+            elif policy == DROP_OLDEST and self._evict_droppable(queue):
+                pass
+            else:
+                metrics.counter(f"events.dropped.{kind}").inc()
+                return False
+
+        queue.items.append((kind, handler, args, time.monotonic()))
+        self._depth.inc()
+        metrics.counter(f"events.enqueued.{kind}").inc()
+        self._idle.clear()
+        if not queue.scheduled:
+            queue.scheduled = True
+            self._ready.put_nowait(guild_id)
+        return True
+
+    def _evict_droppable(self, queue: _GuildQueue) -> bool:
+        """Remove o evento descartável mais antigo da fila"""
+        for i, item in enumerate(queue.items):
+            if self.policies.get(item[0], self.default_policy) != BLOCK:
+                del queue.items[i]
+                self._depth.dec()
+                metrics.counter(f"events.dropped.{item[0]}").inc()
+                return True
+        return False
+
+    #=================== WORKERS ===================
+
+    async def _worker(self, index: int):
+        while True:
+            guild_id = await self._ready.get()
+            queue = self._queues[guild_id]
+            kind, handler, args, enqueued_at = queue.items.popleft()
+            self._depth.dec()
+            queue.space.set()
+            self._wait.observe(time.monotonic() - enqueued_at)
+
+            try:
+                with metrics.histogram(f"events.handle.{kind}").time():
+                    await handler(*args)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.counter(f"events.errors.{kind}").inc()
+                self.log.error(f"Erro ao processar evento '{kind}' do servidor {guild_id}: {e}")
+
+            # Volta ao fim do anel se ainda houver eventos; senão libera a fila
+            if queue.items:
+                self._ready.put_nowait(guild_id)
+            else:
+                queue.scheduled = False
+                del self._queues[guild_id]
+                if not self._queues:
+                    self._idle.set()
+
+    #=================== MÉTRICAS ===================
+
+    @property
+    def depth(self) -> int:
+        """Total de eventos aguardando em todas as filas"""
+        return self._depth.value
+
+    def depths(self, top: int = 10) -> Dict[Any, int]:
+        """Profundidade das filas mais cheias"""
+        ranked = sorted(self._queues.values(), key=lambda q: len(q.items), reverse=True)
+        return {q.guild_id: len(q.items) for q in ranked[:top]}
@@ -4,10 +4,31 @@ Fornece funções e classes para banco de dados, logging e outras ferramentas co
 """
 
 # Importações do banco de dados
-from .database import DatabaseManager, init_db, get_guild, get_member, add_xp
+from .database import DatabaseManager, init_db, get_guild, get_member, add_xp, get_custom_command, get_guild_config
 
 # Importações do logger
-from .logger import setup_logger, get_logger, logger
+from .logger import (
+    setup_logger, get_logger, logger, log_pipeline, LogPipeline,
+    configure_logging, log_context, JsonFormatter, SamplingFilter
+)
+
+# Métricas em memória
+from .metrics import metrics, MetricsRegistry
+
+# Índices de prefixo para autocomplete
+from .prefix_index import PrefixIndex, custom_command_index, playlist_index, member_index
+
+# Comandos personalizados compilados por servidor
+from .custom_commands import custom_commands, CustomCommandMatcher
+
+# Digest de logs por canal
+from .log_digest import log_digest, LogDigest
+
+# Configuração em camadas por servidor
+from .guild_config import guild_configs, GuildConfigResolver, GuildConfigView
+
+# Agendador persistente de ações temporizadas
+from .scheduler import scheduler, Scheduler
 
 # Exporta utilitários para fácil acesso em outros módulos
 __all__ = [
@@ -17,9 +38,44 @@ __all__ = [
     "get_guild",
     "get_member", 
     "add_xp",
+    "get_custom_command",
+    "get_guild_config",
     
     # Logging
     "setup_logger",
     "get_logger",
-    "logger"
+    "logger",
+    "log_pipeline",
+    "LogPipeline",
+    "configure_logging",
+    "log_context",
+    "JsonFormatter",
+    "SamplingFilter",
+    
+    # Métricas
+    "metrics",
+    "MetricsRegistry",
+    
+    # Autocomplete
+    "PrefixIndex",
+    "custom_command_index",
+    "playlist_index",
+    "member_index",
+    
+    # Comandos personalizados
+    "custom_commands",
+    "CustomCommandMatcher",
+    
+    # Digest de logs
+    "log_digest",
+    "LogDigest",
+    
+    # Configuração por servidor
+    "guild_configs",
+    "GuildConfigResolver",
+    "GuildConfigView",
+    
+    # Agendador
+    "scheduler",
+    "Scheduler"
 ]
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Índice compilado de comandos personalizados por servidor.
+Cada servidor tem seu prefixo, um dicionário nome/alias -> comando e as
+respostas já compiladas como templates; o casamento examina apenas o
+primeiro token da mensagem, sem dividir o restante do texto.
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .metrics import metrics
+from .templates import CompiledTemplate, compile_template
+
+# Prefixo usado quando o servidor não tem documento no banco
+DEFAULT_PREFIX = "!"
+
+# Primeiro token da mensagem (sequência sem espaços)
+_TOKEN = re.compile(r"\S+")
+
+class CompiledCommand:
+    """Comando personalizado pronto para responder"""
+    __slots__ = ("name", "template", "needs_args", "needs_channel")
+
+    def __init__(self, name: str, response: str):
+        self.name = name
+        self.template: CompiledTemplate = compile_template(response)
+        self.needs_args = "args" in self.template.fields
+        self.needs_channel = "channel" in self.template.fields
+
+    def render(self, message, args: str = "") -> str:
+        """
+        Monta a resposta para a mensagem
+
+        Além dos placeholders de membro, aceita {args} (texto após o nome
+        do comando) e {channel} (menção ao canal).
+
+        Args:
+            message: Mensagem que acionou o comando
+            args: Texto após o nome do comando
+        """
+        values = {}
+        if self.needs_args:
+            values["args"] = args
+        if self.needs_channel:
+            values["channel"] = message.channel.mention
+        return self.template.render(message.author, **values)
+
+class GuildCommands:
+    """Prefixo e comandos compilados de um servidor"""
+    __slots__ = ("prefix", "commands", "max_length")
+
+    def __init__(self, prefix: str, commands: Dict[str, CompiledCommand]):
+        self.prefix = prefix
+        self.commands = commands
+        self.max_length = max(map(len, commands), default=0)
+
+    def match(self, content: str) -> Optional[Tuple[CompiledCommand, int]]:
+        """
+        Procura o comando no início da mensagem
+
+        Args:
+            content: Texto da mensagem
+
+        Returns:
+            (comando, posição após o nome) ou None
+        """
+        if not self.commands or not content.startswith(self.prefix):
+            return None
+        start = len(self.prefix)
+        # Lê no máximo um caractere além do maior nome cadastrado
+        token = _TOKEN.match(content, start, start + self.max_length + 1)
+        if token is None or token.end() - start > self.max_length:
+            return None
+        command = self.commands.get(token.group().lower())
+        if command is None:
+            return None
+        return command, token.end()
+
+def compile_guild(prefix: Optional[str], documents: Iterable[Dict[str, Any]]) -> GuildCommands:
+    """
+    Compila os comandos de um servidor
+
+    Args:
+        prefix: Prefixo do servidor (None = padrão)
+        documents: Documentos da coleção custom_commands (name, response, aliases)
+    """
+    commands: Dict[str, CompiledCommand] = {}
+    for document in documents:
+        command = CompiledCommand(document["name"], document["response"])
+        for alias in document.get("aliases") or ():
+            commands.setdefault(alias.lower(), command)
+        # O nome principal prevalece sobre o alias de outro comando
+        commands[document["name"].lower()] = command
+    return GuildCommands(prefix or DEFAULT_PREFIX, commands)
+
+class CustomCommandMatcher:
+    """
+    Índices compilados por servidor, carregados sob demanda
+
+    A camada de banco chama invalidate() ao criar comandos ou mudar o
+    prefixo; a próxima mensagem do servidor recompila o índice.
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, GuildCommands] = {}
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._generation: Dict[int, int] = {}
+
+    def invalidate(self, guild_id: int):
+        """Descarta o índice do servidor (recarregado na próxima mensagem)"""
+        self._generation[guild_id] = self._generation.get(guild_id, 0) + 1
+        self._guilds.pop(guild_id, None)
+
+    def forget(self, guild_id: int):
+        """Remove todo o estado de um servidor que o bot deixou"""
+        self._guilds.pop(guild_id, None)
+        self._generation.pop(guild_id, None)
+
+    async def get(self, guild_id: int,
+                  fetch: Callable[[], Awaitable[Tuple[Optional[str], Iterable[Dict[str, Any]]]]]) -> GuildCommands:
+        """
+        Retorna o índice do servidor, carregando uma única vez
+
+        Args:
+            guild_id: ID do servidor
+            fetch: Corrotina que retorna (prefixo, documentos dos comandos)
+        """
+        guild = self._guilds.get(guild_id)
+        if guild is not None:
+            return guild
+
+        future = self._loading.get(guild_id)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        generation = self._generation.get(guild_id, 0)
+        future = self._loading[guild_id] = asyncio.ensure_future(self._load(fetch))
+        try:
+            guild = await future
+        finally:
+            self._loading.pop(guild_id, None)
+
+        # Uma invalidação durante a carga torna o resultado obsoleto
+        if self._generation.get(guild_id, 0) == generation:
+            self._guilds[guild_id] = guild
+        return guild
+
+    async def _load(self, fetch) -> GuildCommands:
+        prefix, documents = await fetch()
+        metrics.counter("custom_commands.loads").inc()
+        return compile_guild(prefix, documents)
+
+    def __len__(self):
+        return len(self._guilds)
+
+# Instância global, invalidada pela camada de banco
+custom_commands = CustomCommandMatcher()
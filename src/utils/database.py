@@ -1,13 +1,30 @@
+import asyncio
 import os
 from datetime import datetime
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
+from .metrics import count_db_call
+from .prefix_index import custom_command_index, playlist_index
+from .custom_commands import custom_commands
+from .guild_config import guild_configs
 
 # Carrega configurações do ambiente
 load_dotenv()
 
+class CommandCounter(monitoring.CommandListener):
+    """Conta cada comando enviado ao MongoDB na invocação de comando atual"""
+    
+    def started(self, event):
+        count_db_call()
+    
+    def succeeded(self, event):
+        pass
+    
+    def failed(self, event):
+        pass
+
 class DatabaseConnection:
     """Conexão singleton com MongoDB"""
     _instance = None
@@ -31,7 +48,11 @@ class DatabaseConnection:
         
         try:
             # Conecta ao servidor MongoDB
-            self.client = MongoClient(mongo_url, serverSelectionTimeoutMS=5000)
+            self.client = MongoClient(
+                mongo_url,
+                serverSelectionTimeoutMS=5000,
+                event_listeners=[CommandCounter()]
+            )
             # Verifica conexão
             self.client.admin.command('ping')
             self.db = self.client[db_name]
@@ -58,6 +79,13 @@ class DatabaseManager:
         self.db.users.create_index("user_id", unique=True)
         self.db.members.create_index([("guild_id", 1), ("user_id", 1)], unique=True)
         self.db.custom_commands.create_index([("guild_id", 1), ("name", 1)], unique=True)
+        self.db.playlists.create_index("guild_id")
+        self.db.scheduled_jobs.create_index([("status", 1), ("run_at", 1)])
+        self.db.scheduled_jobs.create_index(
+            [("kind", 1), ("guild_id", 1), ("key", 1)],
+            unique=True,
+            partialFilterExpression={"key": {"$type": "string"}}
+        )
         print("Índices do MongoDB criados com sucesso!")
 
     #=================== SERVIDORES ===================
@@ -85,6 +113,7 @@ class DatabaseManager:
         
         try:
             self.db.guilds.insert_one(guild_data)
+            guild_configs.invalidate(guild_id)
             return guild_data
         except Exception as e:
             print(f"Erro ao criar servidor: {e}")
@@ -106,6 +135,28 @@ class DatabaseManager:
             {"$set": settings}
         )
         
+        # O prefixo faz parte do índice compilado de comandos personalizados
+        if "prefix" in settings:
+            custom_commands.invalidate(guild_id)
+        guild_configs.invalidate(guild_id)
+        
+        return result.modified_count > 0
+    
+    def set_guild_setting(self, guild_id, key, value):
+        """
+        Sobrepõe uma chave do settings.yml para um servidor
+        
+        Args:
+            guild_id: ID do servidor
+            key: Chave com notação de ponto (ex: recursos.niveis.xp_por_mensagem)
+            value: Novo valor (None remove a sobreposição)
+        """
+        field = f"config.{key}"
+        update = {"$unset": {field: ""}} if value is None else {"$set": {field: value}}
+        update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+        
+        result = self.db.guilds.update_one({"guild_id": guild_id}, update)
+        guild_configs.invalidate(guild_id)
         return result.modified_count > 0
 
     #=================== OPERAÇÕES DE MEMBRO ===================
@@ -189,6 +240,33 @@ class DatabaseManager:
         """Obtém todos os comandos personalizados de um servidor"""
         return list(self.db.custom_commands.find({"guild_id": guild_id}))
     
+    @staticmethod
+    def _command_entries(name, aliases):
+        """Entradas do índice de autocomplete de um comando: o nome e cada alias, todos com o nome como valor"""
+        return [(name, name)] + [(alias, name) for alias in aliases or ()]
+    
+    def get_custom_command_names(self, guild_id):
+        """Obtém os nomes e aliases dos comandos personalizados (para o índice de autocomplete)"""
+        return [
+            entry
+            for command in self.db.custom_commands.find({"guild_id": guild_id}, {"name": 1, "aliases": 1, "_id": 0})
+            for entry in self._command_entries(command["name"], command.get("aliases"))
+        ]
+    
+    def load_custom_commands(self, guild_id):
+        """
+        Obtém o prefixo e os comandos personalizados de um servidor
+        
+        Returns:
+            (prefix, documentos com name, response e aliases)
+        """
+        guild = self.db.guilds.find_one({"guild_id": guild_id}, {"prefix": 1, "_id": 0})
+        commands = list(self.db.custom_commands.find(
+            {"guild_id": guild_id},
+            {"name": 1, "response": 1, "aliases": 1, "_id": 0}
+        ))
+        return (guild or {}).get("prefix"), commands
+    
     def get_custom_command(self, guild_id, command_name):
         """Obtém um comando personalizado específico"""
         return self.db.custom_commands.find_one({
@@ -196,11 +274,17 @@ class DatabaseManager:
             "name": command_name.lower()
         })
     
-    def create_custom_command(self, guild_id, command_name, response, created_by):
-        """Cria um comando personalizado"""
+    def create_custom_command(self, guild_id, command_name, response, created_by, aliases=None):
+        """
+        Cria um comando personalizado
+        
+        A resposta pode usar os placeholders de membro ({user}, {server}, ...),
+        além de {args} e {channel}.
+        """
         command_data = {
             "guild_id": guild_id,
             "name": command_name.lower(),
+            "aliases": [alias.lower() for alias in aliases or []],
             "response": response,
             "created_by": created_by,
             "uses": 0,
@@ -209,6 +293,9 @@ class DatabaseManager:
         
         try:
             self.db.custom_commands.insert_one(command_data)
+            for label, value in self._command_entries(command_data["name"], command_data["aliases"]):
+                custom_command_index.add(guild_id, label, value)
+            custom_commands.invalidate(guild_id)
             return True
         except Exception as e:
             print(f"Erro ao criar comando personalizado: {e}")
@@ -228,6 +315,59 @@ class DatabaseManager:
         )
         return command
     
+    def delete_custom_command(self, guild_id, command_name):
+        """
+        Remove um comando personalizado
+        
+        Returns:
+            True se o comando existia
+        """
+        name = command_name.lower()
+        try:
+            # Os aliases do documento removido saem do índice junto com o nome
+            deleted = self.db.custom_commands.find_one_and_delete(
+                {"guild_id": guild_id, "name": name},
+                projection={"aliases": 1, "_id": 0}
+            )
+        except Exception as e:
+            print(f"Erro ao remover comando personalizado: {e}")
+            return False
+        if deleted is None:
+            return False
+        for label, value in self._command_entries(name, deleted.get("aliases")):
+            custom_command_index.remove(guild_id, label, value)
+        custom_commands.invalidate(guild_id)
+        return True
+    
+    def rename_custom_command(self, guild_id, command_name, new_name):
+        """
+        Renomeia um comando personalizado
+        
+        Returns:
+            True se o comando existia e o novo nome estava livre
+        """
+        old, new = command_name.lower(), new_name.lower()
+        try:
+            # Documento anterior à atualização: seus aliases passam a apontar para o novo nome
+            previous = self.db.custom_commands.find_one_and_update(
+                {"guild_id": guild_id, "name": old},
+                {"$set": {"name": new}},
+                projection={"aliases": 1, "_id": 0}
+            )
+        except Exception as e:
+            # Inclui DuplicateKeyError: já existe um comando com o novo nome
+            print(f"Erro ao renomear comando personalizado: {e}")
+            return False
+        if previous is None:
+            return False
+        aliases = previous.get("aliases")
+        for label, value in self._command_entries(old, aliases):
+            custom_command_index.remove(guild_id, label, value)
+        for label, value in self._command_entries(new, aliases):
+            custom_command_index.add(guild_id, label, value)
+        custom_commands.invalidate(guild_id)
+        return True
+    
     #=================== PLAYLISTS ===================
     
     def create_playlist(self, guild_id, name, created_by):
@@ -242,15 +382,64 @@ class DatabaseManager:
         
         try:
             result = self.db.playlists.insert_one(playlist_data)
+            playlist_index.add(guild_id, name, str(result.inserted_id))
             return str(result.inserted_id)
         except Exception as e:
             print(f"Erro ao criar playlist: {e}")
             return None
     
+    def delete_playlist(self, guild_id, playlist_id):
+        """
+        Remove uma playlist do servidor
+        
+        Returns:
+            True se a playlist existia
+        """
+        try:
+            playlist = self.db.playlists.find_one_and_delete(
+                {"_id": ObjectId(playlist_id), "guild_id": guild_id}, projection={"name": 1}
+            )
+        except Exception as e:
+            print(f"Erro ao remover playlist: {e}")
+            return False
+        if playlist is None:
+            return False
+        playlist_index.remove(guild_id, playlist["name"], str(playlist["_id"]))
+        return True
+    
+    def rename_playlist(self, guild_id, playlist_id, new_name):
+        """
+        Renomeia uma playlist do servidor
+        
+        Returns:
+            True se a playlist existia
+        """
+        try:
+            playlist = self.db.playlists.find_one_and_update(
+                {"_id": ObjectId(playlist_id), "guild_id": guild_id},
+                {"$set": {"name": new_name}},
+                projection={"name": 1}
+            )
+        except Exception as e:
+            print(f"Erro ao renomear playlist: {e}")
+            return False
+        if playlist is None:
+            return False
+        playlist_index.remove(guild_id, playlist["name"], str(playlist["_id"]))
+        playlist_index.add(guild_id, new_name, str(playlist["_id"]))
+        return True
+    
     def get_playlists(self, guild_id):
         """Obtém todas as playlists de um servidor"""
         return list(self.db.playlists.find({"guild_id": guild_id}))
     
+    def get_playlist_names(self, guild_id):
+        """Obtém pares (nome, id) das playlists de um servidor (para o índice de autocomplete)"""
+        return [
+            (playlist["name"], str(playlist["_id"]))
+            for playlist in self.db.playlists.find({"guild_id": guild_id}, {"name": 1})
+        ]
+    
     def get_playlist(self, playlist_id):
         """Obtém uma playlist específica"""
         try:
@@ -277,6 +466,100 @@ class DatabaseManager:
             print(f"Erro ao adicionar música: {e}")
             return False
 
+    
+    #=================== AGENDAMENTOS ===================
+    
+    def schedule_job(self, kind, run_at, guild_id=None, payload=None, key=None):
+        """
+        Agenda uma ação para um horário
+        
+        Com key, substitui o agendamento existente do mesmo tipo, servidor e
+        chave (ex: um novo tempban do mesmo membro).
+        
+        Returns:
+            O documento agendado
+        """
+        job = {
+            "kind": kind,
+            "run_at": run_at,
+            "guild_id": guild_id,
+            "payload": payload or {},
+            "status": "pending",
+            "attempts": 0,
+            "created_at": datetime.utcnow()
+        }
+        
+        if key is None:
+            job["_id"] = self.db.scheduled_jobs.insert_one(job).inserted_id
+            return job
+        
+        job["key"] = str(key)
+        return self.db.scheduled_jobs.find_one_and_update(
+            {"kind": kind, "guild_id": guild_id, "key": job["key"]},
+            {"$set": job},
+            upsert=True,
+            return_document=True
+        )
+    
+    def get_due_jobs(self, until, limit):
+        """Obtém os próximos agendamentos pendentes até um horário, em ordem"""
+        return list(
+            self.db.scheduled_jobs.find({"status": "pending", "run_at": {"$lte": until}})
+            .sort("run_at", 1)
+            .limit(limit)
+        )
+    
+    def claim_jobs(self, job_ids):
+        """
+        Marca um lote de agendamentos como em execução
+        
+        Returns:
+            IDs efetivamente reivindicados (os demais foram cancelados ou
+            reivindicados por outra instância)
+        """
+        claim = ObjectId()
+        self.db.scheduled_jobs.update_many(
+            {"_id": {"$in": job_ids}, "status": "pending"},
+            {"$set": {"status": "running", "claim": claim}, "$inc": {"attempts": 1}}
+        )
+        return [
+            job["_id"]
+            for job in self.db.scheduled_jobs.find({"_id": {"$in": job_ids}, "claim": claim}, {"_id": 1})
+        ]
+    
+    def complete_jobs(self, job_ids):
+        """Remove um lote de agendamentos concluídos"""
+        if job_ids:
+            # Um agendamento substituído durante a execução volta a "pending" e é mantido
+            self.db.scheduled_jobs.delete_many({"_id": {"$in": job_ids}, "status": "running"})
+    
+    def retry_job(self, job_id, run_at):
+        """Devolve um agendamento que falhou à fila, para um novo horário"""
+        self.db.scheduled_jobs.update_one(
+            {"_id": job_id, "status": "running"},
+            {"$set": {"status": "pending", "run_at": run_at}}
+        )
+    
+    def cancel_job(self, kind, guild_id, key):
+        """
+        Cancela o agendamento de um tipo, servidor e chave
+        
+        Returns:
+            O _id do agendamento cancelado ou None
+        """
+        job = self.db.scheduled_jobs.find_one_and_delete(
+            {"kind": kind, "guild_id": guild_id, "key": str(key)},
+            projection={"_id": 1}
+        )
+        return job["_id"] if job else None
+    
+    def recover_jobs(self):
+        """Devolve à fila agendamentos interrompidos por uma queda do processo"""
+        return self.db.scheduled_jobs.update_many(
+            {"status": "running"},
+            {"$set": {"status": "pending"}}
+        ).modified_count
+
 
 # Instância global para facilitar o uso
 db_manager = DatabaseManager()
@@ -296,6 +579,13 @@ def get_member(guild_id, user_id):
 def add_xp(guild_id, user_id, xp_amount=1):
     return db_manager.add_xp(guild_id, user_id, xp_amount)
 
+def get_custom_command(guild_id, command_name):
+    return db_manager.get_custom_command(guild_id, command_name)
+
+async def get_guild_config(guild_id):
+    """Configuração efetiva do servidor (em cache; o documento é lido só na primeira vez)"""
+    return await guild_configs.get(guild_id, lambda: asyncio.to_thread(db_manager.get_guild, guild_id))
+
 # Para testes diretos
 if __name__ == "__main__":
     init_db()
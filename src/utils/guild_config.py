@@ -0,0 +1,253 @@
+"""
+Configuração em camadas por servidor.
+Cada servidor recebe uma visão imutável resultante de: padrões do código →
+settings.yml → documento do servidor no MongoDB (campos de topo como
+log_channel_id e o subdocumento "config" com sobreposições de chaves do
+settings.yml). A visão é montada uma vez, fica em cache e é invalidada
+pela camada de banco em update_guild.
+"""
+
+import asyncio
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from .metrics import metrics
+
+# Camada base: valores usados quando nem settings.yml nem o servidor definem a chave
+DEFAULTS: Dict[str, Any] = {
+    "prefix": "!",
+    "welcome_channel_id": None,
+    "welcome_message": None,
+    "log_channel_id": None,
+    "music_channel_id": None,
+    "recursos": {
+        "niveis": {"habilitado": True, "xp_por_mensagem": 2, "cooldown": 60},
+        "moderacao": {"habilitado": True, "logs_habilitado": True},
+        "boas_vindas": {"rajada": {"limite": 5, "janela": 10, "espera": 5, "max_membros": 50}}
+    },
+    "mensagens": {
+        "boas_vindas": "Olá {user}, seja bem-vindo(a) ao servidor!\nAgora somos {count} membros!",
+        "saida": "{user_name} saiu do servidor.",
+        "subida_nivel": "🎉 Parabéns, {user}! Você alcançou o **nível {level}**!"
+    }
+}
+
+# Campos do documento do servidor que não são configuração
+_DOCUMENT_META = {"_id", "guild_id", "name", "config", "created_at", "updated_at"}
+
+# Chaves que nunca vêm da camada global: canais e prefixo são de cada servidor
+# e as variáveis de ambiente (token, banco) não pertencem à visão
+_NOT_GLOBAL = {
+    "prefix", "welcome_channel_id", "welcome_message", "log_channel_id", "music_channel_id",
+    "token", "owner_id", "guild_id", "mongo_url", "db_name"
+}
+
+# Campos antigos do documento e a chave equivalente do settings.yml
+_LEGACY_FIELDS = {
+    "welcome_burst_threshold": "recursos.boas_vindas.rajada.limite",
+    "welcome_burst_window": "recursos.boas_vindas.rajada.janela",
+    "welcome_burst_delay": "recursos.boas_vindas.rajada.espera"
+}
+
+def _merge(base: Dict[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
+    """Mescla dicionários aninhados; a sobreposição vence nas folhas"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def _unflatten(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Converte chaves com ponto ("recursos.niveis.cooldown") em dicionários aninhados"""
+    tree: Dict[str, Any] = {}
+    for key, value in values.items():
+        node = tree
+        *parents, leaf = key.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return tree
+
+def _freeze(node: Any, prefix: str, flat: Dict[str, Any]) -> Any:
+    """Achata a árvore em flat e devolve a versão somente leitura do nó"""
+    if not isinstance(node, dict):
+        return node
+    frozen = {}
+    for key, value in node.items():
+        path = f"{prefix}{key}"
+        frozen[key] = flat[path] = _freeze(value, path + ".", flat)
+    return MappingProxyType(frozen)
+
+class GuildConfigView:
+    """
+    Configuração efetiva de um servidor (somente leitura)
+
+    get() aceita notação de ponto e é uma única consulta de dicionário.
+    """
+    __slots__ = ("guild_id", "flat", "tree")
+
+    def __init__(self, guild_id: Optional[int], tree: Dict[str, Any]):
+        self.guild_id = guild_id
+        flat: Dict[str, Any] = {}
+        self.tree = _freeze(tree, "", flat)
+        self.flat = MappingProxyType(flat)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.flat.get(key, default)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        return self.flat[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.flat
+
+def _running_in(loop: asyncio.AbstractEventLoop) -> bool:
+    """Se a thread atual está executando o loop"""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+class GuildConfigResolver:
+    """
+    Visões por servidor carregadas sob demanda, com cache LRU
+
+    A camada global (settings.yml) vem do Config do bot e é atualizada no
+    hot reload; a camada do servidor vem do documento no MongoDB e é
+    descartada por invalidate() quando o documento muda.
+    """
+
+    def __init__(self, max_guilds: int = 10000):
+        self.max_guilds = max_guilds
+        self._global: Dict[str, Any] = DEFAULTS
+        self._default_view = GuildConfigView(None, DEFAULTS)
+        self._views: "OrderedDict[int, GuildConfigView]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._generation: Dict[int, int] = {}
+        # Loop dono do LRU; invalidações vindas de threads são agendadas nele
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loads = metrics.counter("guild_config.loads")
+
+    def configure(self, config):
+        """
+        Usa o Config do bot como camada global e acompanha suas recargas
+
+        Args:
+            config: Instância de Config (precisa de .config e on_change)
+        """
+        self.set_global(config.config)
+        config.on_change(lambda cfg: self.set_global(cfg.config))
+        return self
+
+    def set_global(self, settings: Mapping[str, Any]):
+        """Troca a camada global; todas as visões são reconstruídas sob demanda"""
+        settings = {key: value for key, value in (settings or {}).items() if key not in _NOT_GLOBAL}
+        self._global = _merge(DEFAULTS, settings)
+        self._default_view = GuildConfigView(None, self._global)
+        for guild_id in list(self._views):
+            self.invalidate(guild_id)
+
+    @property
+    def default(self) -> GuildConfigView:
+        """Visão sem sobreposições de servidor (padrões + settings.yml)"""
+        return self._default_view
+
+    def build(self, guild_id: Optional[int], document: Optional[Mapping[str, Any]]) -> GuildConfigView:
+        """
+        Materializa a visão de um servidor a partir do seu documento
+
+        Args:
+            guild_id: ID do servidor
+            document: Documento do servidor (ou None se não existir)
+        """
+        if not document:
+            return self._default_view if guild_id is None else GuildConfigView(guild_id, self._global)
+        fields = {key: value for key, value in document.items()
+                  if key not in _DOCUMENT_META and key not in _LEGACY_FIELDS}
+        legacy = _unflatten({
+            _LEGACY_FIELDS[key]: value for key, value in document.items()
+            if key in _LEGACY_FIELDS and value is not None
+        })
+        overrides = _unflatten(document.get("config") or {})
+        return GuildConfigView(guild_id, _merge(_merge(_merge(self._global, fields), legacy), overrides))
+
+    def invalidate(self, guild_id: int):
+        """
+        Descarta a visão do servidor (reconstruída no próximo acesso)
+
+        A camada de banco chama este método de dentro de asyncio.to_thread;
+        fora do loop a remoção é agendada nele com call_soon_threadsafe, então
+        o LRU e as gerações só são alterados pela thread do loop. O agendamento
+        precede a entrega do resultado do to_thread, então quem aguardava a
+        escrita já encontra a visão descartada.
+        """
+        loop = self._loop
+        if loop is not None and not _running_in(loop):
+            try:
+                loop.call_soon_threadsafe(self._invalidate, guild_id)
+                return
+            except RuntimeError:
+                # Loop já encerrado: ninguém mais lê o cache
+                pass
+        self._invalidate(guild_id)
+
+    def _invalidate(self, guild_id: int):
+        self._generation[guild_id] = self._generation.get(guild_id, 0) + 1
+        self._views.pop(guild_id, None)
+
+    def forget(self, guild_id: int):
+        """Remove todo o estado de um servidor que o bot deixou"""
+        self._views.pop(guild_id, None)
+        self._generation.pop(guild_id, None)
+
+    def peek(self, guild_id: int) -> Optional[GuildConfigView]:
+        """Visão em cache do servidor, sem carregar (None se ausente)"""
+        return self._views.get(guild_id)
+
+    async def get(self, guild_id: int,
+                  fetch: Callable[[], Awaitable[Optional[Mapping[str, Any]]]]) -> GuildConfigView:
+        """
+        Retorna a visão do servidor, carregando o documento uma única vez
+
+        Args:
+            guild_id: ID do servidor
+            fetch: Corrotina que retorna o documento do servidor
+        """
+        view = self._views.get(guild_id)
+        if view is not None:
+            self._views.move_to_end(guild_id)
+            return view
+
+        future = self._loading.get(guild_id)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        self._loop = asyncio.get_running_loop()
+        generation = self._generation.get(guild_id, 0)
+        future = self._loading[guild_id] = asyncio.ensure_future(self._load(guild_id, fetch))
+        try:
+            view = await future
+        finally:
+            self._loading.pop(guild_id, None)
+
+        # Uma invalidação durante a carga torna o resultado obsoleto
+        if self._generation.get(guild_id, 0) == generation:
+            self._views[guild_id] = view
+            while len(self._views) > self.max_guilds:
+                self._views.popitem(last=False)
+        return view
+
+    async def _load(self, guild_id: int, fetch) -> GuildConfigView:
+        document = await fetch()
+        self.loads.inc()
+        return self.build(guild_id, document)
+
+    def __len__(self):
+        return len(self._views)
+
+# Instância global, invalidada pela camada de banco
+guild_configs = GuildConfigResolver()
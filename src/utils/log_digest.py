@@ -0,0 +1,193 @@
+"""
+Agregador de logs por canal (modo digest).
+Eventos de log (saídas de membros, moderação) são acumulados por canal e
+enviados como embeds com vários campos, por tempo ou por tamanho,
+respeitando os limites de embed do Discord.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+import discord
+
+from .logger import get_logger
+from .metrics import metrics
+
+# Limites da API do Discord
+MAX_FIELDS = 25
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+MAX_EMBED_CHARS = 6000
+MAX_EMBEDS_PER_MESSAGE = 10
+# Reserva para o timestamp ISO 8601 de cada embed
+TIMESTAMP_CHARS = len("2000-01-01T00:00:00.000000+00:00")
+
+class _ChannelBuffer:
+    __slots__ = ("channel", "entries", "flush_task")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.entries: List[Dict[str, Any]] = []
+        self.flush_task: Optional[asyncio.Task] = None
+
+class LogDigest:
+    """Acumula eventos de log por canal e os envia em lotes"""
+
+    def __init__(self, interval: float = 30.0, max_entries: int = 50, title: str = "📋 Registro do Servidor"):
+        """
+        Args:
+            interval: Tempo máximo (segundos) que um evento espera no buffer
+            max_entries: Eventos acumulados que disparam o envio imediato
+            title: Título dos embeds de digest
+        """
+        self.interval = interval
+        self.max_entries = max_entries
+        self.title = title
+        self.enabled = True
+        self.log = get_logger('log_digest')
+        self._buffers: Dict[int, _ChannelBuffer] = {}
+        # Envios agendados e eventos já retirados do buffer ainda não enviados
+        self._tasks: Set[asyncio.Task] = set()
+        self._sending = 0
+
+    def configure(self, interval: Optional[float] = None, max_entries: Optional[int] = None, enabled: Optional[bool] = None):
+        """Atualiza os parâmetros (usado pelo BotClient a partir do settings.yml)"""
+        if interval is not None:
+            self.interval = interval
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if enabled is not None:
+            self.enabled = enabled
+        return self
+
+    def add(self, channel, title: str, value: str, color: Optional[discord.Color] = None):
+        """
+        Adiciona um evento ao digest do canal
+
+        Args:
+            channel: Canal de log
+            title: Título do evento (vira o nome do campo)
+            value: Detalhes do evento
+            color: Cor sugerida (cada embed usa a cor do seu primeiro evento)
+        """
+        if not self.enabled or channel is None:
+            return
+
+        buffer = self._buffers.get(channel.id)
+        if buffer is None:
+            buffer = self._buffers[channel.id] = _ChannelBuffer(channel)
+
+        buffer.entries.append({
+            "name": f"{title} • {datetime.now().strftime('%H:%M:%S')}"[:MAX_FIELD_NAME],
+            "value": (value or "-")[:MAX_FIELD_VALUE],
+            "color": color
+        })
+        metrics.counter("log_digest.events").inc()
+
+        if len(buffer.entries) >= self.max_entries:
+            self._schedule(buffer, 0)
+        elif buffer.flush_task is None:
+            self._schedule(buffer, self.interval)
+
+    def _schedule(self, buffer: _ChannelBuffer, delay: float):
+        if buffer.flush_task is not None:
+            if delay > 0:
+                return
+            buffer.flush_task.cancel()
+        task = buffer.flush_task = asyncio.create_task(self._flush_later(buffer.channel.id, delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self, channel_id: int, delay: float) -> int:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        buffer = self._buffers.get(channel_id)
+        if buffer is not None:
+            buffer.flush_task = None
+        return await self.flush(channel_id)
+
+    def _build_messages(self, entries: List[Dict[str, Any]]) -> List[List[discord.Embed]]:
+        """
+        Distribui os eventos em embeds e os embeds em mensagens
+
+        Respeita 25 campos por embed e, por mensagem, 10 embeds e 6000
+        caracteres somados entre todos os embeds.
+        """
+        messages: List[List[discord.Embed]] = []
+        current = None
+        size = 0
+        for entry in entries:
+            entry_size = len(entry["name"]) + len(entry["value"])
+            if current is None or len(current.fields) >= MAX_FIELDS or size + entry_size > MAX_EMBED_CHARS:
+                current = discord.Embed(
+                    title=self.title,
+                    color=entry["color"] or discord.Color.dark_grey(),
+                    timestamp=discord.utils.utcnow()
+                )
+                # Título, rodapé e timestamp do embed novo contam antes do campo
+                overhead = len(current) + TIMESTAMP_CHARS
+                if (not messages or len(messages[-1]) >= MAX_EMBEDS_PER_MESSAGE
+                        or size + overhead + entry_size > MAX_EMBED_CHARS):
+                    messages.append([])
+                    size = 0
+                messages[-1].append(current)
+                size += overhead
+            current.add_field(name=entry["name"], value=entry["value"], inline=False)
+            size += entry_size
+        return messages
+
+    async def flush(self, channel_id: int) -> int:
+        """
+        Envia imediatamente os eventos pendentes de um canal
+
+        Returns:
+            Número de eventos enviados
+        """
+        buffer = self._buffers.pop(channel_id, None)
+        if buffer is None or not buffer.entries:
+            return 0
+
+        entries = buffer.entries
+        # Fora do buffer, mas ainda contados em pending até o envio terminar
+        self._sending += len(entries)
+        for embeds in self._build_messages(entries):
+            try:
+                await buffer.channel.send(embeds=embeds)
+                metrics.counter("log_digest.messages").inc()
+            except Exception as e:
+                self.log.error(f"Erro ao enviar digest para o canal {channel_id}: {e}")
+            self._sending -= sum(len(embed.fields) for embed in embeds)
+        return len(entries)
+
+    async def flush_all(self):
+        """
+        Envia todos os digests pendentes (usado no desligamento)
+
+        Returns:
+            Tupla (enviados, descartados) para o relatório de desligamento
+        """
+        flushed = 0
+        for channel_id, buffer in list(self._buffers.items()):
+            # A tarefa de um buffer ainda presente não começou a enviar (o
+            # buffer sai do dicionário antes do primeiro envio): cancelar é seguro
+            if buffer.flush_task is not None:
+                buffer.flush_task.cancel()
+                buffer.flush_task = None
+            flushed += await self.flush(channel_id)
+
+        # Envios já em andamento terminam em vez de serem cancelados; se o
+        # prazo do desligamento estourar, seus eventos contam como descartados
+        sending = [task for task in self._tasks if not task.done()]
+        for result in await asyncio.gather(*sending, return_exceptions=True):
+            if isinstance(result, int):
+                flushed += result
+        return flushed, 0
+
+    @property
+    def pending(self) -> int:
+        """Total de eventos aguardando envio"""
+        return self._sending + sum(len(buffer.entries) for buffer in self._buffers.values())
+
+# Instância global para uso em eventos e comandos
+log_digest = LogDigest()
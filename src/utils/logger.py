@@ -1,12 +1,294 @@
+import copy
+import itertools
+import json
 import logging
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+from .metrics import metrics
+
+# Campos de contexto anexados aos registros (formatador JSON)
+CONTEXT_FIELDS = ("guild_id", "user_id", "command")
+
+# Contexto da tarefa atual: comando ou mensagem sendo processada
+_log_context: ContextVar[dict] = ContextVar("log_context", default={})
+
+def bind_log_context(**fields):
+    """
+    Acrescenta campos ao contexto de log da tarefa atual
+
+    Args:
+        **fields: guild_id, user_id, command (valores None são ignorados)
+
+    Returns:
+        Token para reset_log_context
+    """
+    context = dict(_log_context.get())
+    context.update((key, value) for key, value in fields.items() if value is not None)
+    return _log_context.set(context)
+
+def reset_log_context(token):
+    """Restaura o contexto anterior a bind_log_context"""
+    _log_context.reset(token)
+
+@contextmanager
+def log_context(**fields):
+    """Contexto de log válido dentro do bloco with"""
+    token = bind_log_context(**fields)
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+_exception_formatter = logging.Formatter()
+
+class _ContextFilter(logging.Filter):
+    """Copia o contexto da tarefa para o registro (roda na thread de quem loga)"""
+
+    def filter(self, record):
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Deixa passar 1 a cada N registros DEBUG de um logger
+
+    INFO e acima nunca são amostrados. Registros descartados não chegam à
+    fila nem ao formatador; o total fica em logging.sampled_out.<logger>.
+    """
+
+    def __init__(self, name: str, rate: int):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._seen = itertools.count()
+        self.sampled_out = metrics.counter(f"logging.sampled_out.{name}")
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or next(self._seen) % self.rate == 0:
+            return True
+        self.sampled_out.inc()
+        return False
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha, com os campos de contexto presentes no registro"""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "src": f"{record.filename}:{record.lineno}",
+            "msg": record.getMessage()
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+class _Dispatcher(logging.Handler):
+    """Entrega cada registro aos handlers reais do logger que o emitiu (thread do listener)"""
+
+    def handle(self, record):
+        for handler in record.log_targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Com a fila cheia, put_nowait falharia; a thread está drenando, então espera a vaga
+        self.queue.put(self._sentinel)
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler com fila limitada e política de descarte
+
+    Acima da marca d'água da fila, registros DEBUG são descartados; com a
+    fila cheia, registros INFO ou mais graves esperam no máximo
+    block_timeout antes de serem descartados. Todo descarte é contado.
+    """
+
+    def __init__(self, pipeline, targets):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.targets = targets
+
+    def prepare(self, record):
+        # Resolve mensagem e traceback nesta thread (args podem mudar depois), mas
+        # mantém o traceback em exc_text para o formatador JSON separá-lo
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        record.log_targets = self.targets
+        return record
+
+    def emit(self, record):
+        pipeline = self.pipeline
+        if not pipeline.running:
+            # Sem listener (antes de iniciar ou após o desligamento): escrita direta
+            for handler in self.targets:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            return
+
+        if record.levelno <= logging.DEBUG and self.queue.qsize() >= pipeline.debug_watermark:
+            pipeline.drop(record)
+            return
+        try:
+            prepared = self.prepare(record)
+            if record.levelno <= logging.DEBUG:
+                self.queue.put_nowait(prepared)
+            else:
+                self.queue.put(prepared, timeout=pipeline.block_timeout)
+        except queue.Full:
+            pipeline.drop(record)
+        except Exception:
+            self.handleError(record)
+
+class LogPipeline:
+    """
+    Fila única entre os loggers do bot e uma thread de escrita
+
+    Os handlers de arquivo (com rotação) e console rodam na thread do
+    QueueListener; no loop de eventos, um log custa só formatar a mensagem
+    e colocá-la na fila.
+    """
+
+    def __init__(self, max_queue: int = 10000, debug_watermark: float = 0.8, block_timeout: float = 0.05,
+                 name: str = "logging"):
+        """
+        Args:
+            max_queue: Capacidade da fila de registros
+            debug_watermark: Fração da fila a partir da qual DEBUG é descartado
+            block_timeout: Espera máxima (segundos) de INFO+ com a fila cheia
+            name: Prefixo das métricas de descarte
+        """
+        self.queue: "queue.Queue" = queue.Queue(max_queue)
+        self.debug_watermark = int(max_queue * debug_watermark)
+        self.block_timeout = block_timeout
+        self.dropped = metrics.counter(f"{name}.dropped")
+        self.dropped_debug = metrics.counter(f"{name}.dropped.debug")
+        self._handlers = []
+        self._lock = threading.Lock()
+        self._listener = None
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None
+
+    def attach(self, logger, handlers):
+        """
+        Conecta um logger à fila
+
+        Args:
+            logger: Logger a conectar
+            handlers: Handlers reais (executados na thread de escrita)
+        """
+        self._handlers.extend(handlers)
+        logger.addHandler(BoundedQueueHandler(self, tuple(handlers)))
+
+    def start(self):
+        """Inicia a thread de escrita (idempotente)"""
+        with self._lock:
+            if self._listener is None:
+                self._listener = _Listener(self.queue, _Dispatcher())
+                self._listener.start()
+
+    def drop(self, record):
+        self.dropped.inc()
+        if record.levelno <= logging.DEBUG:
+            self.dropped_debug.inc()
+
+    def stop(self):
+        """
+        Escreve os registros restantes, para a thread e descarrega os handlers
+
+        Returns:
+            Tupla (handlers descarregados, registros descartados) para o
+            relatório de desligamento
+        """
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            # stop() enfileira a sentinela e espera a fila ser processada
+            listener.stop()
+
+        flushed = 0
+        for handler in self._handlers:
+            try:
+                handler.flush()
+                flushed += 1
+            except Exception:
+                pass
+        return flushed, self.dropped.value
+
+# Pipeline global usado por todos os loggers do bot
+log_pipeline = LogPipeline()
+
+TEXT_FORMAT = '%(asctime)s | %(levelname)-8s | %(name)s | %(filename)s:%(lineno)d | %(message)s'
+
+# Ajustes de logs.* do settings.yml; aplicados também a loggers criados depois
+_settings = {"format": "texto", "retention": 14, "sampling": {}}
+
+# Loggers criados por setup_logger e seus handlers de arquivo
+_file_handlers = {}
+
+def _file_formatter():
+    return JsonFormatter() if _settings["format"] == "json" else logging.Formatter(TEXT_FORMAT)
+
+def _apply_settings(logger, file_handler):
+    """Aplica formato, retenção e amostragem atuais a um logger configurado"""
+    if file_handler is not None:
+        file_handler.setFormatter(_file_formatter())
+        file_handler.backupCount = _settings["retention"]
+    for old in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+        logger.removeFilter(old)
+    rate = _settings["sampling"].get(logger.name, 1)
+    if rate > 1:
+        logger.addFilter(SamplingFilter(logger.name, rate))
+
+def configure_logging(config):
+    """
+    Aplica as opções logs.* do settings.yml (chamado no início e em cada recarga)
+
+    Args:
+        config: Instância de Config do bot
+    """
+    sampling = {}
+    for name, rate in (config.get("logs.amostragem", {}) or {}).items():
+        # Aceita o nome do componente ("events.message") ou o nome completo
+        full_name = name if name == "bot" or name.startswith("bot.") else f"bot.{name}"
+        sampling[full_name] = int(rate)
+    _settings.update(
+        format=str(config.get("logs.formato", "texto")).lower(),
+        retention=int(config.get("logs.retencao_dias", 14)),
+        sampling=sampling
+    )
+    for name, file_handler in _file_handlers.items():
+        _apply_settings(logging.getLogger(name), file_handler)
 
 def setup_logger(name, log_to_console=True, log_to_file=True):
     """
     Configura e retorna um logger personalizado com handlers para arquivo e console.
     
+    Os handlers rodam na thread de escrita do log_pipeline; o logger em si
+    recebe apenas um BoundedQueueHandler. O arquivo é rotacionado à
+    meia-noite ({name}.log, com cópias {name}.log.AAAA-MM-DD).
+    
     Args:
         name (str): Nome do logger
         log_to_console (bool): Indica se deve logar no console
@@ -19,8 +301,8 @@ def setup_logger(name, log_to_console=True, log_to_file=True):
     log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
     os.makedirs(log_dir, exist_ok=True)
     
-    # Nome do arquivo de log com data
-    log_file = os.path.join(log_dir, f"{name}_{datetime.now().strftime('%Y-%m-%d')}.log")
+    # Arquivo atual; a data entra no nome apenas das cópias rotacionadas
+    log_file = os.path.join(log_dir, f"{name}.log")
     
     # Configura o logger
     logger = logging.getLogger(name)
@@ -30,37 +312,50 @@ def setup_logger(name, log_to_console=True, log_to_file=True):
     if logger.handlers:
         return logger
     
-    # Formatos de log
-    file_formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)-8s | %(name)s | %(filename)s:%(lineno)d | %(message)s'
-    )
-    
+    # Formato de console (o de arquivo segue logs.formato)
     console_formatter = logging.Formatter(
         '%(asctime)s | %(levelname)-8s | %(message)s'
     )
     
-    # Handler para arquivo com rotação (máximo 5MB, até 5 backups)
+    handlers = []
+    file_handler = None
+    
+    # Handler para arquivo com rotação diária (logs.retencao_dias cópias)
     if log_to_file:
-        file_handler = RotatingFileHandler(
-            log_file, 
-            maxBytes=5_000_000,  # 5MB 
-            backupCount=5,
+        file_handler = TimedRotatingFileHandler(
+            log_file,
+            when='midnight',
+            backupCount=_settings["retention"],
             encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)  # Armazena todos os níveis no arquivo
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     
     # Handler para console
     if log_to_console:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)  # Só mostra INFO ou acima no console
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    # Contexto (servidor, usuário, comando) e amostragem rodam antes da fila
+    logger.addFilter(_ContextFilter())
+    # Componentes (bot.*) já têm fila e handlers próprios; propagar para 'bot'
+    # enfileiraria e escreveria cada registro duas vezes
+    logger.propagate = '.' not in name
+    _file_handlers[name] = file_handler
+    _apply_settings(logger, file_handler)
+    
+    log_pipeline.attach(logger, handlers)
+    log_pipeline.start()
     
     logger.info(f"Logger '{name}' configurado com sucesso")
     return logger
 
+def shutdown_logging():
+    """Esvazia a fila de logs e descarrega os arquivos (último hook do desligamento)"""
+    return log_pipeline.stop()
+
 # Instância padrão do logger para uso em todo o bot
 logger = setup_logger('bot')
 
@@ -0,0 +1,164 @@
+"""
+Métricas em memória do bot (contadores, medidores e histogramas).
+Leves o bastante para uso em caminhos quentes; expostas via snapshot().
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence
+
+# Limites padrão dos histogramas de latência (segundos)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0
+)
+
+class Counter:
+    """Contador monotônico"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+class Gauge:
+    """Valor instantâneo (ex: profundidade de fila)"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+class Histogram:
+    """Histograma de buckets fixos, com contagem, soma e máximo"""
+    __slots__ = ("bounds", "buckets", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)  # último = +inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Registra uma observação"""
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @contextmanager
+    def time(self):
+        """Mede o tempo de um bloco com perf_counter"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        Estima um percentil pelo limite superior do bucket
+
+        Args:
+            p: Percentil entre 0 e 100
+        """
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
+
+class MetricsRegistry:
+    """Registro de métricas nomeadas (criadas sob demanda)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Counter] = {}
+        self.gauges: Dict[str, Gauge] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        metric = self.counters.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.counters.setdefault(name, Counter())
+        return metric
+
+    def gauge(self, name: str) -> Gauge:
+        metric = self.gauges.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.gauges.setdefault(name, Gauge())
+        return metric
+
+    def histogram(self, name: str, bounds: Optional[Sequence[float]] = None) -> Histogram:
+        metric = self.histograms.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.histograms.setdefault(name, Histogram(bounds or LATENCY_BUCKETS))
+        return metric
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Dict[str, object]]:
+        """
+        Retorna uma cópia dos valores atuais
+
+        Args:
+            prefix: Filtra apenas métricas cujo nome começa com o prefixo
+        """
+        return {
+            "counters": {k: c.value for k, c in self.counters.items() if k.startswith(prefix)},
+            "gauges": {k: g.value for k, g in self.gauges.items() if k.startswith(prefix)},
+            "histograms": {k: h.snapshot() for k, h in self.histograms.items() if k.startswith(prefix)}
+        }
+
+class CallCounter:
+    """Contador mutável compartilhado via ContextVar (inclusive com asyncio.to_thread)"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+# Chamadas ao banco da invocação de comando em andamento
+current_db_calls: ContextVar[Optional[CallCounter]] = ContextVar("current_db_calls", default=None)
+
+def count_db_call():
+    """Incrementa o contador de chamadas ao banco da invocação em andamento"""
+    counter = current_db_calls.get()
+    if counter is not None:
+        counter.value += 1
+
+# Instância global para uso em todo o bot
+metrics = MetricsRegistry()
@@ -0,0 +1,742 @@
+"""
+Reprodução de música por servidor.
+Cada servidor tem um Player: uma máquina de estados em volta do cliente de
+voz do discord com sua TrackQueue. A resolução de URLs e a abertura do
+áudio ficam num nó (AudioNode), trocável por um nó local em testes.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+from .logger import get_logger
+from .metrics import metrics
+from .track_cache import TrackCache, track_cache, is_url, youtube_thumbnail
+from .track_queue import Track, TrackQueue
+
+try:
+    import yt_dlp
+except ImportError:  # dependência opcional: sem ela apenas arquivos locais tocam
+    yt_dlp = None
+
+# Áudio que o discord espera: PCM 16 bits, 48 kHz, estéreo, em quadros de 20 ms
+PCM_BYTES_PER_SECOND = 48000 * 2 * 2
+FRAME_BYTES = PCM_BYTES_PER_SECOND // 50
+
+class PCMFile(discord.PCMAudio):
+    """PCMAudio que fecha o arquivo ao ser descartado (o original não fecha)"""
+
+    def cleanup(self):
+        self.stream.close()
+
+class AudioNode:
+    """
+    Interface dos nós de áudio
+
+    resolve() transforma o pedido do usuário em faixas e open() devolve a
+    fonte de áudio pronta para o cliente de voz.
+    """
+
+    async def resolve(self, query: str, limit: int = 50) -> List[Track]:
+        """
+        Args:
+            query: URL, termo de busca ou caminho
+            limit: Máximo de faixas (playlists)
+
+        Returns:
+            Faixas encontradas (vazio se nada for encontrado)
+        """
+        raise NotImplementedError
+
+    async def open(self, track: Track) -> discord.AudioSource:
+        raise NotImplementedError
+
+class LocalNode(AudioNode):
+    """
+    Arquivos de uma pasta local
+
+    Arquivos .pcm (PCM cru no formato do discord) tocam sem FFmpeg; os
+    demais formatos passam pelo FFmpeg. Só caminhos dentro de root são
+    aceitos.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    def _path(self, query: str) -> Optional[str]:
+        path = os.path.realpath(os.path.join(self.root, query))
+        if os.path.commonpath([path, self.root]) != self.root or not os.path.isfile(path):
+            return None
+        return path
+
+    async def resolve(self, query: str, limit: int = 50) -> List[Track]:
+        path = self._path(query)
+        if path is None:
+            return []
+        duration = os.path.getsize(path) / PCM_BYTES_PER_SECOND if path.endswith(".pcm") else None
+        title = os.path.splitext(os.path.basename(path))[0]
+        return [Track(path, title, duration=duration, stream_url=path)]
+
+    async def open(self, track: Track) -> discord.AudioSource:
+        if track.stream_url.endswith(".pcm"):
+            return PCMFile(open(track.stream_url, "rb"))
+        return discord.FFmpegPCMAudio(track.stream_url)
+
+class FFmpegNode(AudioNode):
+    """
+    URLs e buscas resolvidas pelo yt-dlp e tocadas pelo FFmpeg
+
+    Playlists são listadas sem extrair cada vídeo; o endereço do áudio de
+    cada faixa (que expira) é obtido só ao abri-la. Os metadados passam
+    pelo TrackCache, então URLs repetidas não voltam ao extrator.
+    """
+
+    BEFORE_OPTIONS = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+    YDL_OPTIONS = {
+        "format": "bestaudio/best",
+        "quiet": True,
+        "no_warnings": True,
+        "noplaylist": False,
+        "extract_flat": "in_playlist",
+        "default_search": "ytsearch"
+    }
+
+    def __init__(self, local_root: Optional[str] = None, cache: Optional[TrackCache] = track_cache):
+        """
+        Args:
+            local_root: Pasta de arquivos locais aceitos além das URLs (None desativa)
+            cache: Cache de metadados (None resolve sempre no extrator)
+        """
+        self.local = LocalNode(local_root) if local_root else None
+        self.cache = cache
+        self.log = get_logger('music.node')
+
+    def _extract(self, query: str, limit: int) -> List[Track]:
+        options = dict(self.YDL_OPTIONS, playlistend=limit)
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(query, download=False)
+        entries = info.get("entries") if info else None
+        tracks = []
+        for entry in (entries if entries is not None else [info]):
+            if not entry:
+                continue
+            url = entry.get("webpage_url") or entry.get("url")
+            thumbnails = entry.get("thumbnails") or [{}]
+            tracks.append(Track(
+                url,
+                entry.get("title") or url,
+                duration=entry.get("duration"),
+                thumbnail=entry.get("thumbnail") or thumbnails[-1].get("url") or youtube_thumbnail(url),
+                # Em playlists (extract_flat) "url" é a página, não o áudio
+                stream_url=entry.get("url") if entries is None else None
+            ))
+        return tracks[:limit]
+
+    async def resolve(self, query: str, limit: int = 50) -> List[Track]:
+        if self.local is not None and not is_url(query):
+            tracks = await self.local.resolve(query, limit)
+            if tracks:
+                return tracks
+        if yt_dlp is None:
+            self.log.warning("yt-dlp não instalado: apenas arquivos locais podem ser tocados")
+            return []
+        if self.cache is None:
+            return await self._fetch(query, limit)
+        tracks = await self.cache.get(query, lambda: self._fetch(query, limit))
+        return tracks[:limit]
+
+    async def _fetch(self, query: str, limit: int) -> List[Track]:
+        try:
+            return await asyncio.to_thread(self._extract, query, limit)
+        except Exception as e:
+            self.log.warning(f"Falha ao resolver '{query}': {e}")
+            return []
+
+    async def open(self, track: Track) -> discord.AudioSource:
+        if self.local is not None and not is_url(track.url):
+            return await self.local.open(track)
+        stream_url = track.stream_url
+        if stream_url is None:
+            try:
+                resolved = await asyncio.to_thread(self._extract, track.url, 1)
+            except Exception as e:
+                self.log.warning(f"Falha ao extrair o áudio de '{track.url}': {e}")
+                resolved = []
+            if not resolved or not resolved[0].stream_url:
+                # Vídeo removido ou privado: os metadados em cache não valem mais
+                if self.cache is not None:
+                    await self.cache.invalidate(track.url)
+                raise RuntimeError(f"Áudio indisponível: {track.url}")
+            stream_url = resolved[0].stream_url
+        return discord.FFmpegPCMAudio(stream_url, before_options=self.BEFORE_OPTIONS, options="-vn")
+
+def _call_in_loop(loop: asyncio.AbstractEventLoop, callback, *args):
+    """Agenda callback no loop a partir da thread de áudio (ignorado se o loop já fechou)"""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
+
+class BufferedSource(discord.AudioSource):
+    """
+    Fonte de áudio com os primeiros quadros lidos antecipadamente
+
+    prefill() roda fora do loop enquanto a faixa anterior toca; ao começar,
+    read() entrega o buffer e depois continua lendo da fonte original. A
+    memória é limitada a max_frames quadros de 20 ms.
+    """
+
+    def __init__(self, source: discord.AudioSource, max_frames: int = 100):
+        self.source = source
+        self.max_frames = max_frames
+        # Chamado (na thread de áudio) com o instante do primeiro quadro entregue
+        self.on_first_read: Optional[Callable[[float], None]] = None
+        self._frames: "deque[bytes]" = deque()
+        # _lock protege o buffer e os estados e nunca é mantido durante uma
+        # leitura da fonte (que pode travar): assim cleanup() no loop não
+        # espera um stream parado. _source_lock serializa as leituras.
+        self._lock = threading.Lock()
+        self._source_lock = threading.Lock()
+        self._started = False
+        self._ended = False
+        self._closed = False
+
+    @property
+    def buffered(self) -> int:
+        """Quadros já lidos e ainda não entregues"""
+        return len(self._frames)
+
+    def prefill(self):
+        """Lê até max_frames quadros (bloqueante: executar com asyncio.to_thread)"""
+        with self._source_lock:
+            while True:
+                with self._lock:
+                    if self._started or self._closed or self._ended or len(self._frames) >= self.max_frames:
+                        return
+                frame = self.source.read()
+                with self._lock:
+                    if self._closed:
+                        return
+                    if not frame:
+                        self._ended = True
+                        return
+                    self._frames.append(frame)
+
+    def _pop(self) -> Optional[bytes]:
+        if self._frames:
+            return self._frames.popleft()
+        if self._ended or self._closed:
+            return b""
+        return None
+
+    def read(self) -> bytes:
+        with self._lock:
+            first = not self._started
+            self._started = True
+            frame = self._pop()
+        if frame is None:
+            with self._source_lock:
+                # O prefill em andamento pode ter guardado mais um quadro
+                with self._lock:
+                    frame = self._pop()
+                if frame is None:
+                    frame = self.source.read()
+        if first and self.on_first_read is not None:
+            self.on_first_read(time.perf_counter())
+        return frame
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._frames.clear()
+        self.source.cleanup()
+
+class PlayerState(Enum):
+    DISCONNECTED = "desconectado"
+    IDLE = "parado"
+    PLAYING = "tocando"
+    PAUSED = "pausado"
+
+# Transições válidas da máquina de estados (PLAYING -> PLAYING é a troca de faixa)
+_TRANSITIONS = {
+    PlayerState.DISCONNECTED: {PlayerState.IDLE},
+    PlayerState.IDLE: {PlayerState.PLAYING, PlayerState.DISCONNECTED},
+    PlayerState.PLAYING: {PlayerState.PLAYING, PlayerState.PAUSED, PlayerState.IDLE, PlayerState.DISCONNECTED},
+    PlayerState.PAUSED: {PlayerState.PLAYING, PlayerState.IDLE, PlayerState.DISCONNECTED}
+}
+
+class Player:
+    """
+    Reprodução de um servidor
+
+    O cliente de voz chama o callback de fim de faixa na thread de áudio;
+    ele é devolvido ao loop e só avança a fila se ainda se referir à faixa
+    atual (pular e parar invalidam callbacks pendentes).
+
+    Enquanto uma faixa toca, as próximas prefetch da fila são abertas
+    (resolvendo o áudio no nó) e têm seus primeiros quadros lidos em
+    BufferedSource; a troca de faixa só passa o buffer ao cliente de voz.
+    Memória por servidor: prefetch * buffer_frames quadros de 3840 bytes.
+    """
+
+    def __init__(self, guild_id: int, node: AudioNode, volume: float = 0.7,
+                 idle_timeout: Optional[float] = 300.0, max_queue: int = 500,
+                 on_change: Optional[Callable[[int], None]] = None,
+                 on_idle: Optional[Callable[[int], Awaitable]] = None,
+                 prefetch: int = 2, buffer_frames: int = 100):
+        """
+        Args:
+            guild_id: ID do servidor
+            node: Nó que resolve e abre as faixas
+            volume: Volume inicial (0.0 a 2.0)
+            idle_timeout: Segundos parado até desconectar (None desativa)
+            max_queue: Capacidade da fila
+            on_change: Chamado com o guild_id quando a faixa atual ou a fila mudam
+            on_idle: Chamado com o guild_id ao fim de idle_timeout no lugar de
+                disconnect() (o PlayerManager o usa para descartar o player)
+            prefetch: Próximas faixas abertas antecipadamente (0 desativa)
+            buffer_frames: Quadros de 20 ms lidos antecipadamente por faixa
+        """
+        self.guild_id = guild_id
+        self.node = node
+        self.volume = volume
+        self.idle_timeout = idle_timeout
+        self.on_change = on_change
+        self.on_idle = on_idle
+        self.prefetch = prefetch
+        self.buffer_frames = buffer_frames
+        self.queue = TrackQueue(max_queue)
+        self.current: Optional[Track] = None
+        self.voice = None
+        self.state = PlayerState.DISCONNECTED
+        self.log = get_logger('music.player')
+
+        self._lock = asyncio.Lock()
+        self._play_id = 0
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        # Faixas da fila sendo abertas/bufferizadas (chave: o próprio objeto Track)
+        self._prepared: Dict[Track, asyncio.Future] = {}
+        # Instante (perf_counter) em que a faixa anterior terminou ou foi pulada
+        self._transition_from: Optional[float] = None
+
+        self.started = metrics.counter("music.tracks.started")
+        self.failed = metrics.counter("music.tracks.failed")
+        self.prefetch_hits = metrics.counter("music.prefetch.hits")
+        self.prefetch_misses = metrics.counter("music.prefetch.misses")
+        # Do fim de uma faixa ao primeiro quadro da seguinte
+        self.transitions = metrics.histogram("music.transition")
+
+    #=================== ESTADO ===================
+
+    def _set_state(self, state: PlayerState) -> bool:
+        if state not in _TRANSITIONS[self.state]:
+            self.log.warning(f"Transição inválida {self.state.value} -> {state.value} no servidor {self.guild_id}")
+            return False
+        self.state = state
+        return True
+
+    @property
+    def connected(self) -> bool:
+        return self.voice is not None and self.voice.is_connected()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self.guild_id)
+
+    def _schedule_idle(self):
+        self._cancel_idle()
+        if self.idle_timeout:
+            loop = asyncio.get_running_loop()
+            self._idle_handle = loop.call_later(
+                self.idle_timeout, lambda: asyncio.ensure_future(self._expire())
+            )
+
+    async def _expire(self):
+        self._idle_handle = None
+        if self.on_idle is not None:
+            await self.on_idle(self.guild_id)
+        else:
+            await self.disconnect()
+
+    def _cancel_idle(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    #=================== CONEXÃO ===================
+
+    async def connect(self, channel):
+        """
+        Conecta (ou move) o bot para o canal de voz
+
+        Args:
+            channel: Canal de voz do discord
+        """
+        if self.connected:
+            if self.voice.channel != channel:
+                await self.voice.move_to(channel)
+            return self.voice
+        self.attach(await channel.connect())
+        return self.voice
+
+    def attach(self, voice):
+        """
+        Usa um cliente de voz já conectado
+
+        Args:
+            voice: discord.VoiceClient ou objeto com a mesma interface
+                (play, pause, resume, stop, is_connected, disconnect)
+        """
+        self.voice = voice
+        if self.state is PlayerState.DISCONNECTED:
+            self._set_state(PlayerState.IDLE)
+            self._schedule_idle()
+
+    async def disconnect(self):
+        """Para a reprodução, esvazia a fila e sai do canal de voz"""
+        self._play_id += 1
+        self._cancel_idle()
+        self.queue.clear()
+        self._prefetch()
+        self.current = None
+        self._transition_from = None
+        voice, self.voice = self.voice, None
+        if voice is not None:
+            try:
+                await voice.disconnect(force=True)
+            except Exception as e:
+                self.log.warning(f"Erro ao desconectar do servidor {self.guild_id}: {e}")
+        if self.state is not PlayerState.DISCONNECTED:
+            self._set_state(PlayerState.DISCONNECTED)
+        self._changed()
+
+    #=================== REPRODUÇÃO ===================
+
+    async def enqueue(self, track: Track) -> Optional[int]:
+        """
+        Adiciona uma faixa; começa a tocar se o player estiver parado
+
+        Returns:
+            0 se começou a tocar agora, a posição na fila, ou None se a fila
+            estiver cheia
+        """
+        position = self.queue.push(track)
+        if position is None:
+            return None
+        self._changed()
+        if self.state is PlayerState.IDLE and await self._play_next(only_if_idle=True) is track:
+            return 0
+        self._prefetch()
+        return position
+
+    async def _play_next(self, only_if_idle: bool = False) -> Optional[Track]:
+        """
+        Toca a próxima faixa da fila (ou fica parado se ela estiver vazia)
+
+        Args:
+            only_if_idle: Desiste se outra chamada já começou a tocar (enqueue)
+        """
+        async with self._lock:
+            if only_if_idle and self.state is not PlayerState.IDLE:
+                return None
+            self._play_id += 1
+            play_id = self._play_id
+            while True:
+                if not self.connected:
+                    self._prefetch()
+                    self.current = None
+                    if self.state is not PlayerState.DISCONNECTED:
+                        self._set_state(PlayerState.DISCONNECTED)
+                    self._changed()
+                    return None
+
+                track = self.queue.pop()
+                if track is None:
+                    self.current = None
+                    if self.state in (PlayerState.PLAYING, PlayerState.PAUSED):
+                        self._set_state(PlayerState.IDLE)
+                    self._schedule_idle()
+                    self._changed()
+                    return None
+
+                source = await self._take_prepared(track)
+                if source is None:
+                    continue
+
+                # Pular ou parar durante a abertura tornam esta faixa obsoleta
+                if play_id != self._play_id or not self.connected:
+                    source.cleanup()
+                    return None
+
+                if self._transition_from is not None:
+                    source.on_first_read = self._transition_observer(self._transition_from)
+                    self._transition_from = None
+
+                self.current = track
+                self.voice.play(
+                    discord.PCMVolumeTransformer(source, self.volume),
+                    after=self._after_callback(play_id)
+                )
+                self._set_state(PlayerState.PLAYING)
+                self._cancel_idle()
+                self.started.inc()
+                self._changed()
+                self._prefetch()
+                return track
+
+    #=================== PRÉ-CARREGAMENTO ===================
+
+    async def _prepare(self, track: Track) -> BufferedSource:
+        """Abre a faixa e lê os primeiros quadros em segundo plano"""
+        source = BufferedSource(await self.node.open(track), self.buffer_frames)
+        try:
+            await asyncio.to_thread(source.prefill)
+        except BaseException:
+            source.cleanup()
+            raise
+        return source
+
+    def _prefetch(self):
+        """Prepara as próximas faixas da fila e descarta as que saíram dela"""
+        targets = self.queue.peek(self.prefetch) if self.prefetch and self.connected else []
+        wanted = set(targets)
+        for track in [track for track in self._prepared if track not in wanted]:
+            self._discard(self._prepared.pop(track))
+        for track in targets:
+            if track not in self._prepared:
+                self._prepared[track] = asyncio.ensure_future(self._prepare(track))
+
+    @staticmethod
+    def _discard(future: asyncio.Future):
+        """Cancela uma preparação ou fecha a fonte já preparada"""
+        def close(done):
+            if not done.cancelled() and done.exception() is None:
+                done.result().cleanup()
+        if future.done():
+            close(future)
+        else:
+            future.cancel()
+            future.add_done_callback(close)
+
+    async def _take_prepared(self, track: Track) -> Optional[BufferedSource]:
+        """
+        Fonte da faixa: a preparada antecipadamente ou, sem ela, aberta agora
+
+        Returns:
+            A fonte, ou None se a faixa não pôde ser aberta
+        """
+        future = self._prepared.pop(track, None)
+        if future is not None:
+            try:
+                source = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                self._discard(future)
+                raise
+            except Exception:
+                # Falhou na preparação: tenta abrir de novo abaixo
+                source = None
+            if source is not None:
+                self.prefetch_hits.inc()
+                return source
+        self.prefetch_misses.inc()
+        try:
+            return BufferedSource(await self.node.open(track), self.buffer_frames)
+        except Exception as e:
+            self.failed.inc()
+            self.log.warning(f"Não foi possível abrir '{track.title}' no servidor {self.guild_id}: {e}")
+            return None
+
+    def _transition_observer(self, since: float):
+        loop = asyncio.get_running_loop()
+
+        def observe(started: float):
+            # Roda na thread de áudio do discord
+            _call_in_loop(loop, self.transitions.observe, started - since)
+        return observe
+
+    def _after_callback(self, play_id: int):
+        loop = asyncio.get_running_loop()
+
+        def after(error):
+            # Roda na thread de áudio do discord
+            _call_in_loop(loop, self._finished, play_id, error, time.perf_counter())
+        return after
+
+    def _finished(self, play_id: int, error, ended_at: float):
+        if error is not None:
+            self.failed.inc()
+            self.log.warning(f"Erro durante a reprodução no servidor {self.guild_id}: {error}")
+        if play_id == self._play_id:
+            self._transition_from = ended_at
+            asyncio.ensure_future(self._play_next())
+
+    def pause(self) -> bool:
+        """Pausa a faixa atual (False se nada estiver tocando)"""
+        if self.state is not PlayerState.PLAYING:
+            return False
+        self.voice.pause()
+        return self._set_state(PlayerState.PAUSED)
+
+    def resume(self) -> bool:
+        """Retoma a faixa pausada (False se não estiver pausado)"""
+        if self.state is not PlayerState.PAUSED:
+            return False
+        self.voice.resume()
+        return self._set_state(PlayerState.PLAYING)
+
+    async def skip(self, count: int = 1) -> Optional[Track]:
+        """
+        Pula a faixa atual (e mais count - 1 da fila)
+
+        Returns:
+            A faixa que começou a tocar, ou None se a fila acabou
+        """
+        if self.current is None:
+            return None
+        self._play_id += 1
+        self._transition_from = time.perf_counter()
+        self.queue.discard(count - 1)
+        self.voice.stop()
+        return await self._play_next()
+
+    def stop(self) -> int:
+        """
+        Para a reprodução e esvazia a fila (continua no canal de voz)
+
+        Returns:
+            Quantidade de faixas removidas da fila
+        """
+        self._play_id += 1
+        removed = self.queue.clear()
+        self._prefetch()
+        self.current = None
+        self._transition_from = None
+        if self.voice is not None:
+            self.voice.stop()
+        if self.state in (PlayerState.PLAYING, PlayerState.PAUSED):
+            self._set_state(PlayerState.IDLE)
+            self._schedule_idle()
+        self._changed()
+        return removed
+
+    def clear(self) -> int:
+        """Esvazia a fila sem interromper a faixa atual"""
+        removed = self.queue.clear()
+        self._prefetch()
+        self._changed()
+        return removed
+
+    def listing(self, offset: int, limit: int) -> List[Track]:
+        """Faixa atual (posição 0) seguida da fila, a partir de offset"""
+        if self.current is None:
+            return self.queue.page(offset, limit)
+        if offset == 0:
+            return [self.current] + self.queue.page(0, limit - 1)
+        return self.queue.page(offset - 1, limit)
+
+    def __len__(self) -> int:
+        return len(self.queue) + (self.current is not None)
+
+class PlayerManager:
+    """Players por servidor, criados sob demanda com as opções de recursos.musica"""
+
+    def __init__(self):
+        self.node: Optional[AudioNode] = None
+        self.volume = 0.7
+        self.idle_timeout: Optional[float] = 300.0
+        self.max_queue = 500
+        self.max_playlist = 50
+        self.prefetch = 2
+        self.buffer_frames = 100
+        self._players: Dict[int, Player] = {}
+        self._listeners: List[Callable[[int], None]] = []
+        self.active = metrics.gauge("music.players")
+
+    def configure(self, node: Optional[AudioNode] = None, volume: Optional[float] = None,
+                  idle_timeout: Optional[float] = None, max_queue: Optional[int] = None,
+                  max_playlist: Optional[int] = None, prefetch: Optional[int] = None,
+                  buffer_seconds: Optional[float] = None):
+        """
+        Ajusta as opções dos players criados a partir de agora
+
+        Args:
+            node: Nó de áudio (padrão: FFmpegNode)
+            volume: Volume inicial (0.0 a 2.0)
+            idle_timeout: Segundos parado até desconectar (0 desativa)
+            max_queue: Capacidade da fila de cada servidor
+            max_playlist: Máximo de faixas adicionadas por uma URL de playlist
+            prefetch: Próximas faixas abertas antecipadamente (0 desativa)
+            buffer_seconds: Áudio lido antecipadamente por faixa (segundos)
+        """
+        if node is not None:
+            self.node = node
+        if volume is not None:
+            self.volume = volume
+        if idle_timeout is not None:
+            self.idle_timeout = idle_timeout or None
+        if max_queue is not None:
+            self.max_queue = max_queue
+        if max_playlist is not None:
+            self.max_playlist = max_playlist
+        if prefetch is not None:
+            self.prefetch = prefetch
+        if buffer_seconds is not None:
+            self.buffer_frames = max(1, int(buffer_seconds * 50))
+        return self
+
+    def on_change(self, listener: Callable[[int], None]):
+        """Registra uma função chamada com o guild_id quando a fila de um servidor muda"""
+        self._listeners.append(listener)
+        return listener
+
+    def _notify(self, guild_id: int):
+        for listener in self._listeners:
+            listener(guild_id)
+
+    def get(self, guild_id: int) -> Optional[Player]:
+        """Player do servidor, se existir"""
+        return self._players.get(guild_id)
+
+    def get_or_create(self, guild_id: int) -> Player:
+        """Player do servidor, criado com as opções atuais se ainda não existir"""
+        player = self._players.get(guild_id)
+        if player is None:
+            if self.node is None:
+                self.node = FFmpegNode()
+            player = self._players[guild_id] = Player(
+                guild_id, self.node, volume=self.volume, idle_timeout=self.idle_timeout,
+                max_queue=self.max_queue, on_change=self._notify, on_idle=self.remove,
+                prefetch=self.prefetch, buffer_frames=self.buffer_frames
+            )
+            self.active.set(len(self._players))
+        return player
+
+    async def remove(self, guild_id: int):
+        """Desconecta e descarta o player do servidor"""
+        player = self._players.pop(guild_id, None)
+        self.active.set(len(self._players))
+        if player is not None:
+            await player.disconnect()
+
+    async def shutdown(self) -> int:
+        """Desconecta todos os players (hook de desligamento)"""
+        guild_ids = list(self._players)
+        await asyncio.gather(*(self.remove(guild_id) for guild_id in guild_ids), return_exceptions=True)
+        return len(guild_ids)
+
+    def __len__(self):
+        return len(self._players)
+
+# Instância global usada pelos comandos de música
+players = PlayerManager()
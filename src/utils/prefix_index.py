@@ -0,0 +1,152 @@
+"""
+Índices de prefixo em memória, por servidor, usados pelo autocomplete.
+Cada servidor guarda um array ordenado de (chave, rótulo, valor); a busca
+é uma bisseção seguida de uma varredura limitada, sem acesso ao banco.
+"""
+
+import asyncio
+import bisect
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import metrics
+
+# Entrada do índice: (rótulo normalizado, rótulo, valor)
+Entry = Tuple[str, str, Any]
+
+def _key(label: str) -> str:
+    return label.casefold()
+
+class PrefixIndex:
+    """
+    Índice de prefixos por servidor
+
+    As escritas (vindas da camada de banco ou de eventos) substituem o array
+    do servidor por uma cópia atualizada, então as leituras nunca precisam
+    de lock. Servidores são carregados sob demanda na primeira busca.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Nome do índice (usado nas métricas)
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._guilds: Dict[int, List[Entry]] = {}
+        self._loaded: set = set()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._latency = metrics.histogram(f"autocomplete.{name}.search")
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self._loaded
+
+    def add(self, guild_id: int, label: str, value: Any = None):
+        """
+        Adiciona uma entrada ao índice do servidor
+
+        Args:
+            guild_id: ID do servidor
+            label: Texto exibido e usado na busca
+            value: Valor enviado ao comando (padrão: o próprio rótulo)
+        """
+        entry = (_key(label), label, label if value is None else value)
+        with self._lock:
+            entries = list(self._guilds.get(guild_id, ()))
+            position = bisect.bisect_left(entries, entry[:2])
+            if position < len(entries) and entries[position] == entry:
+                return
+            entries.insert(position, entry)
+            self._guilds[guild_id] = entries
+
+    def remove(self, guild_id: int, label: str, value: Any = None):
+        """Remove uma entrada do índice do servidor, se existir"""
+        value = label if value is None else value
+        with self._lock:
+            entries = self._guilds.get(guild_id)
+            if not entries:
+                return
+            key = _key(label)
+            position = bisect.bisect_left(entries, (key, label))
+            while position < len(entries) and entries[position][0] == key:
+                if entries[position][1] == label and entries[position][2] == value:
+                    entries = entries[:position] + entries[position + 1:]
+                    self._guilds[guild_id] = entries
+                    return
+                position += 1
+
+    def load(self, guild_id: int, items: Iterable[Tuple[str, Any]]):
+        """
+        Carrega as entradas de um servidor
+
+        Entradas adicionadas enquanto a carga estava em andamento são mantidas.
+
+        Args:
+            guild_id: ID do servidor
+            items: Pares (rótulo, valor)
+        """
+        loaded = {(_key(label), label, value) for label, value in items}
+        with self._lock:
+            loaded.update(self._guilds.get(guild_id, ()))
+            self._guilds[guild_id] = sorted(loaded, key=lambda entry: entry[:2])
+            self._loaded.add(guild_id)
+        metrics.counter(f"autocomplete.{self.name}.loads").inc()
+
+    def forget(self, guild_id: int):
+        """Descarta o índice de um servidor (ex: o bot saiu dele)"""
+        with self._lock:
+            self._guilds.pop(guild_id, None)
+            self._loaded.discard(guild_id)
+
+    async def ensure(self, guild_id: int, fetch: Callable[[], Awaitable[Iterable[Tuple[str, Any]]]]):
+        """
+        Carrega o servidor uma única vez, mesmo com buscas simultâneas
+
+        Args:
+            guild_id: ID do servidor
+            fetch: Corrotina que retorna os pares (rótulo, valor) do servidor
+        """
+        if guild_id in self._loaded:
+            return
+        future = self._loading.get(guild_id)
+        if future is None:
+            future = self._loading[guild_id] = asyncio.ensure_future(fetch())
+            try:
+                self.load(guild_id, await future)
+            finally:
+                self._loading.pop(guild_id, None)
+        else:
+            await asyncio.shield(future)
+
+    def search(self, guild_id: int, prefix: str, limit: int = 25) -> List[Tuple[str, Any]]:
+        """
+        Busca entradas cujo rótulo começa com o prefixo (sem diferenciar maiúsculas)
+
+        Args:
+            guild_id: ID do servidor
+            prefix: Texto digitado pelo usuário
+            limit: Máximo de resultados
+
+        Returns:
+            Lista de pares (rótulo, valor) em ordem alfabética
+        """
+        with self._latency.time():
+            entries = self._guilds.get(guild_id)
+            if not entries:
+                return []
+            key = _key(prefix)
+            results = []
+            for position in range(bisect.bisect_left(entries, (key,)), len(entries)):
+                entry = entries[position]
+                if not entry[0].startswith(key) or len(results) == limit:
+                    break
+                results.append((entry[1], entry[2]))
+            return results
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._guilds.values())
+
+# Índices globais, mantidos em sincronia pela camada de banco e pelos eventos de membros
+custom_command_index = PrefixIndex("custom_commands")
+playlist_index = PrefixIndex("playlists")
+member_index = PrefixIndex("members")
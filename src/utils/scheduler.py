@@ -0,0 +1,275 @@
+"""
+Agendador persistente de ações temporizadas (tempban, lembretes).
+Os agendamentos ficam na coleção scheduled_jobs, indexada por status e
+horário, e sobrevivem a reinícios. Em memória fica apenas a próxima janela
+de agendamentos, num heap mínimo atendido por um único timer que executa
+os vencidos em lotes.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .database import db_manager
+from .logger import get_logger
+from .metrics import metrics
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+def _timestamp(run_at: datetime) -> float:
+    """Converte um datetime UTC ingênuo (padrão do banco) em timestamp"""
+    return run_at.replace(tzinfo=timezone.utc).timestamp()
+
+class Scheduler:
+    """Heap mínimo da próxima janela de agendamentos, carregado sob demanda do MongoDB"""
+
+    def __init__(self,
+                 window: float = 600.0,
+                 max_loaded: int = 1000,
+                 batch_size: int = 50,
+                 max_attempts: int = 3,
+                 retry_delay: float = 60.0):
+        """
+        Args:
+            window: Segundos à frente carregados do banco a cada recarga
+            max_loaded: Máximo de agendamentos mantidos em memória
+            batch_size: Máximo de agendamentos executados por lote
+            max_attempts: Tentativas antes de descartar um agendamento que falha
+            retry_delay: Segundos até a nova tentativa após uma falha
+        """
+        self.window = window
+        self.max_loaded = max_loaded
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.log = get_logger('scheduler')
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._jobs: Dict[Any, Dict[str, Any]] = {}
+        self._sequence = itertools.count()
+        # Até _horizon o heap tem todos os pendentes (ou, com max_loaded
+        # atingido, os primeiros deles; o restante vem quando o heap esvaziar)
+        self._horizon = 0.0
+        # Lote em execução e os cancelados durante ela (não são despachados)
+        self._running: set = set()
+        self._cancelled: set = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.executed = metrics.counter("scheduler.executed")
+        self.failed = metrics.counter("scheduler.failed")
+        self.lag = metrics.histogram("scheduler.lag")
+
+    def handler(self, kind: str):
+        """
+        Registra o handler de um tipo de agendamento (decorador)
+
+        O handler recebe o documento do agendamento (kind, guild_id, payload...).
+        """
+        def decorator(func: JobHandler):
+            self._handlers[kind] = func
+            return func
+        return decorator
+
+    def configure(self, **options):
+        """Atualiza os parâmetros (usado pelo BotClient a partir do settings.yml)"""
+        for name, value in options.items():
+            if value is not None and hasattr(self, name):
+                setattr(self, name, value)
+        return self
+
+    def start(self):
+        """Inicia o timer (idempotente; chamado quando o bot fica pronto)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Para o timer após o lote em execução (usado no desligamento)
+
+        Agendamentos ainda não executados continuam no banco.
+        """
+        if self._task is None:
+            return 0
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        return 0
+
+    async def schedule(self, kind: str, delay: float, guild_id: Optional[int] = None,
+                       payload: Optional[Dict[str, Any]] = None, key: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Agenda uma ação
+
+        Args:
+            kind: Tipo do agendamento (nome do handler)
+            delay: Segundos a partir de agora
+            guild_id: Servidor do agendamento
+            payload: Dados passados ao handler
+            key: Chave única por tipo e servidor (ex: ID do membro); um novo
+                agendamento com a mesma chave substitui o anterior
+
+        Returns:
+            O documento agendado
+        """
+        run_at = datetime.utcnow() + timedelta(seconds=delay)
+        job = await asyncio.to_thread(db_manager.schedule_job, kind, run_at, guild_id, payload, key)
+        self._load(job)
+        return job
+
+    async def cancel(self, kind: str, guild_id: Optional[int], key: Any) -> bool:
+        """
+        Cancela o agendamento de um tipo, servidor e chave
+
+        Returns:
+            True se havia um agendamento
+        """
+        job_id = await asyncio.to_thread(db_manager.cancel_job, kind, guild_id, key)
+        if job_id is None:
+            return False
+        # A entrada no heap fica órfã e é ignorada quando chegar ao topo
+        self._jobs.pop(job_id, None)
+        if job_id in self._running:
+            self._cancelled.add(job_id)
+        return True
+
+    def _load(self, job: Dict[str, Any]):
+        """Coloca um agendamento no heap se ele cair na janela carregada"""
+        due = _timestamp(job["run_at"])
+        if due > self._horizon:
+            # Substituído para fora da janela: será carregado numa próxima recarga
+            self._jobs.pop(job["_id"], None)
+            return
+        job["_due"] = due
+        self._jobs[job["_id"]] = job
+        heapq.heappush(self._heap, (due, next(self._sequence), job["_id"]))
+        if self._wake is not None and self._heap[0][2] == job["_id"]:
+            self._wake.set()
+
+    async def _refill(self):
+        """Carrega do banco os agendamentos pendentes da próxima janela"""
+        now = time.time()
+        until = now + self.window
+        jobs = await asyncio.to_thread(
+            db_manager.get_due_jobs, datetime.utcfromtimestamp(until), self.max_loaded
+        )
+        # Com o limite atingido, a janela termina no último agendamento carregado
+        # (nunca no passado: num acúmulo de vencidos isso recarregaria a cada volta)
+        if len(jobs) >= self.max_loaded:
+            self._horizon = max(now, _timestamp(jobs[-1]["run_at"]))
+        else:
+            self._horizon = until
+        for job in jobs:
+            if job["_id"] not in self._jobs:
+                self._load(job)
+
+    def _pop_due(self, now: float) -> List[Dict[str, Any]]:
+        """Retira do heap até batch_size agendamentos vencidos"""
+        batch = []
+        while self._heap and self._heap[0][0] <= now and len(batch) < self.batch_size:
+            due, _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            # Entradas de agendamentos cancelados ou substituídos são ignoradas
+            if job is None or job["_due"] != due:
+                continue
+            del self._jobs[job_id]
+            batch.append(job)
+        return batch
+
+    async def _run(self):
+        try:
+            recovered = await asyncio.to_thread(db_manager.recover_jobs)
+            if recovered:
+                self.log.info(f"{recovered} agendamentos interrompidos voltaram para a fila")
+        except Exception as e:
+            self.log.error(f"Erro ao recuperar agendamentos: {e}")
+
+        while not self._stopping:
+            try:
+                # Só recarrega quando o heap não tem mais nada até o horizonte
+                if time.time() >= self._horizon and (not self._heap or self._heap[0][0] > self._horizon):
+                    await self._refill()
+
+                batch = self._pop_due(time.time())
+                if batch:
+                    await self._execute(batch)
+                    continue
+
+                wake_at = min(self._heap[0][0], self._horizon) if self._heap else self._horizon
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), max(0.0, wake_at - time.time()))
+                except asyncio.TimeoutError:
+                    pass
+            except Exception as e:
+                self.log.error(f"Erro no agendador: {e}")
+                await asyncio.sleep(5)
+
+    async def _execute(self, batch: List[Dict[str, Any]]):
+        """Executa um lote de agendamentos vencidos, com uma ida ao banco por etapa"""
+        ids = [job["_id"] for job in batch]
+        self._running = set(ids)
+        try:
+            claimed = set(await asyncio.to_thread(db_manager.claim_jobs, ids))
+            # Os demais foram cancelados ou já pertencem a outra instância
+            batch = [job for job in batch if job["_id"] in claimed]
+            if batch:
+                await self._dispatch(batch)
+        finally:
+            self._running = set()
+            self._cancelled.clear()
+
+    async def _dispatch(self, batch: List[Dict[str, Any]]):
+        """Executa os agendamentos reivindicados e registra os resultados no banco"""
+        now = time.time()
+        for job in batch:
+            job["attempts"] = job.get("attempts", 0) + 1
+            self.lag.observe(max(0.0, now - job["_due"]))
+        results = await asyncio.gather(*(self._call(job) for job in batch))
+
+        done = [job["_id"] for job, ok in zip(batch, results) if ok]
+        for job, ok in zip(batch, results):
+            if ok or job["_id"] in self._cancelled:
+                continue
+            if job["attempts"] < self.max_attempts:
+                job["run_at"] = datetime.utcnow() + timedelta(seconds=self.retry_delay)
+                await asyncio.to_thread(db_manager.retry_job, job["_id"], job["run_at"])
+                self._load(job)
+            else:
+                self.log.error(f"Agendamento {job['kind']} ({job['_id']}) descartado após {self.max_attempts} tentativas")
+                done.append(job["_id"])
+        await asyncio.to_thread(db_manager.complete_jobs, done)
+
+    async def _call(self, job: Dict[str, Any]) -> bool:
+        if job["_id"] in self._cancelled:
+            return True
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            self.log.warning(f"Nenhum handler para agendamentos do tipo '{job['kind']}'")
+            self.failed.inc()
+            return False
+        try:
+            await handler(job)
+            self.executed.inc()
+            return True
+        except Exception as e:
+            self.failed.inc()
+            self.log.error(f"Erro ao executar agendamento {job['kind']} ({job['_id']}): {e}")
+            return False
+
+    @property
+    def pending(self) -> int:
+        """Agendamentos carregados em memória"""
+        return len(self._jobs)
+
+# Instância global; handlers são registrados pelos módulos de comando
+scheduler = Scheduler()
@@ -0,0 +1,134 @@
+"""
+Templates de mensagens compilados ({user}, {server}, {count}, ...).
+Cada template é analisado uma única vez e renderizado por uma única
+formatação %, em vez de chamadas encadeadas de str.replace.
+"""
+
+from collections import OrderedDict
+from operator import attrgetter
+from string import Formatter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Placeholders suportados e o atributo do membro de onde vêm
+PLACEHOLDER_ATTRS: Dict[str, str] = {
+    "user": "mention",
+    "user_name": "name",
+    "user_display": "display_name",
+    "user_id": "id",
+    "user_avatar": "display_avatar.url",
+    "server": "guild.name",
+    "server_id": "guild.id",
+    "count": "guild.member_count",
+}
+PLACEHOLDERS: Dict[str, Callable[[Any], Any]] = {
+    name: attrgetter(path) for name, path in PLACEHOLDER_ATTRS.items()
+}
+
+class CompiledTemplate:
+    """
+    Template pré-analisado em partes literais e placeholders
+
+    A renderização usa uma string de formato % com os literais já
+    escapados. Quando todos os placeholders vêm do membro, um único
+    attrgetter (em C) busca todos os valores de uma vez.
+    """
+    __slots__ = ("source", "parts", "fields", "_format", "_order", "_getter")
+
+    def __init__(self, source: str):
+        self.source = source
+        # Tuplas (literal, nome do placeholder ou None)
+        self.parts: Tuple[Tuple[str, Optional[str]], ...] = self._parse(source)
+        self.fields = frozenset(name for _, name in self.parts if name)
+
+        self._format = "".join(
+            literal.replace("%", "%%") + ("%s" if field else "")
+            for literal, field in self.parts
+        )
+        self._order = tuple(field for _, field in self.parts if field)
+        self._getter = None
+        if self._order and all(field in PLACEHOLDERS for field in self._order):
+            paths = [PLACEHOLDER_ATTRS[field] for field in self._order]
+            if len(paths) > 1:
+                self._getter = attrgetter(*paths)
+            else:
+                # attrgetter de um só atributo devolve o valor, não uma tupla
+                single = attrgetter(paths[0])
+                self._getter = lambda member: (single(member),)
+
+    @staticmethod
+    def _parse(source: str):
+        parts = []
+        try:
+            for literal, field, spec, conversion in Formatter().parse(source):
+                if field is not None and (spec or conversion or not field.isidentifier()):
+                    # Formatações não suportadas ficam como texto literal
+                    literal += "{" + field + ("!" + conversion if conversion else "") + (":" + spec if spec else "") + "}"
+                    field = None
+                parts.append((literal, field))
+        except ValueError:
+            # Chaves desbalanceadas: trata o template inteiro como texto
+            parts = [(source, None)]
+        return tuple(parts)
+
+    def render(self, member=None, **values) -> str:
+        """
+        Renderiza o template
+
+        Args:
+            member: Membro do Discord usado para preencher os placeholders padrão
+            **values: Valores extras ou que sobrescrevem os padrões (ex: level=5)
+
+        Returns:
+            O texto final; placeholders desconhecidos são mantidos como estão
+        """
+        if not values and member is not None and self._getter is not None:
+            return self._format % self._getter(member)
+
+        args = []
+        for field in self._order:
+            if field in values:
+                args.append(values[field])
+            elif member is not None and field in PLACEHOLDERS:
+                args.append(PLACEHOLDERS[field](member))
+            else:
+                args.append("{" + field + "}")
+        return self._format % tuple(args)
+
+class TemplateCache:
+    """Cache LRU de templates compilados por servidor"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._cache: "OrderedDict[Tuple[Any, str], CompiledTemplate]" = OrderedDict()
+
+    def get(self, guild_id, source: str) -> CompiledTemplate:
+        """
+        Retorna o template compilado do servidor, compilando se necessário
+
+        A chave inclui o texto do template, então uma alteração na
+        configuração do servidor gera uma nova compilação automaticamente.
+        """
+        key = (guild_id, source)
+        template = self._cache.get(key)
+        if template is None:
+            template = self._cache[key] = CompiledTemplate(source)
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return template
+
+    def invalidate(self, guild_id):
+        """Remove todos os templates de um servidor"""
+        for key in [k for k in self._cache if k[0] == guild_id]:
+            del self._cache[key]
+
+    def __len__(self):
+        return len(self._cache)
+
+def compile_template(source: str) -> CompiledTemplate:
+    """Compila um template avulso (sem cache)"""
+    return CompiledTemplate(source)
+
+# Instância global do cache
+templates = TemplateCache()
@@ -0,0 +1,318 @@
+"""
+Cache de metadados de faixas (título, duração, miniatura).
+Chaveado pela URL normalizada: variações da mesma URL (youtu.be, m.,
+parâmetros de rastreamento) resolvem uma única vez. Duas camadas: LRU com
+TTL em memória e um arquivo SQLite que sobrevive a reinícios. Consultas
+simultâneas pela mesma chave compartilham uma única resolução.
+
+O endereço do áudio (que expira) não é guardado; o nó o obtém ao abrir a
+faixa.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .logger import get_logger
+from .metrics import metrics
+from .track_queue import Track
+
+# Parâmetros que não mudam o conteúdo (rastreamento, posição inicial)
+_IGNORED_PARAMS = {"si", "feature", "pp", "t", "start", "index", "ab_channel", "fbclid", "gclid"}
+
+_YOUTUBE_HOSTS = {"youtube.com", "music.youtube.com", "youtube-nocookie.com"}
+
+def is_url(query: str) -> bool:
+    """Se a consulta é uma URL http(s)"""
+    return urlsplit(query).scheme in ("http", "https")
+
+def _host(parts) -> str:
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+def youtube_id(url: str) -> Optional[str]:
+    """ID do vídeo de uma URL do YouTube (None se não for um vídeo do YouTube)"""
+    if not is_url(url):
+        return None
+    parts = urlsplit(url)
+    host = _host(parts)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if host == "youtu.be":
+        return segments[0] if segments else None
+    if host in _YOUTUBE_HOSTS:
+        if segments[:1] == ["watch"]:
+            return dict(parse_qsl(parts.query)).get("v")
+        if len(segments) >= 2 and segments[0] in ("shorts", "embed", "live", "v"):
+            return segments[1]
+    return None
+
+def youtube_thumbnail(url: str) -> Optional[str]:
+    """Miniatura padrão de um vídeo do YouTube a partir da URL"""
+    video_id = youtube_id(url)
+    return f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" if video_id else None
+
+def normalize_url(query: str) -> str:
+    """
+    Chave de cache de uma consulta
+
+    URLs perdem esquema, www./m., fragmento, barra final e parâmetros de
+    rastreamento; os demais parâmetros são ordenados. Vídeos e playlists
+    do YouTube viram youtube:<id> e youtube:list:<id>. Buscas são
+    normalizadas por espaços e caixa.
+
+    Args:
+        query: URL ou termo de busca informado pelo usuário
+    """
+    query = query.strip()
+    if not is_url(query):
+        return "search:" + " ".join(query.lower().split())
+
+    parts = urlsplit(query)
+    host = _host(parts)
+    params = parse_qsl(parts.query)
+    if host in _YOUTUBE_HOSTS or host == "youtu.be":
+        playlist = dict(params).get("list")
+        # watch?v=...&list=... resolve a playlist inteira
+        if playlist:
+            return f"youtube:list:{playlist}"
+        video_id = youtube_id(query)
+        if video_id:
+            return f"youtube:{video_id}"
+
+    kept = sorted(
+        (key, value) for key, value in params
+        if key not in _IGNORED_PARAMS and not key.startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return f"{host}{path}" + (f"?{urlencode(kept)}" if kept else "")
+
+def _dump(tracks: List[Track]) -> str:
+    return json.dumps([[track.url, track.title, track.duration, track.thumbnail] for track in tracks])
+
+def _load(data: str) -> List[Track]:
+    return [Track(url, title, duration=duration, thumbnail=thumbnail)
+            for url, title, duration, thumbnail in json.loads(data)]
+
+class TrackCache:
+    """
+    Metadados de faixas em duas camadas (memória e SQLite)
+
+    As faixas devolvidas são compartilhadas entre quem consulta; quem for
+    modificá-las deve copiar (Track.for_requester).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2000, ttl: float = 3600.0,
+                 disk_ttl: float = 7 * 86400.0, disk_max_entries: int = 50000):
+        """
+        Args:
+            path: Arquivo SQLite (None mantém só a camada em memória)
+            max_entries: Consultas mantidas em memória
+            ttl: Validade (segundos) na memória
+            disk_ttl: Validade (segundos) no arquivo
+            disk_max_entries: Consultas mantidas no arquivo (as mais antigas saem)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self.disk_max_entries = disk_max_entries
+        self.log = get_logger('music.cache')
+
+        self._memory: "OrderedDict[str, Tuple[float, List[Track]]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = metrics.counter("track_cache.hits.memory")
+        self.disk_hits = metrics.counter("track_cache.hits.disk")
+        self.misses = metrics.counter("track_cache.misses")
+        self.coalesced = metrics.counter("track_cache.coalesced")
+        if path:
+            self.open(path)
+
+    def configure(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                  ttl: Optional[float] = None, disk_ttl: Optional[float] = None,
+                  disk_max_entries: Optional[int] = None):
+        """Ajusta limites e (re)abre o arquivo SQLite"""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if ttl is not None:
+            self.ttl = ttl
+        if disk_ttl is not None:
+            self.disk_ttl = disk_ttl
+        if disk_max_entries is not None:
+            self.disk_max_entries = disk_max_entries
+        if path:
+            self.open(path)
+        return self
+
+    #=================== ARQUIVO ===================
+
+    def open(self, path: str):
+        """Abre (ou cria) o arquivo SQLite e remove entradas vencidas"""
+        self.close()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        try:
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tracks ("
+                "key TEXT PRIMARY KEY, tracks TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tracks_fetched_at ON tracks (fetched_at)")
+            self._db = db
+            self._prune()
+        except sqlite3.Error as e:
+            self._db = None
+            self.log.error(f"Não foi possível abrir o cache de faixas em {path}: {e}")
+
+    def close(self):
+        """Fecha o arquivo SQLite (hook de desligamento)"""
+        with self._db_lock:
+            db, self._db = self._db, None
+            if db is not None:
+                db.close()
+
+    # Erros do arquivo (bloqueado, corrompido, disco cheio) não falham a
+    # consulta: são registrados e a camada em memória continua servindo
+
+    def _prune(self):
+        """Remove entradas vencidas e as mais antigas acima do limite"""
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute("DELETE FROM tracks WHERE fetched_at < ?", (time.time() - self.disk_ttl,))
+                self._db.execute(
+                    "DELETE FROM tracks WHERE key IN ("
+                    "SELECT key FROM tracks ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,)
+                )
+            except sqlite3.Error as e:
+                self.log.warning(f"Falha ao limpar o cache de faixas: {e}")
+
+    def _read(self, key: str) -> Optional[List[Track]]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT tracks FROM tracks WHERE key = ? AND fetched_at >= ?",
+                    (key, time.time() - self.disk_ttl)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.log.warning(f"Falha ao ler o cache de faixas: {e}")
+                return None
+        try:
+            return _load(row[0]) if row else None
+        except (ValueError, TypeError) as e:
+            # Linha ilegível: tratada como ausente e resolvida de novo
+            self.log.warning(f"Entrada inválida no cache de faixas ({key}): {e}")
+            return None
+
+    def _write(self, key: str, tracks: List[Track]):
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tracks (key, tracks, fetched_at) VALUES (?, ?, ?)",
+                    (key, _dump(tracks), time.time())
+                )
+            except sqlite3.Error as e:
+                self.log.warning(f"Falha ao gravar no cache de faixas: {e}")
+                return
+            self._writes += 1
+            prune = self._writes % 500 == 0
+        if prune:
+            self._prune()
+
+    #=================== CONSULTA ===================
+
+    def peek(self, query: str) -> Optional[List[Track]]:
+        """Faixas em memória para a consulta, sem resolver (None se ausente ou vencida)"""
+        entry = self._memory.get(normalize_url(query))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _remember(self, key: str, tracks: List[Track]):
+        self._memory[key] = (time.monotonic() + self.ttl, tracks)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, query: str, fetch: Callable[[], Awaitable[List[Track]]]) -> List[Track]:
+        """
+        Retorna as faixas da consulta, resolvendo-a uma única vez
+
+        Args:
+            query: URL ou termo de busca
+            fetch: Corrotina que resolve a consulta no extrator (executada
+                apenas quando nenhuma camada tem a chave)
+        """
+        key = normalize_url(query)
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            self._memory.move_to_end(key)
+            self.hits.inc()
+            return entry[1]
+
+        future = self._loading.get(key)
+        if future is not None:
+            self.coalesced.inc()
+            return await asyncio.shield(future)
+
+        future = self._loading[key] = asyncio.ensure_future(self._resolve(key, fetch))
+        # Sai de _loading quando termina, não quando quem a iniciou desiste:
+        # quem chegar depois de um cancelamento ainda compartilha a resolução
+        future.add_done_callback(lambda done: self._loading.get(key) is done and self._loading.pop(key))
+        # Cancelar quem iniciou a resolução não a cancela para os demais
+        return await asyncio.shield(future)
+
+    async def _resolve(self, key: str, fetch) -> List[Track]:
+        tracks = await asyncio.to_thread(self._read, key)
+        if tracks is not None:
+            self.disk_hits.inc()
+            self._remember(key, tracks)
+            return tracks
+
+        self.misses.inc()
+        tracks = await fetch()
+        # Falhas e buscas vazias não são guardadas (podem ser temporárias)
+        if tracks:
+            stored = [Track(track.url, track.title, track.duration, track.thumbnail) for track in tracks]
+            self._remember(key, stored)
+            await asyncio.to_thread(self._write, key, stored)
+        return tracks
+
+    def _delete(self, key: str):
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute("DELETE FROM tracks WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                self.log.warning(f"Falha ao remover do cache de faixas: {e}")
+
+    async def invalidate(self, query: str):
+        """Descarta a consulta das duas camadas"""
+        key = normalize_url(query)
+        self._memory.pop(key, None)
+        await asyncio.to_thread(self._delete, key)
+
+    def __len__(self):
+        return len(self._memory)
+
+# Instância global usada pelo FFmpegNode
+track_cache = TrackCache()
@@ -0,0 +1,147 @@
+"""
+Fila de reprodução de música por servidor.
+Baseada em deque: inserir no fim, tirar do início e pular são O(1) e uma
+página da fila copia apenas os itens exibidos.
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+class Track:
+    """Uma faixa resolvida, pronta para ser aberta pelo nó de áudio"""
+    __slots__ = ("url", "title", "duration", "thumbnail", "stream_url", "requester_id")
+
+    def __init__(self, url: str, title: str, duration: Optional[float] = None,
+                 thumbnail: Optional[str] = None, stream_url: Optional[str] = None,
+                 requester_id: Optional[int] = None):
+        """
+        Args:
+            url: Endereço informado pelo usuário (ou caminho do arquivo local)
+            title: Título exibido
+            duration: Duração em segundos (None se desconhecida, ex: ao vivo)
+            thumbnail: URL da miniatura
+            stream_url: Endereço do áudio passado ao FFmpeg (None: obtido ao abrir)
+            requester_id: ID do usuário que pediu a faixa
+        """
+        self.url = url
+        self.title = title
+        self.duration = duration
+        self.thumbnail = thumbnail
+        self.stream_url = stream_url
+        self.requester_id = requester_id
+
+    def for_requester(self, requester_id: Optional[int]) -> "Track":
+        """Cópia da faixa atribuída a outro usuário (faixas resolvidas são compartilhadas)"""
+        return Track(self.url, self.title, self.duration, self.thumbnail, self.stream_url, requester_id)
+
+    @property
+    def length(self) -> str:
+        """Duração formatada (m:ss ou h:mm:ss)"""
+        if self.duration is None:
+            return "ao vivo"
+        minutes, seconds = divmod(int(self.duration), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+    def __repr__(self):
+        return f"Track({self.title!r}, {self.url!r})"
+
+class TrackQueue:
+    """
+    Fila de faixas de um servidor com capacidade máxima
+
+    push/pop/discard(1) são O(1); page(offset, k) copia só os k itens (o
+    deslocamento é percorrido pelo islice, em C).
+    """
+
+    def __init__(self, max_size: int = 500):
+        """
+        Args:
+            max_size: Máximo de faixas na fila (além da que está tocando)
+        """
+        self.max_size = max_size
+        self._items: "deque[Track]" = deque()
+
+    def push(self, track: Track) -> Optional[int]:
+        """
+        Adiciona uma faixa ao fim da fila
+
+        Returns:
+            Posição da faixa (1 = próxima) ou None se a fila estiver cheia
+        """
+        if len(self._items) >= self.max_size:
+            return None
+        self._items.append(track)
+        return len(self._items)
+
+    def extend(self, tracks: Iterable[Track]) -> int:
+        """
+        Adiciona várias faixas até a capacidade
+
+        Returns:
+            Quantidade de faixas adicionadas
+        """
+        added = 0
+        for track in tracks:
+            if self.push(track) is None:
+                break
+            added += 1
+        return added
+
+    def pop(self) -> Optional[Track]:
+        """Retira a próxima faixa (None se a fila estiver vazia)"""
+        return self._items.popleft() if self._items else None
+
+    def discard(self, count: int = 1) -> int:
+        """
+        Descarta as próximas count faixas (usado ao pular várias de uma vez)
+
+        Returns:
+            Quantidade de faixas descartadas
+        """
+        count = min(max(count, 0), len(self._items))
+        for _ in range(count):
+            self._items.popleft()
+        return count
+
+    def remove(self, position: int) -> Optional[Track]:
+        """
+        Remove a faixa de uma posição (1 = próxima)
+
+        Returns:
+            A faixa removida ou None se a posição não existir
+        """
+        if not 1 <= position <= len(self._items):
+            return None
+        track = self._items[position - 1]
+        del self._items[position - 1]
+        return track
+
+    def peek(self, count: int = 1) -> List[Track]:
+        """Próximas count faixas, sem retirá-las"""
+        return list(islice(self._items, count))
+
+    def page(self, offset: int, limit: int) -> List[Track]:
+        """Faixas das posições offset + 1 até offset + limit"""
+        return list(islice(self._items, offset, offset + limit))
+
+    def clear(self) -> int:
+        """Esvazia a fila e retorna quantas faixas foram removidas"""
+        removed = len(self._items)
+        self._items.clear()
+        return removed
+
+    @property
+    def duration(self) -> float:
+        """Soma das durações conhecidas (segundos)"""
+        return sum(track.duration or 0 for track in self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Track]:
+        return iter(self._items)
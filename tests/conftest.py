@@ -0,0 +1,22 @@
+"""
+Configuração comum dos testes.
+Os pacotes src.* são registrados sem executar seus __init__ (src.utils
+conecta ao MongoDB ao ser importado), de modo que os testes importam
+direto os módulos de que precisam, sem banco.
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _bare_package(name: str):
+    if name in sys.modules:
+        return
+    package = types.ModuleType(name)
+    package.__path__ = [os.path.join(ROOT, *name.split("."))]
+    sys.modules[name] = package
+
+for _name in ("src", "src.utils", "src.base", "src.events", "src.bot"):
+    _bare_package(_name)
@@ -0,0 +1,57 @@
+"""
+Invocação de comandos criados pelo CommandBuilder: conversores rodam dentro
+da cadeia de middlewares.
+"""
+
+import asyncio
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("discord")
+
+# src.utils.database conecta ao MongoDB ao ser importado (o autocomplete só o usa nas buscas)
+with mock.patch.dict(sys.modules, {"src.utils.database": types.SimpleNamespace(db_manager=None)}):
+    from src.base.command import CommandBuilder
+    from src.utils.metrics import metrics
+
+class FakeTree:
+    def __init__(self):
+        self.commands = []
+
+    def add_command(self, command, guild=None):
+        self.commands.append(command)
+
+def interaction():
+    return types.SimpleNamespace(guild_id=1, user=types.SimpleNamespace(id=2), channel_id=3, response=object())
+
+def build(name, callback, options):
+    builder = CommandBuilder(types.SimpleNamespace(tree=FakeTree()))
+    builder.create_command(name=name, callback=callback, options=options)
+    return builder.bot.tree.commands[0]
+
+def test_converter_runs_before_callback():
+    received = []
+
+    async def callback(interaction, quantidade):
+        received.append(quantidade)
+
+    command = build("converte", callback, {"quantidade": {"type": int, "converter": lambda value: value * 2}})
+    asyncio.run(command.callback(interaction(), quantidade=4))
+    assert received == [8]
+    assert metrics.counter("commands.converte.calls").value == 1
+
+def test_converter_errors_go_through_instrument():
+    async def callback(interaction, valor):
+        raise AssertionError("não deveria rodar")
+
+    def invalid(value):
+        raise ValueError("valor inválido")
+
+    command = build("invalido", callback, {"valor": {"type": str, "converter": invalid}})
+    with pytest.raises(ValueError):
+        asyncio.run(command.callback(interaction(), valor="x"))
+    assert metrics.counter("commands.invalido.calls").value == 1
+    assert metrics.counter("commands.invalido.errors").value == 1
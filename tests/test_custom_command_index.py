@@ -0,0 +1,81 @@
+"""
+Índice de autocomplete dos comandos personalizados mantido pela camada de
+banco: nomes e aliases entram, saem e acompanham renomeações.
+"""
+
+import os
+import types
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("dotenv")
+
+with mock.patch.dict(os.environ, {"MONGO_URL": "mongodb://localhost:27017"}), \
+     mock.patch("pymongo.MongoClient", mock.MagicMock()):
+    from src.utils.database import DatabaseManager
+    from src.utils.prefix_index import custom_command_index
+
+GUILD = 990001
+
+class MemoryCommands:
+    """custom_commands em memória (apenas o usado por estes métodos)"""
+
+    def __init__(self):
+        self.documents = []
+
+    def _find(self, condition):
+        for document in self.documents:
+            if all(document.get(key) == value for key, value in condition.items()):
+                return document
+        return None
+
+    def insert_one(self, document):
+        self.documents.append(dict(document))
+
+    def find(self, condition, projection=None):
+        return [dict(d) for d in self.documents if d["guild_id"] == condition["guild_id"]]
+
+    def find_one_and_delete(self, condition, projection=None):
+        document = self._find(condition)
+        if document is not None:
+            self.documents.remove(document)
+        return document
+
+    def find_one_and_update(self, condition, update, projection=None):
+        document = self._find(condition)
+        if document is None:
+            return None
+        previous = dict(document)
+        document.update(update["$set"])
+        return previous
+
+@pytest.fixture
+def manager():
+    manager = object.__new__(DatabaseManager)
+    manager.db = types.SimpleNamespace(custom_commands=MemoryCommands())
+    custom_command_index.forget(GUILD)
+    yield manager
+    custom_command_index.forget(GUILD)
+
+def search(prefix=""):
+    return custom_command_index.search(GUILD, prefix)
+
+def test_create_indexes_name_and_aliases(manager):
+    assert manager.create_custom_command(GUILD, "Regras", "leia", 1, aliases=["Rules", "r"])
+    assert search() == [("r", "regras"), ("regras", "regras"), ("rules", "regras")]
+    assert manager.get_custom_command_names(GUILD) == [("regras", "regras"), ("rules", "regras"), ("r", "regras")]
+
+def test_delete_removes_aliases(manager):
+    manager.create_custom_command(GUILD, "regras", "leia", 1, aliases=["rules"])
+    manager.create_custom_command(GUILD, "ping", "pong", 1)
+    assert manager.delete_custom_command(GUILD, "REGRAS")
+    assert search() == [("ping", "ping")]
+    assert not manager.delete_custom_command(GUILD, "regras")
+
+def test_rename_moves_aliases_to_new_name(manager):
+    manager.create_custom_command(GUILD, "regras", "leia", 1, aliases=["rules"])
+    assert manager.rename_custom_command(GUILD, "regras", "normas")
+    assert search() == [("normas", "normas"), ("rules", "normas")]
+    assert not manager.rename_custom_command(GUILD, "regras", "outro")
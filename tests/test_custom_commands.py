@@ -0,0 +1,73 @@
+"""
+Casamento de comandos personalizados contra o índice compilado do servidor.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.utils.custom_commands import DEFAULT_PREFIX, CustomCommandMatcher, compile_guild
+
+DOCUMENTS = [
+    {"name": "regras", "response": "{user}, leia as regras", "aliases": ["rules", "r"]},
+    {"name": "diga", "response": "{user_name} diz: {args}"},
+    {"name": "r", "response": "comando r"}
+]
+
+def message(content):
+    author = SimpleNamespace(mention="<@1>", name="ana")
+    return SimpleNamespace(content=content, author=author, channel=SimpleNamespace(mention="<#2>"))
+
+def test_matches_name_and_aliases_case_insensitively():
+    guild = compile_guild("?", DOCUMENTS)
+    for content in ("?regras", "?RULES agora", "?Regras"):
+        command, end = guild.match(content)
+        assert command.name == "regras"
+    assert guild.match("?regras")[1] == len("?regras")
+
+def test_name_wins_over_alias_of_another_command():
+    guild = compile_guild("?", DOCUMENTS)
+    assert guild.match("?r")[0].name == "r"
+
+def test_no_match():
+    guild = compile_guild("?", DOCUMENTS)
+    assert guild.match("regras") is None
+    assert guild.match("?") is None
+    assert guild.match("?regrasx") is None
+    # Token maior que qualquer nome cadastrado nem é consultado
+    assert guild.match("?" + "x" * 500) is None
+    assert compile_guild(None, []).match("!regras") is None
+
+def test_default_prefix_and_render():
+    guild = compile_guild(None, DOCUMENTS)
+    assert guild.prefix == DEFAULT_PREFIX
+    content = "!diga olá a todos"
+    command, end = guild.match(content)
+    assert command.render(message(content), content[end:].strip()) == "ana diz: olá a todos"
+    command, _ = guild.match("!rules")
+    assert command.render(message("!rules")) == "<@1>, leia as regras"
+
+def test_matcher_loads_once_and_drops_stale_loads():
+    matcher = CustomCommandMatcher()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "!", DOCUMENTS
+
+    async def run():
+        guilds = await asyncio.gather(*(matcher.get(1, fetch) for _ in range(3)))
+        assert guilds[0] is guilds[1] is guilds[2]
+        assert len(calls) == 1
+
+        matcher.invalidate(1)
+        loading = asyncio.ensure_future(matcher.get(1, fetch))
+        await asyncio.sleep(0)
+        # Invalidado durante a carga: o resultado não fica em cache
+        matcher.invalidate(1)
+        await loading
+        assert len(matcher) == 0
+        await matcher.get(1, fetch)
+        assert len(matcher) == 1 and len(calls) == 3
+
+    asyncio.run(run())
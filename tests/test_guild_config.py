@@ -0,0 +1,94 @@
+"""
+Configuração em camadas: padrões → settings.yml → documento do servidor.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.guild_config import GuildConfigResolver
+
+SETTINGS = {
+    "token": "segredo",
+    "prefix": "?",
+    "recursos": {"niveis": {"xp_por_mensagem": 5}}
+}
+
+@pytest.fixture
+def resolver():
+    resolver = GuildConfigResolver(max_guilds=2)
+    resolver.set_global(SETTINGS)
+    return resolver
+
+def test_layers_override_in_order(resolver):
+    view = resolver.build(1, {
+        "guild_id": 1,
+        "prefix": "$",
+        "welcome_burst_threshold": 9,
+        "config": {"recursos.niveis.cooldown": 30}
+    })
+    assert view["prefix"] == "$"
+    assert view["recursos.niveis.xp_por_mensagem"] == 5
+    assert view["recursos.niveis.cooldown"] == 30
+    assert view["recursos.niveis.habilitado"] is True
+    assert view["recursos.boas_vindas.rajada.limite"] == 9
+    assert view.tree["recursos"]["niveis"]["cooldown"] == 30
+    assert "guild_id" not in view
+
+def test_global_layer_skips_per_guild_and_secret_keys(resolver):
+    assert resolver.default["prefix"] == "!"
+    assert "token" not in resolver.default
+    assert resolver.default.get("log_channel_id", 0) == 0
+
+def test_views_are_read_only(resolver):
+    view = resolver.build(1, None)
+    with pytest.raises(TypeError):
+        view.tree["prefix"] = "x"
+    with pytest.raises(TypeError):
+        view.flat["prefix"] = "x"
+
+def test_get_caches_with_lru_and_invalidates(resolver):
+    documents = {1: {"prefix": "a"}, 2: {"prefix": "b"}, 3: {"prefix": "c"}}
+    calls = []
+
+    def fetcher(guild_id):
+        async def fetch():
+            calls.append(guild_id)
+            return dict(documents[guild_id])
+        return fetch
+
+    async def run():
+        assert (await resolver.get(1, fetcher(1)))["prefix"] == "a"
+        await resolver.get(1, fetcher(1))
+        await resolver.get(2, fetcher(2))
+        await resolver.get(1, fetcher(1))
+        await resolver.get(3, fetcher(3))
+        # 2 era o menos usado recentemente
+        assert resolver.peek(2) is None and resolver.peek(1) is not None
+        assert calls == [1, 2, 3]
+
+        documents[1]["prefix"] = "z"
+        resolver.invalidate(1)
+        assert (await resolver.get(1, fetcher(1)))["prefix"] == "z"
+
+        # Invalidação vinda de outra thread é aplicada no loop
+        thread = threading.Thread(target=resolver.invalidate, args=(1,))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        assert resolver.peek(1) is None
+
+    asyncio.run(run())
+
+def test_set_global_rebuilds_views(resolver):
+    async def fetch():
+        return {}
+
+    async def run():
+        view = await resolver.get(1, fetch)
+        assert view["recursos.niveis.xp_por_mensagem"] == 5
+        resolver.set_global({"recursos": {"niveis": {"xp_por_mensagem": 8}}})
+        assert (await resolver.get(1, fetch))["recursos.niveis.xp_por_mensagem"] == 8
+
+    asyncio.run(run())
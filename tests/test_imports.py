@@ -0,0 +1,55 @@
+"""
+Teste de fumaça: todos os módulos do bot importam.
+O MongoClient é substituído para que a importação de src.utils (que
+conecta ao banco) não precise de um servidor.
+"""
+
+import importlib
+import os
+import pkgutil
+import sys
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("pymongo")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _modules(package):
+    path = os.path.join(ROOT, *package.split("."))
+    yield package
+    for info in pkgutil.iter_modules([path]):
+        yield f"{package}.{info.name}"
+
+def _src_modules():
+    return {name: module for name, module in sys.modules.items() if name == "src" or name.startswith("src.")}
+
+@pytest.fixture(scope="module", autouse=True)
+def fake_mongo():
+    # O conftest registra os pacotes src.* sem __init__; aqui eles são
+    # importados de verdade e os anteriores voltam ao final
+    saved = _src_modules()
+    for name in saved:
+        del sys.modules[name]
+    try:
+        with mock.patch.dict(os.environ, {"MONGO_URL": "mongodb://localhost:27017"}), \
+             mock.patch("pymongo.MongoClient", mock.MagicMock()):
+            yield
+    finally:
+        for name in _src_modules():
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+@pytest.mark.parametrize("module", [
+    *_modules("src.utils"),
+    *_modules("src.base"),
+    *_modules("src.events"),
+    *_modules("src.commands"),
+    "src.bot.config",
+    "src.bot.shutdown",
+    "src.bot.client"
+])
+def test_import(module):
+    importlib.import_module(module)
@@ -0,0 +1,100 @@
+"""
+Fontes de páginas: deslocamento em sequências e keyset no MongoDB (com uma
+coleção em memória que entende $gt/$lt, sort e limit).
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+
+from src.base.paginator import mongo_source, sequence_source
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, field, direction):
+        self.documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    @staticmethod
+    def _matches(document, condition):
+        for key, expected in condition.items():
+            value = document.get(key)
+            if isinstance(expected, dict):
+                if "$gt" in expected and not value > expected["$gt"]:
+                    return False
+                if "$lt" in expected and not value < expected["$lt"]:
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    def find(self, condition, projection=None):
+        self.queries.append(condition)
+        return FakeCursor([dict(d) for d in self.documents if self._matches(d, condition)])
+
+    def count_documents(self, condition):
+        return sum(1 for d in self.documents if self._matches(d, condition))
+
+def fetch(source, cursor, page_size=3, key="1"):
+    return asyncio.run(source(key, cursor, page_size))
+
+@pytest.fixture
+def collection():
+    # Dois servidores intercalados; só o 1 é listado
+    return FakeCollection([{"_id": n, "guild_id": n % 2} for n in range(20)])
+
+def ids(page):
+    return [document["_id"] for document in page.items]
+
+def test_keyset_forward_and_back(collection):
+    source = mongo_source(collection, lambda key: {"guild_id": int(key)}, parse=int, count=True)
+    first = fetch(source, None)
+    assert ids(first) == [1, 3, 5]
+    assert first.prev_cursor is None and first.total == 10
+
+    second = fetch(source, first.next_cursor)
+    assert ids(second) == [7, 9, 11]
+    # Sem skip: a segunda página parte do último _id visto
+    assert collection.queries[-1] == {"guild_id": 1, "_id": {"$gt": 5}}
+
+    back = fetch(source, second.prev_cursor)
+    assert ids(back) == ids(first)
+    assert back.prev_cursor is None
+    assert back.next_cursor == first.next_cursor
+
+def test_keyset_walks_to_the_end(collection):
+    source = mongo_source(collection, lambda key: {"guild_id": int(key)}, parse=int)
+    seen, cursor = [], None
+    while True:
+        page = fetch(source, cursor, page_size=4)
+        seen += ids(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == list(range(1, 20, 2))
+    assert page.total is None
+
+def test_sequence_source_clamps_to_last_page():
+    source = sequence_source(lambda key: list(range(10)))
+    page = fetch(source, "3")
+    assert page.items == [3, 4, 5]
+    assert page.prev_cursor == "" and page.next_cursor == "6"
+    # Cursor além do fim: última página, alinhada ao tamanho
+    last = fetch(source, "50")
+    assert last.items == [9] and last.offset == 9 and last.next_cursor is None
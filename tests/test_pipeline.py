@@ -0,0 +1,79 @@
+"""
+Políticas de transbordo do GuildEventPipeline.
+Um único worker fica preso num evento "portão" para que a fila do servidor
+encha de forma determinística.
+"""
+
+import asyncio
+
+from src.events.pipeline import BLOCK, DROP_OLDEST, GuildEventPipeline
+
+async def gated(max_queue_size=2, **options):
+    """Pipeline com o worker ocupado até gate ser liberado"""
+    pipeline = GuildEventPipeline(workers=1, max_queue_size=max_queue_size, **options)
+    pipeline.start()
+    gate = asyncio.Event()
+    handled = []
+
+    async def hold():
+        await gate.wait()
+
+    async def record(name):
+        handled.append(name)
+
+    assert await pipeline.submit(1, "message", hold)
+    await asyncio.sleep(0)
+    return pipeline, gate, handled, record
+
+def test_drop_newest_rejects_when_full():
+    async def run():
+        pipeline, gate, handled, record = await gated()
+        assert await pipeline.submit(1, "message", record, "a")
+        assert await pipeline.submit(1, "message", record, "b")
+        assert not await pipeline.submit(1, "message", record, "c")
+        # Outro servidor tem sua própria fila
+        assert await pipeline.submit(2, "message", record, "x")
+        gate.set()
+        await pipeline.drain()
+        assert sorted(handled) == ["a", "b", "x"]
+    asyncio.run(run())
+
+def test_drop_oldest_evicts_only_droppable_events():
+    async def run():
+        pipeline, gate, handled, record = await gated(policies={"message": DROP_OLDEST})
+        assert await pipeline.submit(1, "member_join", record, "join")
+        assert await pipeline.submit(1, "message", record, "old")
+        assert await pipeline.submit(1, "message", record, "new")
+        gate.set()
+        await pipeline.drain()
+        assert handled == ["join", "new"]
+    asyncio.run(run())
+
+def test_block_waits_for_space_and_keeps_order():
+    async def run():
+        pipeline, gate, handled, record = await gated()
+        assert pipeline.policies["member_join"] == BLOCK
+        for name in ("a", "b"):
+            assert await pipeline.submit(1, "member_join", record, name)
+        blocked = asyncio.ensure_future(pipeline.submit(1, "member_join", record, "c"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        gate.set()
+        assert await blocked
+        await pipeline.drain()
+        assert handled == ["a", "b", "c"]
+    asyncio.run(run())
+
+def test_drain_rejects_blocked_submits():
+    async def run():
+        pipeline, gate, handled, record = await gated(max_queue_size=1)
+        assert await pipeline.submit(1, "member_join", record, "a")
+        blocked = asyncio.ensure_future(pipeline.submit(1, "member_join", record, "b"))
+        await asyncio.sleep(0.01)
+        drain = asyncio.ensure_future(pipeline.drain())
+        assert not await blocked
+        gate.set()
+        assert await drain == (1, 0)
+        assert handled == ["a"]
+        assert not await pipeline.submit(1, "message", record, "late")
+    asyncio.run(run())
@@ -0,0 +1,192 @@
+"""
+Máquina de estados do Player com arquivos PCM locais (LocalNode) e um
+cliente de voz substituto controlado pelo teste.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("discord")
+
+from src.utils.player import FRAME_BYTES, BufferedSource, LocalNode, Player, PlayerManager, PlayerState
+
+class StandInVoice:
+    """Cliente de voz substituto: a faixa só termina quando o teste manda"""
+
+    def __init__(self):
+        self.channel = None
+        self.played = []
+        self.disconnected = False
+        self._source = None
+        self._after = None
+
+    def is_connected(self):
+        return not self.disconnected
+
+    def play(self, source, after=None):
+        self.played.append(source)
+        self._source, self._after = source, after
+
+    def finish(self):
+        """Consome a fonte até o fim e chama o callback, como o AudioPlayer do discord"""
+        source, after, self._source, self._after = self._source, self._after, None, None
+        while source.read():
+            pass
+        source.cleanup()
+        after(None)
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def stop(self):
+        # O discord também chama o callback de fim ao parar a faixa
+        if self._after is not None:
+            source, after, self._source, self._after = self._source, self._after, None, None
+            source.cleanup()
+            after(None)
+
+    async def disconnect(self, force=False):
+        self.stop()
+        self.disconnected = True
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condição não atingida a tempo"
+        await asyncio.sleep(0.005)
+
+async def settle():
+    """Deixa callbacks e tarefas pendentes rodarem"""
+    for _ in range(10):
+        await asyncio.sleep(0.005)
+
+@pytest.fixture
+def node(tmp_path):
+    for n in range(4):
+        (tmp_path / f"track{n}.pcm").write_bytes(b"\x00" * FRAME_BYTES * 5)
+    return LocalNode(str(tmp_path))
+
+async def tracks(node, count):
+    return [(await node.resolve(f"track{n}.pcm"))[0] for n in range(count)]
+
+async def playing(node, count, **options):
+    player = Player(1, node, idle_timeout=None, **options)
+    voice = StandInVoice()
+    player.attach(voice)
+    queued = await tracks(node, count)
+    positions = [await player.enqueue(track) for track in queued]
+    return player, voice, queued, positions
+
+def test_enqueue_starts_first_and_queues_rest(node):
+    async def run():
+        player, voice, queued, positions = await playing(node, 3)
+        assert positions == [0, 1, 2]
+        assert player.state is PlayerState.PLAYING
+        assert player.current is queued[0]
+        assert len(voice.played) == 1
+        assert player.listing(0, 10) == queued
+        await player.disconnect()
+    asyncio.run(run())
+
+def test_full_queue_rejects(node):
+    async def run():
+        player, _, _, positions = await playing(node, 3, max_queue=1)
+        assert positions == [0, 1, None]
+        await player.disconnect()
+    asyncio.run(run())
+
+def test_natural_advance_until_idle(node):
+    async def run():
+        player, voice, queued, _ = await playing(node, 2)
+        voice.finish()
+        await wait_until(lambda: player.current is queued[1])
+        assert player.state is PlayerState.PLAYING
+        voice.finish()
+        await wait_until(lambda: player.state is PlayerState.IDLE)
+        assert player.current is None
+        assert len(voice.played) == 2
+        await player.disconnect()
+    asyncio.run(run())
+
+def test_skip_plays_next_once(node):
+    async def run():
+        player, voice, queued, _ = await playing(node, 3)
+        assert await player.skip() is queued[1]
+        await settle()
+        # O callback da faixa pulada não avança a fila de novo
+        assert player.current is queued[1]
+        assert len(player.queue) == 1
+        assert await player.skip(2) is None
+        assert player.state is PlayerState.IDLE
+        await player.disconnect()
+    asyncio.run(run())
+
+def test_stop_clears_queue_and_stays_connected(node):
+    async def run():
+        player, voice, _, _ = await playing(node, 3)
+        assert player.stop() == 2
+        await settle()
+        assert player.state is PlayerState.IDLE
+        assert player.current is None
+        assert len(voice.played) == 1
+        assert not voice.disconnected
+        await player.disconnect()
+        assert player.state is PlayerState.DISCONNECTED
+        assert voice.disconnected
+    asyncio.run(run())
+
+def test_idle_disconnect_removes_player(node):
+    async def run():
+        manager = PlayerManager().configure(node=node, idle_timeout=0.02)
+        player = manager.get_or_create(7)
+        voice = StandInVoice()
+        player.attach(voice)
+        assert manager.active.value == 1
+        await wait_until(lambda: len(manager) == 0)
+        await settle()
+        assert voice.disconnected
+        assert player.state is PlayerState.DISCONNECTED
+        assert manager.get(7) is None
+        assert manager.active.value == 0
+    asyncio.run(run())
+
+class StalledSource:
+    """Fonte cuja leitura trava até o teste liberar"""
+
+    def __init__(self):
+        self.reading = threading.Event()
+        self.release = threading.Event()
+        self.closed = False
+
+    def read(self):
+        self.reading.set()
+        self.release.wait(5)
+        return b"\x00" * FRAME_BYTES
+
+    def is_opus(self):
+        return False
+
+    def cleanup(self):
+        self.closed = True
+
+def test_cleanup_does_not_wait_for_stalled_prefill():
+    stalled = StalledSource()
+    source = BufferedSource(stalled, max_frames=10)
+    thread = threading.Thread(target=source.prefill)
+    thread.start()
+    assert stalled.reading.wait(1)
+    started = time.perf_counter()
+    source.cleanup()
+    assert time.perf_counter() - started < 0.5
+    assert stalled.closed
+    stalled.release.set()
+    thread.join(1)
+    # O quadro lido depois do fechamento é descartado
+    assert source.buffered == 0
+    assert source.read() == b""
@@ -0,0 +1,61 @@
+"""
+Índice de prefixos: busca, cópia na escrita e carga única por servidor.
+"""
+
+import asyncio
+
+from src.utils.prefix_index import PrefixIndex
+
+def test_search_is_case_insensitive_sorted_and_limited():
+    index = PrefixIndex("test")
+    for label in ("banana", "Bolo", "bala", "abacaxi", "BALDE"):
+        index.add(1, label)
+    assert index.search(1, "ba") == [("bala", "bala"), ("BALDE", "BALDE"), ("banana", "banana")]
+    assert index.search(1, "BA", limit=1) == [("bala", "bala")]
+    assert index.search(1, "z") == []
+    assert index.search(2, "b") == []
+
+def test_writes_replace_the_array_readers_hold():
+    index = PrefixIndex("test")
+    index.add(1, "alpha")
+    snapshot = index._guilds[1]
+    index.add(1, "beta")
+    index.remove(1, "alpha")
+    # Quem estava lendo a lista antiga continua vendo um estado consistente
+    assert snapshot == [("alpha", "alpha", "alpha")]
+    assert index.search(1, "") == [("beta", "beta")]
+
+def test_add_is_idempotent_and_remove_matches_value():
+    index = PrefixIndex("test")
+    index.add(1, "rules", "regras")
+    index.add(1, "rules", "regras")
+    index.add(1, "rules", "outra")
+    assert len(index) == 2
+    index.remove(1, "rules", "outra")
+    assert index.search(1, "ru") == [("rules", "regras")]
+
+def test_load_keeps_entries_added_meanwhile():
+    index = PrefixIndex("test")
+    index.add(1, "novo")
+    index.load(1, [("antigo", "antigo")])
+    assert index.is_loaded(1)
+    assert [label for label, _ in index.search(1, "")] == ["antigo", "novo"]
+    index.forget(1)
+    assert not index.is_loaded(1) and len(index) == 0
+
+def test_ensure_fetches_once_for_concurrent_searches():
+    index = PrefixIndex("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [("ping", "ping")]
+
+    async def run():
+        await asyncio.gather(*(index.ensure(1, fetch) for _ in range(5)))
+        await index.ensure(1, fetch)
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert index.search(1, "p") == [("ping", "ping")]
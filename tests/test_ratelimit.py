@@ -0,0 +1,61 @@
+"""
+Token bucket dos cooldowns de comandos (tempo passado explicitamente).
+"""
+
+import pytest
+
+pytest.importorskip("discord")
+
+from src.base.ratelimit import CommandLimits, ConcurrencyLimit, Cooldown
+
+def test_burst_then_refill():
+    cooldown = Cooldown(rate=2, per=10.0)
+    assert cooldown.acquire("u", now=100.0) == 0.0
+    assert cooldown.acquire("u", now=100.0) == 0.0
+    assert cooldown.acquire("u", now=100.0) == pytest.approx(5.0)
+    # Meio intervalo devolve um token
+    assert cooldown.retry_after("u", now=105.0) == 0.0
+    assert cooldown.acquire("u", now=105.0) == 0.0
+    assert cooldown.acquire("u", now=106.0) == pytest.approx(4.0)
+
+def test_keys_are_independent():
+    cooldown = Cooldown(rate=1, per=5.0)
+    assert cooldown.acquire("a", now=0.0) == 0.0
+    assert cooldown.acquire("b", now=0.0) == 0.0
+    assert cooldown.acquire("a", now=1.0) == pytest.approx(4.0)
+
+def test_retry_after_does_not_consume():
+    cooldown = Cooldown(rate=1, per=5.0)
+    for _ in range(3):
+        assert cooldown.retry_after("u", now=0.0) == 0.0
+    assert cooldown.acquire("u", now=0.0) == 0.0
+
+def test_full_buckets_are_swept():
+    cooldown = Cooldown(rate=1, per=1.0)
+    cooldown._last_sweep = 0.0
+    cooldown.acquire("a", now=0.1)
+    cooldown.acquire("b", now=0.9)
+    assert len(cooldown) == 2
+    # Em 1.5 o bucket de "a" já estaria cheio; o de "b" ainda não
+    cooldown.retry_after("c", now=1.5)
+    assert len(cooldown) == 1
+
+def test_invalid_scope():
+    with pytest.raises(ValueError):
+        Cooldown(rate=1, per=1.0, scope="planet")
+
+def test_concurrency_limit():
+    limit = ConcurrencyLimit(limit=1)
+    assert limit.acquire(None)
+    assert not limit.acquire(None)
+    limit.release(None)
+    assert limit.acquire(None)
+
+def test_build_from_options():
+    assert CommandLimits.build() is None
+    limits = CommandLimits.build(
+        cooldown=[{"rate": 1, "per": 3}, {"rate": 5, "per": 60, "scope": "guild"}],
+        max_concurrency={"limit": 2}
+    )
+    assert [(c.rate, c.per, c.scope) for c in limits.cooldowns] == [(1, 3, "user"), (5, 60, "guild")]
+    assert limits.concurrency.limit == 2
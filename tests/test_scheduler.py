@@ -0,0 +1,187 @@
+"""
+Heap, janela (horizonte) e cancelamento do Scheduler.
+A coleção scheduled_jobs é substituída por um armazenamento em memória com
+os mesmos métodos do DatabaseManager usados pelo agendador.
+"""
+
+import asyncio
+import itertools
+import sys
+import time
+import types
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+# src.utils.database conecta ao MongoDB ao ser importado
+with mock.patch.dict(sys.modules, {"src.utils.database": types.SimpleNamespace(db_manager=None)}):
+    from src.utils import scheduler as scheduler_module
+    from src.utils.scheduler import Scheduler
+
+class MemoryJobs:
+    """scheduled_jobs em memória"""
+
+    def __init__(self):
+        self.documents = {}
+        self.ids = itertools.count(1)
+        self.refills = 0
+        # IDs que "outra instância" já reivindicou
+        self.foreign = set()
+
+    def schedule_job(self, kind, run_at, guild_id=None, payload=None, key=None):
+        if key is not None:
+            for job_id, job in list(self.documents.items()):
+                if (job["kind"], job["guild_id"], job.get("key")) == (kind, guild_id, str(key)):
+                    del self.documents[job_id]
+        job = {"_id": next(self.ids), "kind": kind, "run_at": run_at, "guild_id": guild_id,
+               "payload": payload or {}, "status": "pending", "attempts": 0}
+        if key is not None:
+            job["key"] = str(key)
+        self.documents[job["_id"]] = job
+        return dict(job)
+
+    def get_due_jobs(self, until, limit):
+        self.refills += 1
+        due = sorted((job for job in self.documents.values()
+                      if job["status"] == "pending" and job["run_at"] <= until),
+                     key=lambda job: job["run_at"])
+        return [dict(job) for job in due[:limit]]
+
+    def claim_jobs(self, job_ids):
+        claimed = []
+        for job_id in job_ids:
+            job = self.documents.get(job_id)
+            if job is not None and job["status"] == "pending" and job_id not in self.foreign:
+                job["status"] = "running"
+                claimed.append(job_id)
+        return claimed
+
+    def complete_jobs(self, job_ids):
+        for job_id in job_ids:
+            if self.documents.get(job_id, {}).get("status") == "running":
+                del self.documents[job_id]
+
+    def retry_job(self, job_id, run_at):
+        job = self.documents.get(job_id)
+        if job is not None and job["status"] == "running":
+            job.update(status="pending", run_at=run_at)
+
+    def cancel_job(self, kind, guild_id, key):
+        for job_id, job in list(self.documents.items()):
+            if (job["kind"], job["guild_id"], job.get("key")) == (kind, guild_id, str(key)):
+                del self.documents[job_id]
+                return job_id
+        return None
+
+    def recover_jobs(self):
+        return 0
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = MemoryJobs()
+    monkeypatch.setattr(scheduler_module, "db_manager", jobs)
+    return jobs
+
+def recording(scheduler):
+    ran = []
+
+    @scheduler.handler("lembrete")
+    async def remind(job):
+        ran.append(job["payload"]["n"])
+    return ran
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condição não atingida a tempo"
+        await asyncio.sleep(0.005)
+
+def test_runs_in_due_order(jobs):
+    scheduler = Scheduler(window=60)
+    ran = recording(scheduler)
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        for n, delay in enumerate((0.06, 0.02, 0.04)):
+            await scheduler.schedule("lembrete", delay, payload={"n": n})
+        await wait_until(lambda: len(ran) == 3)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert ran == [1, 2, 0]
+    assert not jobs.documents
+
+def test_backlog_beyond_max_loaded_drains_without_refill_loop(jobs):
+    past = datetime.utcnow() - timedelta(seconds=30)
+    for n in range(7):
+        jobs.schedule_job("lembrete", past + timedelta(seconds=n), payload={"n": n})
+    scheduler = Scheduler(window=60, max_loaded=3, batch_size=2)
+    ran = recording(scheduler)
+
+    async def run():
+        scheduler.start()
+        await wait_until(lambda: len(ran) == 7)
+        # Sem o horizonte no passado, uma recarga por heap esvaziado
+        assert scheduler._horizon >= time.time() - 1
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert ran == list(range(7))
+    assert jobs.refills <= 5
+
+def test_jobs_beyond_the_window_load_on_refill(jobs):
+    scheduler = Scheduler(window=0.05)
+    ran = recording(scheduler)
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.schedule("lembrete", 0.2, payload={"n": 1})
+        # Fora da janela carregada: fica só no banco
+        assert scheduler.pending == 0
+        await wait_until(lambda: ran == [1])
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+def test_cancelled_and_foreign_jobs_do_not_run(jobs):
+    scheduler = Scheduler(window=60)
+    ran = recording(scheduler)
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.schedule("lembrete", 0.03, guild_id=1, payload={"n": 1}, key=10)
+        foreign = await scheduler.schedule("lembrete", 0.03, payload={"n": 2})
+        await scheduler.schedule("lembrete", 0.05, payload={"n": 3})
+        jobs.foreign.add(foreign["_id"])
+        assert await scheduler.cancel("lembrete", 1, 10)
+        assert not await scheduler.cancel("lembrete", 1, 10)
+        await wait_until(lambda: ran == [3])
+        await asyncio.sleep(0.02)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert ran == [3]
+
+def test_failed_job_is_retried_then_dropped(jobs):
+    scheduler = Scheduler(window=60, max_attempts=2, retry_delay=0.01)
+    attempts = []
+
+    @scheduler.handler("falha")
+    async def fail(job):
+        attempts.append(job["attempts"])
+        raise RuntimeError("erro")
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.schedule("falha", 0.01)
+        await wait_until(lambda: len(attempts) == 2 and not jobs.documents)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert attempts == [1, 2]
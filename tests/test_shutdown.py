@@ -0,0 +1,67 @@
+"""
+Ordem, prazos e relatório do ShutdownCoordinator.
+"""
+
+import asyncio
+import threading
+import time
+
+from src.bot.shutdown import DrainResult, ShutdownCoordinator
+
+def test_hooks_run_by_priority_and_results_are_normalized():
+    order = []
+    coordinator = ShutdownCoordinator(total_timeout=5.0)
+
+    async def drain():
+        order.append("drain")
+        return 3, 1
+
+    def flush():
+        order.append("flush")
+        return DrainResult(flushed=2)
+
+    coordinator.register("flush", flush, priority=30)
+    coordinator.register("drain", drain, priority=10)
+    coordinator.register("close", lambda: order.append("close"), priority=40)
+
+    report = asyncio.run(coordinator.shutdown("teste"))
+    assert order == ["drain", "flush", "close"]
+    assert (report.flushed, report.dropped) == (5, 1)
+    assert all(hook["status"] == "ok" for hook in report.hooks.values())
+
+def test_sync_hook_timeout_is_enforced():
+    release = threading.Event()
+    ran_after = []
+    coordinator = ShutdownCoordinator(total_timeout=5.0)
+    coordinator.register("travado", lambda: release.wait(5), priority=10, timeout=0.05, pending=lambda: 7)
+    coordinator.register("seguinte", lambda: ran_after.append(1), priority=20)
+
+    async def run():
+        started = time.monotonic()
+        report = await coordinator.shutdown()
+        elapsed = time.monotonic() - started
+        release.set()
+        return report, elapsed
+
+    report, elapsed = asyncio.run(run())
+    assert elapsed < 1.0
+    assert report.hooks["travado"]["status"] == "timeout"
+    assert report.hooks["travado"]["dropped"] == 7
+    assert ran_after == [1]
+
+def test_errors_count_pending_as_dropped_and_report_is_reused():
+    coordinator = ShutdownCoordinator()
+
+    async def broken():
+        raise RuntimeError("falhou")
+
+    coordinator.register("quebrado", broken, pending=lambda: 2)
+
+    async def run():
+        first = await coordinator.shutdown()
+        assert await coordinator.shutdown() is first
+        return first
+
+    report = asyncio.run(run())
+    assert report.hooks["quebrado"]["status"] == "error"
+    assert report.dropped == 2
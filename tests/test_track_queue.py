@@ -0,0 +1,62 @@
+"""
+Fila de faixas e chaves do cache de resolução.
+"""
+
+import pytest
+
+from src.utils.track_cache import normalize_url, youtube_id
+from src.utils.track_queue import Track, TrackQueue
+
+def tracks(count):
+    return [Track(f"url{n}", f"faixa {n}", duration=60.0 * n) for n in range(count)]
+
+def test_push_pop_and_capacity():
+    queue = TrackQueue(max_size=3)
+    items = tracks(5)
+    assert [queue.push(track) for track in items[:2]] == [1, 2]
+    assert queue.extend(items[2:]) == 1
+    assert queue.push(items[4]) is None
+    assert queue.pop() is items[0]
+    assert len(queue) == 2
+
+def test_discard_remove_and_page():
+    queue = TrackQueue()
+    items = tracks(6)
+    queue.extend(items)
+    assert queue.discard(2) == 2
+    assert queue.remove(2) is items[3]
+    assert queue.remove(10) is None
+    assert queue.page(1, 2) == [items[4], items[5]]
+    assert queue.peek(1) == [items[2]]
+    assert queue.discard(100) == 3
+    assert not queue and queue.pop() is None
+
+def test_duration_and_length():
+    queue = TrackQueue()
+    queue.extend(tracks(3) + [Track("live", "ao vivo")])
+    assert queue.duration == 180.0
+    assert Track("x", "x", duration=3725).length == "1:02:05"
+    assert Track("x", "x", duration=65).length == "1:05"
+    assert Track("x", "x").length == "ao vivo"
+
+def test_for_requester_copies():
+    track = tracks(2)[1]
+    copy = track.for_requester(42)
+    assert copy is not track and copy.requester_id == 42 and copy.url == track.url
+
+@pytest.mark.parametrize("query, key", [
+    ("https://www.youtube.com/watch?v=abc123&t=30s&si=x", "youtube:abc123"),
+    ("https://youtu.be/abc123?si=x", "youtube:abc123"),
+    ("https://m.youtube.com/shorts/abc123", "youtube:abc123"),
+    ("https://music.youtube.com/watch?v=abc123&list=PL9", "youtube:list:PL9"),
+    ("https://youtube.com/playlist?list=PL9", "youtube:list:PL9"),
+    ("HTTPS://Example.com/a/b/?z=1&utm_source=x&a=2#frag", "example.com/a/b?a=2&z=1"),
+    ("https://example.com", "example.com/"),
+    ("  Never   Gonna Give  ", "search:never gonna give"),
+])
+def test_normalize_url(query, key):
+    assert normalize_url(query) == key
+
+def test_youtube_id_only_for_youtube():
+    assert youtube_id("https://vimeo.com/123") is None
+    assert youtube_id("rick astley") is None